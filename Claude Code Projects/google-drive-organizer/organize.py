@@ -5,6 +5,8 @@ Google Drive Organizer - Main Entry Point
 
 Usage:
     python3 organize.py preview    # Generate preview CSV
+    python3 organize.py preview --rescan   # Ignore the cached scan
+    python3 organize.py changes    # What changed in My Drive since the last preview
     python3 organize.py execute <csv_path>  # Dry run
     python3 organize.py execute <csv_path> --execute  # Actually move files
 """
@@ -15,7 +17,9 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from preview import generate_preview, scan_and_match, print_summary
+from preview import generate_preview, print_summary
+from scanner import ScanResult, scan
+from drive_index import DriveIndex
 from execute import main as execute_main
 
 
@@ -23,17 +27,20 @@ def show_help():
     print(__doc__)
 
 
-def cmd_preview():
+def cmd_preview(rescan: bool = False):
     print("="*60)
     print("GOOGLE DRIVE ORGANIZER")
     print("="*60)
     print("\nScanning My Drive...")
 
-    results = scan_and_match()
-    print_summary(results)
+    scan_result = scan(rescan=rescan)
+    minutes = int(scan_result.age().total_seconds() // 60)
+    if minutes:
+        print(f"Using scan from {scan_result.scanned_at:%Y-%m-%d %H:%M} ({minutes} min ago, --rescan to refresh)")
+    print_summary(scan_result.rows())
 
     print("\nGenerating preview CSV...")
-    output_file = generate_preview()
+    output_file = generate_preview(scan_result)
 
     print(f"\n>>> Preview saved to: {output_file}")
     print("\nNEXT STEPS:")
@@ -44,6 +51,25 @@ def cmd_preview():
     print(f"5. Run: python3 organize.py execute {output_file}")
 
 
+def cmd_changes():
+    last_scan = ScanResult.load()
+    if last_scan is None:
+        print("No previous preview found. Run: python3 organize.py preview")
+        sys.exit(1)
+
+    with DriveIndex() as index:
+        index.refresh()
+        changes = index.changes_since(last_scan.scanned_at)
+
+    print(f"Changes since preview of {last_scan.scanned_at:%Y-%m-%d %H:%M}:")
+    for kind in ("added", "modified", "removed"):
+        print(f"\n{kind.capitalize()}: {len(changes[kind])}")
+        for path in changes[kind][:20]:
+            print(f"  {path}")
+        if len(changes[kind]) > 20:
+            print(f"  ... and {len(changes[kind]) - 20} more")
+
+
 def main():
     if len(sys.argv) < 2:
         show_help()
@@ -52,7 +78,9 @@ def main():
     command = sys.argv[1]
 
     if command == "preview":
-        cmd_preview()
+        cmd_preview(rescan="--rescan" in sys.argv)
+    elif command == "changes":
+        cmd_changes()
     elif command == "execute":
         # Pass remaining args to execute
         sys.argv = ["execute.py"] + sys.argv[2:]
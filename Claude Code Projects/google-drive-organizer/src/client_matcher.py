@@ -0,0 +1,224 @@
+# src/client_matcher.py
+"""
+Match filenames to clients: exact matching in one pass with an Aho-Corasick
+automaton, and fuzzy scoring from trigram overlap.
+"""
+
+import re
+from bisect import bisect_right
+from collections import deque
+from difflib import SequenceMatcher
+
+# Shortest client variation matched inside a filename (shorter ones cause false matches)
+MIN_NAME_MATCH = 3
+
+# Trigram score from which a fuzzy candidate is also compared by edit similarity,
+# and how many of the best candidates per token run get that comparison
+REFINE_MIN_SCORE = 0.3
+REFINE_TOP = 3
+# Trigrams found in more client names than this share are too common to
+# select candidates with ("cli" when every client is "Client N")
+COMMON_GRAM_SHARE = 0.05
+
+
+def _is_boundary(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is not glued to letters/digits on either side."""
+    return ((start == 0 or not text[start - 1].isalnum()) and
+            (end == len(text) or not text[end].isalnum()))
+
+
+class ClientMatcher:
+    """
+    All client variations compiled once, then matched against any number of
+    filenames. Each filename is scanned once regardless of the client count.
+    """
+
+    def __init__(self, client_variations: dict[str, str]):
+        # Insertion order decides ties, as in the old linear scan
+        self.variations = list(client_variations)
+        self.clients = [client_variations[v] for v in self.variations]
+        self.lookup = client_variations
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for pid, variation in enumerate(self.variations):
+            if variation:
+                self._add(variation, pid)
+        self._link()
+
+        # An all-punctuation client name leaves an empty variation, which is
+        # "part of" every bracket prefix
+        self._empty_pid = self.variations.index("") if "" in client_variations else None
+
+        # All variations joined, for "prefix is part of a variation" lookups
+        self._joined = "\0".join(self.variations)
+        self._starts = []
+        pos = 0
+        for variation in self.variations:
+            self._starts.append(pos)
+            pos += len(variation) + 1
+
+    def _add(self, pattern: str, pid: int):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pid)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text: str):
+        """Yield (start, end, pattern id) for every variation occurring in text."""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pid in self._out[node]:
+                yield i + 1 - len(self.variations[pid]), i + 1, pid
+
+    def match_prefix(self, prefix: str) -> str | None:
+        """Bracket prefix: exact variation, else the first variation overlapping it."""
+        prefix_lower = prefix.lower()
+        if prefix_lower in self.lookup:
+            return self.lookup[prefix_lower]
+
+        # First variation (in insertion order) inside the prefix, or containing it
+        hits = {pid for _, _, pid in self.find_all(prefix_lower)}
+        if self._empty_pid is not None:
+            hits.add(self._empty_pid)
+        pos = self._joined.find(prefix_lower)
+        while pos != -1:
+            hits.add(bisect_right(self._starts, pos) - 1)
+            pos = self._joined.find(prefix_lower, pos + 1)
+        return self.clients[min(hits)] if hits else None
+
+    def match_name(self, filename: str) -> str | None:
+        """
+        Client whose name appears in the filename.
+
+        Whole-word occurrences win over ones glued to other letters; within
+        each group the longest variation wins, then the earliest defined.
+        """
+        text = filename.lower()
+        best = None
+        for start, end, pid in self.find_all(text):
+            if end - start < MIN_NAME_MATCH:
+                continue
+            rank = (_is_boundary(text, start, end), end - start, -pid)
+            if best is None or rank > best:
+                best = rank
+        return self.clients[-best[2]] if best else None
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    padded = f" {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _tokens(filename: str) -> list[str]:
+    """Lowercase alphanumeric runs of a filename, without its extension."""
+    stem, dot, ext = filename.rpartition(".")
+    if dot and stem and len(ext) <= 5:
+        filename = stem
+    return re.findall(r"[a-z0-9]+", filename.lower())
+
+
+class ClientScorer:
+    """
+    Fuzzy client scores for filenames, from trigram overlap.
+
+    Each client name is reduced to its letters and digits ("e.l.f. Beauty"
+    -> "elfbeauty") and indexed by trigram. Runs of 1..n consecutive
+    filename tokens are compared the same way, so "abinbev_deck",
+    "AB InBev deck" and a misspelt "Unilver" all score against the right
+    client. Only clients sharing a distinctive trigram with a run are
+    scored, via the inverted index; the closest are then also scored by
+    edit similarity, which forgives a dropped or swapped letter better
+    than trigrams do.
+    """
+
+    def __init__(self, clients: list[str], short_name_cap: float = 0.6):
+        self.clients = clients
+        self.short_name_cap = short_name_cap
+        self._names: list[str] = []
+        self._grams: list[frozenset[str]] = []
+        self._short: list[bool] = []
+        self._index: dict[str, list[int]] = {}
+        self.max_words = 1
+        for cid, client in enumerate(clients):
+            words = re.findall(r"[a-z0-9]+", client.lower())
+            self._names.append("".join(words))
+            grams = _trigrams(self._names[-1])
+            self._grams.append(grams)
+            # Names like "AB" or "3M" are too short to trust on their own
+            self._short.append(len("".join(words)) < MIN_NAME_MATCH)
+            self.max_words = max(self.max_words, len(words))
+            for gram in grams:
+                self._index.setdefault(gram, []).append(cid)
+        # Tokens per run: the longest client name, plus one for split words
+        self.max_run = min(self.max_words + 1, 6)
+        limit = max(50, int(len(clients) * COMMON_GRAM_SHARE))
+        self._select = {gram: cids for gram, cids in self._index.items() if len(cids) <= limit}
+        self._run_cache: dict[str, dict[int, float]] = {}
+
+    def _score_run(self, run: str) -> dict[int, float]:
+        """Dice similarity of one token run against every client sharing a trigram."""
+        cached = self._run_cache.get(run)
+        if cached is not None:
+            return cached
+
+        grams = _trigrams(run)
+        candidates = set()
+        for gram in grams:
+            candidates.update(self._select.get(gram, ()))
+
+        dice = {cid: 2 * len(grams & self._grams[cid]) / (len(grams) + len(self._grams[cid]))
+                for cid in candidates}
+        refine = sorted((cid for cid, score in dice.items() if score >= REFINE_MIN_SCORE),
+                        key=lambda cid: -dice[cid])[:REFINE_TOP]
+        for cid in refine:
+            dice[cid] = max(dice[cid], SequenceMatcher(None, run, self._names[cid]).ratio())
+
+        scores = {cid: min(score, self.short_name_cap) if self._short[cid] else score
+                  for cid, score in dice.items()}
+        self._run_cache[run] = scores
+        return scores
+
+    def score(self, filename: str) -> dict[str, float]:
+        """Best score per client (0..1) over all token runs of the filename."""
+        tokens = _tokens(filename)
+        best: dict[int, float] = {}
+        for i in range(len(tokens)):
+            for j in range(i + 1, min(i + self.max_run, len(tokens)) + 1):
+                for cid, score in self._score_run("".join(tokens[i:j])).items():
+                    if score > best.get(cid, 0.0):
+                        best[cid] = score
+        return {self.clients[cid]: score for cid, score in best.items()}
+
+    def score_batch(self, filenames: list[str]) -> list[dict[str, float]]:
+        """
+        Scores for many filenames; token runs shared between filenames
+        ("deck", "2024", "q3 review") are scored once per batch.
+        """
+        try:
+            return [self.score(filename) for filename in filenames]
+        finally:
+            self._run_cache.clear()
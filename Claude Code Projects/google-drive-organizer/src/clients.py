@@ -11,11 +11,9 @@ def get_client_folders() -> list[str]:
     Get list of client folder names from Enterprise/Clients.
     Excludes files (only returns directories).
     """
-    clients = []
-    for item in os.listdir(CLIENTS_FOLDER):
-        item_path = CLIENTS_FOLDER / item
-        if item_path.is_dir():
-            clients.append(item)
+    # scandir reports the entry type with the listing, so no stat per folder
+    with os.scandir(CLIENTS_FOLDER) as it:
+        clients = [entry.name for entry in it if entry.is_dir()]
     return sorted(clients)
 
 
@@ -12,6 +12,48 @@ CLIENTS_FOLDER = GDRIVE_ROOT / "Shared drives/Enterprise/Clients"
 PROJECT_DIR = Path("$HOME/Documents/Claude Projects/google-drive-organizer")
 OUTPUT_DIR = PROJECT_DIR / "output"
 
+# Fuzzy client scoring (0..1). Unmatched files whose best client scores at
+# least FUZZY_MATCH_SCORE are matched to it; a runner-up within
+# AMBIGUITY_MARGIN of the chosen client, or an exact match scoring below
+# FUZZY_MATCH_SCORE, flags the row as ambiguous.
+FUZZY_MATCH_SCORE = 0.8
+AMBIGUITY_MARGIN = 0.1
+MIN_CANDIDATE_SCORE = 0.5
+MAX_CANDIDATES = 3
+
+# Duplicate detection: files of equal size have DUPLICATE_SAMPLE_BYTES from
+# each end hashed, and only colliding ones are hashed in full. With
+# DUPLICATES_CANONICAL_ONLY, only one copy per group is proposed for a move;
+# the rest are listed with status DUPLICATE.
+FIND_DUPLICATES = True
+DUPLICATE_SAMPLE_BYTES = 64 * 1024
+DUPLICATES_CANONICAL_ONLY = False
+
+# How far scans descend into My Drive (0 = top level only, None = whole tree),
+# glob patterns for files/folders to include or skip, and concurrent listings
+SCAN_MAX_DEPTH = 0
+SCAN_INCLUDE = []
+SCAN_EXCLUDE = []
+SCAN_WORKERS = 8
+
+# SQLite index of My Drive; later scans only relist folders that changed
+INDEX_FILE = OUTPUT_DIR / "drive_index.sqlite"
+USE_INDEX = True
+
+# Last scan result (JSON Lines, one file per line), reused by preview until
+# it is older than SCAN_MAX_AGE_MINUTES
+SCAN_CACHE_FILE = OUTPUT_DIR / "last_scan.jsonl"
+SCAN_MAX_AGE_MINUTES = 60
+
+# Moves (renames and cross-drive copies) running at once when executing
+MOVE_WORKERS = 8
+
+# Rows held in memory at once: the preview is sorted in chunks of
+# PREVIEW_CHUNK_ROWS (spilled to disk beyond that), and execute reads and
+# moves approved rows EXECUTE_BATCH_SIZE at a time
+PREVIEW_CHUNK_ROWS = 50_000
+EXECUTE_BATCH_SIZE = 5_000
+
 # Bracket prefixes that are NOT client names (should be ignored)
 NON_CLIENT_PREFIXES = [
     "ARCHIVED",
@@ -0,0 +1,257 @@
+# src/drive_index.py
+"""
+Local SQLite index of My Drive, refreshed incrementally.
+
+A folder's mtime changes when entries are added, removed or renamed in it,
+so a refresh only relists folders whose mtime differs from the last scan.
+Unchanged folders cost one stat instead of a full listing. Edits to a
+file's contents do not touch its folder, so size/mtime of existing files
+can lag until their folder changes (delete the index file to rebuild it).
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+from config import INDEX_FILE, MY_DRIVE, SCAN_MAX_DEPTH, SCAN_INCLUDE, SCAN_EXCLUDE, SCAN_WORKERS
+from walker import list_dir, matches_glob
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    depth INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    matched_client TEXT,
+    first_seen TEXT NOT NULL,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files(dir);
+CREATE TABLE IF NOT EXISTS removed_files (
+    path TEXT NOT NULL,
+    removed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _refresh_dir(path: str, known_mtime_ns: int | None):
+    """
+    Stat a folder and relist it only if its mtime changed.
+
+    Returns (mtime_ns, listing), where listing is None for an unchanged
+    folder, else (files as (name, path, stat) tuples, subfolder paths).
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    if mtime_ns == known_mtime_ns:
+        return mtime_ns, None
+    files, dirs = list_dir(path)
+    return mtime_ns, ([(e.name, e.path, e.stat()) for e in files], [e.path for e in dirs])
+
+
+class DriveIndex:
+    """Files seen under one root, with their last match result."""
+
+    def __init__(self, path: Path = INDEX_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _remove_dir(self, path: str, now: str) -> int:
+        """
+        Drop a folder, its subfolders and their files, recording the files
+        as removed. Returns the number of files dropped.
+        """
+        prefix = path.rstrip(os.sep) + os.sep
+        like = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        removed = self.conn.execute(
+            "INSERT INTO removed_files SELECT path, ? FROM files WHERE dir = ? OR dir LIKE ? ESCAPE '\\'",
+            (now, path, like)).rowcount
+        self.conn.execute("DELETE FROM files WHERE dir = ? OR dir LIKE ? ESCAPE '\\'", (path, like))
+        self.conn.execute("DELETE FROM dirs WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, like))
+        return removed
+
+    def _update_files(self, root: str, dir_path: str, files: list, include: list[str],
+                      exclude: list[str], now: str) -> dict:
+        counts = {"added": 0, "modified": 0, "removed": 0}
+        known = {row["path"]: row for row in
+                 self.conn.execute("SELECT path, size, mtime_ns FROM files WHERE dir = ?", (dir_path,))}
+        seen = set()
+
+        for name, path, st in files:
+            rel_path = os.path.relpath(path, root)
+            if include and not matches_glob(name, rel_path, include):
+                continue
+            if exclude and matches_glob(name, rel_path, exclude):
+                continue
+            seen.add(path)
+
+            row = known.get(path)
+            if row is None:
+                self.conn.execute(
+                    "INSERT INTO files (path, dir, name, size, mtime_ns, inode, first_seen, changed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, dir_path, name, st.st_size, st.st_mtime_ns, st.st_ino, now, now))
+                counts["added"] += 1
+            elif (row["size"], row["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+                self.conn.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ?, inode = ?, changed_at = ? WHERE path = ?",
+                    (st.st_size, st.st_mtime_ns, st.st_ino, now, path))
+                counts["modified"] += 1
+
+        for path in known.keys() - seen:
+            self.conn.execute("INSERT INTO removed_files VALUES (?, ?)", (path, now))
+            self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            counts["removed"] += 1
+        return counts
+
+    def refresh(self, root: Path = MY_DRIVE, max_depth: int | None = SCAN_MAX_DEPTH,
+                include: list[str] | None = None, exclude: list[str] | None = None,
+                workers: int = SCAN_WORKERS) -> dict:
+        """
+        Bring the index up to date with the folder tree under root.
+
+        Folders are stat'ed (and, if changed, relisted) one tree level at a
+        time on a thread pool; the database is only touched from this thread.
+
+        Returns counts: dirs_listed, dirs_unchanged, added, modified, removed.
+        """
+        root = str(root)
+        include = SCAN_INCLUDE if include is None else include
+        exclude = SCAN_EXCLUDE if exclude is None else exclude
+        now = datetime.now().isoformat(timespec="microseconds")
+        stats = {"dirs_listed": 0, "dirs_unchanged": 0, "added": 0, "modified": 0, "removed": 0}
+
+        # A different root starts over; different filters relist every folder
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        if row is not None and row["value"] != root:
+            stats["removed"] += self._remove_dir(row["value"], now)
+        filters = json.dumps([include, exclude])
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'filters'").fetchone()
+        relist_all = row is None or row["value"] != filters
+
+        # Forget folders from a previous configuration that are now out of range
+        if max_depth is not None:
+            for row in self.conn.execute("SELECT path FROM dirs WHERE depth > ?", (max_depth,)).fetchall():
+                stats["removed"] += self._remove_dir(row["path"], now)
+
+        level = [root]
+        depth = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            while level:
+                known = {path: self.conn.execute("SELECT mtime_ns, subdirs FROM dirs WHERE path = ?",
+                                                 (path,)).fetchone()
+                         for path in level}
+                futures = {path: pool.submit(_refresh_dir, path, None if relist_all or not known[path]
+                                             else known[path]["mtime_ns"])
+                           for path in level}
+
+                next_level = []
+                for path, future in futures.items():
+                    try:
+                        mtime_ns, listing = future.result()
+                    except OSError as e:
+                        if path == root:
+                            raise
+                        if not isinstance(e, FileNotFoundError):
+                            print(f"  Skipping {path}: {e}", file=sys.stderr)
+                        stats["removed"] += self._remove_dir(path, now)
+                        continue
+
+                    if listing is None:
+                        stats["dirs_unchanged"] += 1
+                        subdirs = json.loads(known[path]["subdirs"])
+                    else:
+                        stats["dirs_listed"] += 1
+                        files, subdirs = listing
+                        for key, count in self._update_files(root, path, files, include, exclude, now).items():
+                            stats[key] += count
+
+                        # Subfolders that disappeared from this folder
+                        if known[path]:
+                            for gone in set(json.loads(known[path]["subdirs"])) - set(subdirs):
+                                stats["removed"] += self._remove_dir(gone, now)
+
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO dirs (path, parent, depth, mtime_ns, subdirs) VALUES (?, ?, ?, ?, ?)",
+                        (path, os.path.dirname(path) if path != root else None, depth, mtime_ns,
+                         json.dumps(subdirs)))
+
+                    if max_depth is None or depth < max_depth:
+                        for sub in subdirs:
+                            if exclude and matches_glob(os.path.basename(sub), os.path.relpath(sub, root), exclude):
+                                stats["removed"] += self._remove_dir(sub, now)
+                            else:
+                                next_level.append(sub)
+
+                self.conn.commit()
+                level = next_level
+                depth += 1
+
+        self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                              [("root", root), ("filters", filters)])
+        self.conn.commit()
+        return stats
+
+    def files(self) -> Iterator[dict]:
+        """All indexed files, as dicts of the files table columns."""
+        for row in self.conn.execute("SELECT * FROM files ORDER BY path"):
+            yield dict(row)
+
+    def set_matches(self, matches: dict[str, str | None]):
+        """Store the match result (client folder or None) for each file path."""
+        self.conn.executemany("UPDATE files SET matched_client = ? WHERE path = ?",
+                              [(client, path) for path, client in matches.items()])
+        self.conn.commit()
+
+    def changes_since(self, since: datetime) -> dict[str, list[str]]:
+        """
+        Paths added, modified and removed by refreshes after `since`.
+
+        Stamps are compared as datetimes: isoformat() drops the microseconds
+        when they are 0, so the stored strings do not sort reliably.
+        """
+        added, modified = [], []
+        for path, first_seen, changed_at in self.conn.execute(
+                "SELECT path, first_seen, changed_at FROM files ORDER BY path"):
+            if datetime.fromisoformat(first_seen) > since:
+                added.append(path)
+            elif datetime.fromisoformat(changed_at) > since:
+                modified.append(path)
+        removed = sorted({path for path, removed_at in self.conn.execute(
+            "SELECT path, removed_at FROM removed_files WHERE path NOT IN (SELECT path FROM files)")
+            if datetime.fromisoformat(removed_at) > since})
+        return {"added": added, "modified": modified, "removed": removed}
+
+
+if __name__ == "__main__":
+    with DriveIndex() as index:
+        stats = index.refresh()
+    print(f"Folders relisted: {stats['dirs_listed']} (unchanged: {stats['dirs_unchanged']})")
+    print(f"Files added: {stats['added']}, modified: {stats['modified']}, removed: {stats['removed']}")
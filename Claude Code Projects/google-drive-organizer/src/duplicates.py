@@ -0,0 +1,116 @@
+# src/duplicates.py
+"""
+Find files with identical contents, reading as little as possible.
+
+Files are grouped by size first (free: the scan already has it). Only
+files sharing a size have a small head and tail sample hashed, and only
+files whose samples also collide are hashed in full. On a Drive for
+Desktop mount every byte read may be a download, so most files are never
+opened at all.
+"""
+
+import hashlib
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from config import DUPLICATE_SAMPLE_BYTES, SCAN_WORKERS
+
+CHUNK_BYTES = 1024 * 1024
+
+
+def sample_hash(path: str, size: int, sample: int = DUPLICATE_SAMPLE_BYTES) -> str:
+    """Hash of the first and last `sample` bytes (the whole file if it is small)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        if size <= 2 * sample:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(sample))
+            f.seek(size - sample)
+            digest.update(f.read(sample))
+    return digest.hexdigest()
+
+
+def full_hash(path: str) -> str:
+    """Streamed hash of the whole file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _regroup(groups: list[list[str]], key, pool: ThreadPoolExecutor) -> list[list[str]]:
+    """Split each group by key(path), computed concurrently; keep groups of 2+."""
+    paths = [p for group in groups for p in group]
+
+    def safe_key(path):
+        try:
+            return key(path)
+        except OSError as e:
+            print(f"  Skipping {path}: {e}", file=sys.stderr)
+            return None
+
+    keys = dict(zip(paths, pool.map(safe_key, paths)))
+    result = []
+    for group in groups:
+        split = defaultdict(list)
+        for path in group:
+            if keys[path] is not None:
+                split[keys[path]].append(path)
+        result.extend(g for g in split.values() if len(g) > 1)
+    return result
+
+
+def find_duplicates(files: list[tuple[str, int | None]], workers: int = SCAN_WORKERS,
+                    sample: int = DUPLICATE_SAMPLE_BYTES) -> list[list[str]]:
+    """
+    Groups of paths with identical contents (each group has 2+ paths).
+
+    Args:
+        files: (path, size) pairs; a size of None is looked up with stat
+        sample: Bytes hashed from each end of a file before a full hash
+    """
+    sizes = {}
+    for path, size in files:
+        if size is None:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                continue
+        # Empty files are all "identical"; not worth flagging
+        if size > 0:
+            sizes[path] = size
+
+    by_size = defaultdict(list)
+    for path, size in sizes.items():
+        by_size[size].append(path)
+    groups = [g for g in by_size.values() if len(g) > 1]
+    if not groups:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        groups = _regroup(groups, lambda p: sample_hash(p, sizes[p], sample), pool)
+        # Samples that covered the whole file are already a full comparison
+        small = [g for g in groups if sizes[g[0]] <= 2 * sample]
+        large = [g for g in groups if sizes[g[0]] > 2 * sample]
+        groups = small + _regroup(large, full_hash, pool)
+
+    return sorted(sorted(g) for g in groups)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 src/duplicates.py <folder>")
+        sys.exit(1)
+
+    folder = Path(sys.argv[1])
+    files = [(str(p), None) for p in folder.rglob("*") if p.is_file()]
+    groups = find_duplicates(files)
+    for group in groups:
+        print(f"{len(group)} copies:")
+        for path in group:
+            print(f"  {path}")
+    print(f"\n{len(groups)} duplicate groups, {sum(len(g) - 1 for g in groups)} redundant files")
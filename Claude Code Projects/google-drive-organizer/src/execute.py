@@ -2,93 +2,361 @@
 """Execute approved file moves from preview CSV."""
 
 import csv
+import os
 import shutil
 import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from config import OUTPUT_DIR
+from typing import Iterable, Iterator
+from config import OUTPUT_DIR, MOVE_WORKERS, EXECUTE_BATCH_SIZE
+from journal import MoveJournal, partial_path, read_journal, recover, undo_plan
+from scanner import invalidate_scan
+from streaming import batched
+
+
+def iter_approved_moves(csv_path: Path) -> Iterator[dict]:
+    """
+    Yield moves that have been approved (approved column = 'Y' or 'y'),
+    reading the CSV one row at a time.
+    """
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row.get("approved", "").upper() == "Y":
+                yield row
 
 
 def load_approved_moves(csv_path: Path) -> list[dict]:
     """
     Load moves that have been approved (approved column = 'Y' or 'y').
     """
-    approved = []
+    return list(iter_approved_moves(csv_path))
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("approved", "").upper() == "Y":
-                approved.append(row)
 
-    return approved
+def _copy_move(source: Path, dest: Path):
+    """
+    Move across filesystems: copy to a temp name next to dest, rename it
+    into place (never over an existing file), then delete the source.
+    """
+    tmp = partial_path(dest)
+    try:
+        with open(source, 'rb') as fsrc, open(tmp, 'xb') as fdst:
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+        shutil.copystat(source, tmp)
+        _rename_move(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    source.unlink()
+
+
+def _rename_move(source: Path, dest: Path):
+    """
+    Move within one filesystem without ever replacing dest.
+
+    os.rename would silently replace dest, and checking first leaves a
+    window for another file to appear. A hard link fails atomically if
+    dest exists; the source name is removed once the link is made.
+    """
+    try:
+        os.link(source, dest, follow_symlinks=False)
+    except FileExistsError:
+        raise FileExistsError(f"Destination already exists: {dest}") from None
+    except OSError:
+        # No hard links on this filesystem: best effort check, then rename
+        if dest.exists():
+            raise FileExistsError(f"Destination already exists: {dest}")
+        os.rename(source, dest)
+        return
+    os.unlink(source)
+
+
+class _Progress:
+    """Thread-safe move counter printing files/s and MB/s."""
+
+    def __init__(self, total: int, every: int = 50):
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.bytes = 0
+        self.start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, size: int):
+        with self._lock:
+            self.done += 1
+            self.bytes += size
+            if self.done % self.every == 0 or self.done == self.total:
+                print(f"  [{self.done}/{self.total}] {self.rate()}")
+
+    def rate(self) -> str:
+        elapsed = max(time.monotonic() - self.start, 1e-6)
+        return f"{self.done / elapsed:.1f} files/s, {self.bytes / elapsed / 1e6:.1f} MB/s"
+
+
+def validate_moves(moves: list[dict], workers: int = MOVE_WORKERS,
+                   claimed: tuple[set, set] | None = None) -> list[str | None]:
+    """
+    Check every move before any is made: the source must exist, the
+    destination must not, and no two moves may share a destination or a
+    source. The existence checks (one network round trip each on a Drive
+    mount) run concurrently.
 
+    claimed: (destinations, sources) of moves checked earlier, e.g. in
+    previous batches of the same run; updated with these moves.
 
-def execute_moves(approved_moves: list[dict], dry_run: bool = True) -> tuple[list[dict], list[dict]]:
+    Returns one problem per move, None where the move is fine.
+    """
+    def check(move: dict) -> str | None:
+        source = Path(move["source_path"])
+        dest = Path(move["destination_path"])
+        if not source.exists():
+            return f"Source file not found: {source}"
+        if dest.exists():
+            return f"Destination already exists: {dest}"
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        problems = list(pool.map(check, moves))
+
+    claimed_dests, claimed_sources = claimed if claimed is not None else (set(), set())
+    for i, move in enumerate(moves):
+        dest, source = Path(move["destination_path"]), Path(move["source_path"])
+        if problems[i] is None:
+            if dest in claimed_dests:
+                problems[i] = f"Another approved move targets: {dest}"
+            elif source in claimed_sources:
+                problems[i] = f"Another approved move takes the same file: {source}"
+        claimed_dests.add(dest)
+        claimed_sources.add(source)
+    return problems
+
+
+def execute_moves(approved_moves: list[dict], dry_run: bool = True, workers: int = MOVE_WORKERS,
+                  journal: MoveJournal | None = None, validate: bool = True,
+                  claimed: tuple[set, set] | None = None) -> tuple[list[dict], list[dict]]:
     """
     Execute the approved file moves.
 
+    Moves are grouped by destination folder, which is created once, and
+    run on a pool of `workers` threads. Moves within one filesystem are
+    plain renames; moves across filesystems (My Drive -> Shared drive) are
+    copies. A move never replaces an existing file, and two moves to the
+    same destination are refused (see validate_moves). Once any file has
+    moved, the cached scan is dropped so the next preview rescans.
+
     Args:
         approved_moves: List of move dicts from CSV
         dry_run: If True, only simulate (don't actually move)
+        workers: Moves in flight at once
+        journal: Records each move before it starts and after it succeeds
+        validate: False if the caller already ran validate_moves
+        claimed: Destinations and sources of earlier batches (see validate_moves)
 
     Returns: (successful_moves, failed_moves)
     """
-    successful = []
     failed = []
+    valid = []
+    problems = (validate_moves(approved_moves, workers, claimed) if validate
+                else [None] * len(approved_moves))
+    for move, problem in zip(approved_moves, problems):
+        if problem:
+            move["result"] = f"FAILED: {problem}"
+            failed.append(move)
+        else:
+            valid.append((move, Path(move["source_path"]), Path(move["destination_path"])))
 
-    for move in approved_moves:
-        source = Path(move["source_path"])
-        dest = Path(move["destination_path"])
-
-        try:
-            if not source.exists():
-                raise FileNotFoundError(f"Source file not found: {source}")
-
-            if dest.exists():
-                raise FileExistsError(f"Destination already exists: {dest}")
+    if dry_run:
+        for move, _, _ in valid:
+            move["result"] = "DRY_RUN_OK"
+        return [move for move, _, _ in valid], failed
 
-            if not dry_run:
-                # Ensure destination directory exists
-                dest.parent.mkdir(parents=True, exist_ok=True)
-                # Move the file
-                shutil.move(str(source), str(dest))
+    by_folder = defaultdict(list)
+    for item in valid:
+        by_folder[item[2].parent].append(item)
 
-            move["result"] = "SUCCESS" if not dry_run else "DRY_RUN_OK"
-            successful.append(move)
+    progress = _Progress(len(valid))
+    lock = threading.Lock()
+    successful = []
 
+    def run(move: dict, source: Path, dest: Path, mover):
+        try:
+            size = source.stat().st_size
+            if journal:
+                journal.intent(move)
+            mover(source, dest)
+            if journal:
+                journal.commit(move)
+            move["result"] = "SUCCESS"
+            with lock:
+                successful.append(move)
+            progress.add(size)
         except Exception as e:
             move["result"] = f"FAILED: {str(e)}"
-            failed.append(move)
+            if journal:
+                journal.fail(move, str(e))
+            with lock:
+                failed.append(move)
+
+    # Renames on a synced drive are network-bound too, so they share the
+    # pool with copies rather than running one at a time
+    copies = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for folder, items in by_folder.items():
+            try:
+                folder.mkdir(parents=True, exist_ok=True)
+                folder_dev = os.stat(folder).st_dev
+            except OSError as e:
+                for move, _, _ in items:
+                    move["result"] = f"FAILED: {str(e)}"
+                    with lock:
+                        failed.append(move)
+                continue
+
+            for move, source, dest in items:
+                try:
+                    same_device = source.stat().st_dev == folder_dev
+                except OSError as e:
+                    move["result"] = f"FAILED: {str(e)}"
+                    with lock:
+                        failed.append(move)
+                    continue
+                if not same_device:
+                    copies += 1
+                pool.submit(run, move, source, dest, _rename_move if same_device else _copy_move)
+
+    if valid:
+        print(f"  Moved {progress.done} files in {len(by_folder)} folders "
+              f"({len(valid) - copies} renamed, {copies} copied): {progress.rate()}")
+    if successful:
+        # The cached scan still lists the moved files at their old paths
+        invalidate_scan()
 
     return successful, failed
 
 
+def run_journaled(moves: list[dict], journal_path: Path, workers: int = MOVE_WORKERS,
+                  validate: bool = True, states: dict | None = None,
+                  claimed: tuple[set, set] | None = None) -> tuple[list[dict], list[dict]]:
+    """
+    Execute moves under a journal, skipping moves it already records as
+    committed. Moves a crash left half-done are settled first (see
+    journal.recover), so running this again on the same journal resumes.
+    Callers running many batches pass the states recover() returned, so
+    the journal is read once.
+    """
+    if states is None:
+        states = recover(journal_path)
+    done, todo = [], []
+    for move in moves:
+        state = states.get((move["source_path"], move["destination_path"]))
+        if state and state["state"] == "committed":
+            move["result"] = "SUCCESS"
+            done.append(move)
+        else:
+            todo.append(move)
+
+    if done:
+        print(f"  Already moved (from journal): {len(done)}")
+        # A crashed run may have moved them without dropping the cached scan
+        invalidate_scan()
+    with MoveJournal(journal_path) as journal:
+        successful, failed = execute_moves(todo, dry_run=False, workers=workers, journal=journal,
+                                           validate=validate, claimed=claimed)
+    return done + successful, failed
+
+
+def journal_moves(journal_path: Path) -> Iterable[dict]:
+    """All moves a journal's run was started with (approved CSV rows are read lazily)."""
+    begin, _ = read_journal(journal_path)
+    if begin.get("kind") == "undo":
+        return undo_plan(Path(begin["journal"]))
+    return iter_approved_moves(Path(begin["csv"]))
+
+
+class MoveLog:
+    """Execution log for reversibility, appended to as each batch of moves finishes."""
+
+    FIELDNAMES = ["result", "filename", "source_path", "destination_path", "matched_client"]
+
+    def __init__(self, dry_run: bool):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        prefix = "dryrun" if dry_run else "executed"
+        self.path = OUTPUT_DIR / f"{prefix}_{timestamp}.csv"
+        self.successful = 0
+        self.failed: list[dict] = []
+        self._f = open(self.path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._f, fieldnames=self.FIELDNAMES, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._f.close()
+
+    def add(self, successful: list[dict], failed: list[dict]):
+        self._writer.writerows(successful + failed)
+        self._f.flush()
+        self.successful += len(successful)
+        self.failed.extend(failed)
+
+
 def write_log(successful: list[dict], failed: list[dict], dry_run: bool) -> Path:
     """Write execution log for reversibility."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    prefix = "dryrun" if dry_run else "executed"
-    log_file = OUTPUT_DIR / f"{prefix}_{timestamp}.csv"
+    with MoveLog(dry_run) as log:
+        log.add(successful, failed)
+    return log.path
 
-    all_moves = successful + failed
 
-    with open(log_file, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ["result", "filename", "source_path", "destination_path", "matched_client"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for move in all_moves:
-            writer.writerow({k: move.get(k, "") for k in fieldnames})
+def run_in_batches(moves: Iterable[dict], dry_run: bool, journal_path: Path | None = None,
+                   batch_size: int = EXECUTE_BATCH_SIZE) -> tuple[int, list[dict], Path]:
+    """
+    Execute moves batch_size at a time, logging each batch as it finishes,
+    so only one batch of rows (plus the claimed paths) is in memory. With a journal, moves it
+    already records as committed are skipped (see run_journaled).
+
+    The destinations and sources of every batch are remembered, so two
+    approved moves to the same destination are refused (also in a dry
+    run) even when they fall in different batches.
 
-    return log_file
+    Returns: (number of successful moves, failed moves, log path)
+    """
+    states = recover(journal_path) if journal_path else None
+    claimed = (set(), set())
+    with MoveLog(dry_run) as log:
+        for batch in batched(moves, batch_size):
+            if journal_path:
+                successful, failed = run_journaled(batch, journal_path, states=states, claimed=claimed)
+            else:
+                successful, failed = execute_moves(batch, dry_run=dry_run, claimed=claimed)
+            log.add(successful, failed)
+    return log.successful, log.failed, log.path
 
 
 def main():
     if len(sys.argv) < 2:
         print("Usage: python3 src/execute.py <preview_csv_path> [--execute]")
+        print("       python3 src/execute.py --resume <journal.jsonl>")
         print("\nBy default, runs in dry-run mode (no files moved)")
         print("Add --execute flag to actually move files")
         sys.exit(1)
 
+    if sys.argv[1] == "--resume":
+        if len(sys.argv) < 3:
+            print("Usage: python3 src/execute.py --resume <journal.jsonl>")
+            sys.exit(1)
+        journal_path = Path(sys.argv[2])
+        print(f"\nResuming from journal: {journal_path}")
+        report(*run_in_batches(journal_moves(journal_path), dry_run=False, journal_path=journal_path))
+        return
+
     csv_path = Path(sys.argv[1])
     dry_run = "--execute" not in sys.argv
 
@@ -97,13 +365,13 @@ def main():
         sys.exit(1)
 
     print(f"\nLoading approved moves from: {csv_path}")
-    approved = load_approved_moves(csv_path)
+    total = sum(1 for _ in iter_approved_moves(csv_path))
 
-    if not approved:
+    if not total:
         print("No approved moves found (mark 'approved' column with 'Y')")
         sys.exit(0)
 
-    print(f"Found {len(approved)} approved moves")
+    print(f"Found {total} approved moves")
 
     if dry_run:
         print("\n*** DRY RUN MODE - No files will be moved ***")
@@ -116,10 +384,26 @@ def main():
             sys.exit(0)
 
     print("\nProcessing moves...")
-    successful, failed = execute_moves(approved, dry_run=dry_run)
+    journal_path = None
+    if not dry_run:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        journal_path = OUTPUT_DIR / f"journal_{timestamp}.jsonl"
+        MoveJournal.create(journal_path, "execute", csv=str(csv_path.resolve())).close()
+        print(f"Journal: {journal_path}")
+        print(f"  (if interrupted: python3 src/execute.py --resume {journal_path})")
+    successful, failed, log_file = run_in_batches(iter_approved_moves(csv_path), dry_run, journal_path)
+
+    report(successful, failed, log_file)
+
+    if dry_run and successful:
+        print("\nTo execute for real, run:")
+        print(f"  python3 src/execute.py {csv_path} --execute")
 
+
+def report(successful: int, failed: list[dict], log_file: Path):
+    """Print results and where the CSV log was written."""
     print(f"\nResults:")
-    print(f"  Successful: {len(successful)}")
+    print(f"  Successful: {successful}")
     print(f"  Failed: {len(failed)}")
 
     if failed:
@@ -127,13 +411,8 @@ def main():
         for move in failed:
             print(f"  {move['filename']}: {move['result']}")
 
-    log_file = write_log(successful, failed, dry_run)
     print(f"\nLog saved to: {log_file}")
 
-    if dry_run and successful:
-        print("\nTo execute for real, run:")
-        print(f"  python3 src/execute.py {csv_path} --execute")
-
 
 if __name__ == "__main__":
     main()
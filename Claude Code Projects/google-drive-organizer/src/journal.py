@@ -0,0 +1,175 @@
+# src/journal.py
+"""
+Write-ahead journal of file moves.
+
+Every move is appended as an "intent" (fsynced) before it happens and as a
+"commit" after it succeeds, so a crash at any point leaves a record of
+exactly which files moved. Execute and undo resume from the journal, and
+undo can replay it in reverse.
+
+Records (one JSON object per line):
+    {"op": "begin", "kind": "execute", "csv": "...", "time": "..."}
+    {"op": "intent", "source": "...", "dest": "...", "filename": "...", "matched_client": "..."}
+    {"op": "commit", "source": "...", "dest": "..."}
+    {"op": "fail", "source": "...", "dest": "...", "error": "..."}
+    {"op": "abort", "source": "...", "dest": "..."}     (recovery: move never completed)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from duplicates import full_hash
+
+
+class MoveJournal:
+    """Append-only, fsynced move journal; safe to use from several threads."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, path: Path, kind: str, **info) -> "MoveJournal":
+        """Start a new journal for an execute or undo run."""
+        journal = cls(path)
+        journal._append({"op": "begin", "kind": kind, "time": datetime.now().isoformat(), **info})
+        return journal
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._f.close()
+
+    def _append(self, record: dict):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def intent(self, move: dict):
+        self._append({"op": "intent", "source": move["source_path"], "dest": move["destination_path"],
+                      "filename": move.get("filename", ""), "matched_client": move.get("matched_client", "")})
+
+    def commit(self, move: dict):
+        self._append({"op": "commit", "source": move["source_path"], "dest": move["destination_path"]})
+
+    def fail(self, move: dict, error: str):
+        self._append({"op": "fail", "source": move["source_path"], "dest": move["destination_path"],
+                      "error": error})
+
+    def abort(self, source: str, dest: str):
+        self._append({"op": "abort", "source": source, "dest": dest})
+
+
+def read_journal(path: Path) -> tuple[dict, dict[tuple[str, str], dict]]:
+    """
+    Read a journal: (begin record, moves keyed by (source, dest)).
+
+    Each move dict has source, dest, filename, matched_client and state
+    ("intent", "committed", "failed" or "aborted"), in the order the moves
+    were first intended. A torn last line (crash mid-write) is ignored.
+    """
+    begin = {}
+    moves: dict[tuple[str, str], dict] = {}
+    states = {"commit": "committed", "fail": "failed", "abort": "aborted"}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            op = record.get("op")
+            if op == "begin":
+                begin = record
+                continue
+            key = (record["source"], record["dest"])
+            if op == "intent":
+                moves[key] = {"source": record["source"], "dest": record["dest"],
+                              "filename": record.get("filename", ""),
+                              "matched_client": record.get("matched_client", ""),
+                              "state": "intent"}
+            elif key in moves and op in states:
+                moves[key]["state"] = states[op]
+                if op == "fail":
+                    moves[key]["error"] = record.get("error", "")
+
+    return begin, moves
+
+
+def partial_path(dest: Path) -> Path:
+    """Temp name a cross-filesystem copy is written to before it is renamed to dest."""
+    return dest.with_name(f".{dest.name}.partial")
+
+
+def _same_file_data(a: Path, b: Path) -> bool:
+    """
+    Same contents: the same file (a rename interrupted between link and
+    unlink), or equal size and hash. Size and mtime alone are not enough,
+    since copystat gives a copy its source's mtime.
+    """
+    if os.path.samefile(a, b):
+        return True
+    return a.stat().st_size == b.stat().st_size and full_hash(str(a)) == full_hash(str(b))
+
+
+def recover(path: Path) -> dict[tuple[str, str], dict]:
+    """
+    Settle moves that were intended but never committed or failed (the
+    process died mid-move), by looking at the files:
+
+    - only the destination exists: the move happened -> commit
+    - both exist with the same contents (compared by hash): a move finished
+      but the source was not yet deleted -> delete it, commit
+    - only the source exists: the move never finished (a partial copy is
+      deleted) -> abort
+    - anything else is left alone and marked failed for a human to check
+
+    Returns the moves as read_journal does, with states updated.
+    """
+    _, moves = read_journal(path)
+    pending = [m for m in moves.values() if m["state"] == "intent"]
+    if not pending:
+        return moves
+
+    with MoveJournal(path) as journal:
+        for m in pending:
+            source, dest = Path(m["source"]), Path(m["dest"])
+            move = {"source_path": m["source"], "destination_path": m["dest"]}
+            partial_path(dest).unlink(missing_ok=True)
+
+            if dest.exists() and (not source.exists() or _same_file_data(source, dest)):
+                source.unlink(missing_ok=True)
+                journal.commit(move)
+                m["state"] = "committed"
+            elif source.exists() and not dest.exists():
+                journal.abort(m["source"], m["dest"])
+                m["state"] = "aborted"
+            else:
+                m["error"] = ("Interrupted; source and destination both exist and differ"
+                              if source.exists() else "Interrupted; neither source nor destination exists")
+                journal.fail(move, m["error"])
+                m["state"] = "failed"
+    return moves
+
+
+def undo_plan(path: Path, settle: bool = True) -> list[dict]:
+    """
+    Moves that reverse every committed move of a journal, newest first,
+    as move dicts for execute_moves. With settle, moves a crash left
+    pending are recovered first (this writes to the journal and may
+    delete partial copies, so dry runs pass settle=False).
+    """
+    moves = recover(path) if settle else read_journal(path)[1]
+    return [{"filename": m["filename"], "matched_client": m["matched_client"],
+             "source_path": m["dest"], "destination_path": m["source"]}
+            for m in reversed(list(moves.values())) if m["state"] == "committed"]
@@ -1,37 +1,67 @@
 # src/preview.py
 """Generate preview CSV of proposed file moves."""
 
-import csv
+import sys
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from config import OUTPUT_DIR, CLIENTS_FOLDER
-from scanner import scan_and_match
+from typing import Iterable, Iterator
+from config import OUTPUT_DIR, CLIENTS_FOLDER, PREVIEW_CHUNK_ROWS
+from scanner import ScanResult, scan
+from streaming import external_sort, write_csv
 
 
-def generate_preview() -> Path:
+FIELDNAMES = ["status", "approved", "filename", "matched_client", "confidence", "ambiguous",
+              "candidates", "duplicate_group", "duplicate_of", "source_path", "destination_path"]
+
+# Matched first, then extra copies of duplicates, then unmatched
+STATUS_ORDER = {"MATCHED": 0, "DUPLICATE": 1, "UNMATCHED": 2}
+
+
+def preview_rows(results: Iterable[dict]) -> Iterator[dict]:
+    """Scan results as preview rows, with destination paths and an empty approved column."""
+    for r in results:
+        row = {k: r.get(k, "") for k in FIELDNAMES}
+        if r["status"] == "MATCHED":
+            row["destination_path"] = str(CLIENTS_FOLDER / r["matched_client"] / r["filename"])
+        else:
+            row["destination_path"] = ""
+        row["approved"] = ""  # Human fills this in
+        yield row
+
+
+def sort_key(row: dict) -> tuple:
+    """Matched rows by client, duplicates by group, unmatched rows; each then by filename."""
+    status = row["status"]
+    if status == "DUPLICATE":
+        return (1, int(row["duplicate_group"][1:] or 0), "", row["filename"])
+    client = row["matched_client"] if status == "MATCHED" else ""
+    return (STATUS_ORDER.get(status, len(STATUS_ORDER)), 0, client, row["filename"])
+
+
+def generate_preview(scan_result: ScanResult, chunk_rows: int = PREVIEW_CHUNK_ROWS) -> Path:
     """
-    Generate a CSV preview of all proposed moves.
+    Generate a CSV preview of all proposed moves from a scan.
 
     CSV columns:
     - filename: Original filename
     - source_path: Full path to source file
     - matched_client: Client folder name (or empty)
     - destination_path: Proposed destination (or empty)
-    - status: MATCHED or UNMATCHED
+    - status: MATCHED, UNMATCHED or DUPLICATE (extra copy, not moved)
     - approved: Empty column for human to fill in (Y/N)
+    - confidence: 0..1 match score (sort ascending to review uncertain rows first)
+    - ambiguous: Y if another client scored almost as well, or the match scored low
+    - candidates: Best-scoring clients with their scores
+    - duplicate_group: Same id on files with identical contents
+    - duplicate_of: For extra copies, the filename of the copy kept as canonical
+
+    Rows are streamed from the scan cache: sorted in chunks of chunk_rows
+    (spilled to a temp folder next to the CSV when there are more) and
+    written a chunk at a time.
 
     Returns: Path to generated CSV file
     """
-    results = scan_and_match()
-
-    # Add destination paths
-    for r in results:
-        if r["matched_client"]:
-            r["destination_path"] = str(CLIENTS_FOLDER / r["matched_client"] / r["filename"])
-        else:
-            r["destination_path"] = ""
-        r["approved"] = ""  # Human fills this in
-
     # Generate filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = OUTPUT_DIR / f"preview_{timestamp}.csv"
@@ -39,53 +69,55 @@ def generate_preview() -> Path:
     # Ensure output directory exists
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Write CSV
-    fieldnames = ["status", "approved", "filename", "matched_client", "source_path", "destination_path"]
-
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        # Write matched first, then unmatched
-        matched = sorted([r for r in results if r["status"] == "MATCHED"], key=lambda x: x["matched_client"])
-        unmatched = sorted([r for r in results if r["status"] == "UNMATCHED"], key=lambda x: x["filename"])
-
-        for r in matched + unmatched:
-            writer.writerow({k: r[k] for k in fieldnames})
+    rows = external_sort(preview_rows(scan_result.rows()), sort_key, FIELDNAMES,
+                         chunk_rows, tmp_dir=OUTPUT_DIR)
+    write_csv(output_file, rows, FIELDNAMES, chunk_rows)
 
     return output_file
 
 
-def print_summary(results: list[dict]):
-    """Print summary statistics."""
-    matched = [r for r in results if r["status"] == "MATCHED"]
-    unmatched = [r for r in results if r["status"] == "UNMATCHED"]
+def print_summary(results: Iterable[dict]):
+    """Print summary statistics (one pass, so results can be a stream)."""
+    total = copies = ambiguous = 0
+    statuses = Counter()
+    client_counts = Counter()
+    groups = set()
+    for r in results:
+        total += 1
+        statuses[r["status"]] += 1
+        if r["status"] == "MATCHED":
+            client_counts[r["matched_client"]] += 1
+        if r.get("duplicate_of"):
+            copies += 1
+        if r.get("duplicate_group"):
+            groups.add(r["duplicate_group"])
+        if r.get("ambiguous"):
+            ambiguous += 1
 
     print("\n" + "="*60)
     print("GOOGLE DRIVE ORGANIZER - PREVIEW SUMMARY")
     print("="*60)
-    print(f"\nTotal files scanned: {len(results)}")
-    print(f"Matched to clients:  {len(matched)}")
-    print(f"Unmatched:           {len(unmatched)}")
-
-    if matched:
+    print(f"\nTotal files scanned: {total}")
+    print(f"Matched to clients:  {statuses['MATCHED']}")
+    print(f"Unmatched:           {statuses['UNMATCHED']}")
+    if copies:
+        print(f"Duplicate copies:    {copies} (in {len(groups)} groups)")
+    if ambiguous:
+        print(f"Ambiguous (review):  {ambiguous}")
+
+    if client_counts:
         print(f"\nTop clients by file count:")
-        client_counts = {}
-        for r in matched:
-            client = r["matched_client"]
-            client_counts[client] = client_counts.get(client, 0) + 1
-
-        for client, count in sorted(client_counts.items(), key=lambda x: -x[1])[:10]:
+        for client, count in client_counts.most_common(10):
             print(f"  {client}: {count} files")
 
 
 if __name__ == "__main__":
     print("Scanning My Drive and matching to clients...")
-    results = scan_and_match()
-    print_summary(results)
+    scan_result = scan(rescan="--rescan" in sys.argv)
+    print_summary(scan_result.rows())
 
     print("\nGenerating preview CSV...")
-    output_file = generate_preview()
+    output_file = generate_preview(scan_result)
     print(f"\nPreview saved to: {output_file}")
     print("\nNEXT STEPS:")
     print("1. Open the CSV in Google Sheets or Excel")
@@ -1,24 +1,35 @@
 # src/scanner.py
 """Scan My Drive and match files to client folders."""
 
+import json
 import os
 import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from pathlib import Path
-from config import MY_DRIVE, NON_CLIENT_PREFIXES
+from typing import Iterator
+from config import (MY_DRIVE, NON_CLIENT_PREFIXES, SCAN_CACHE_FILE, SCAN_MAX_AGE_MINUTES,
+                    SCAN_MAX_DEPTH, SCAN_INCLUDE, SCAN_EXCLUDE, SCAN_WORKERS, USE_INDEX,
+                    FUZZY_MATCH_SCORE, AMBIGUITY_MARGIN, MIN_CANDIDATE_SCORE, MAX_CANDIDATES,
+                    FIND_DUPLICATES, DUPLICATES_CANONICAL_ONLY)
 from clients import get_client_folders, build_client_variations
+from drive_index import DriveIndex
+from client_matcher import ClientMatcher, ClientScorer
+from duplicates import find_duplicates
+from walker import walk_files
 
+# Uppercased once; checked for every bracketed filename
+_NON_CLIENT_PREFIXES = frozenset(p.upper() for p in NON_CLIENT_PREFIXES)
 
-def get_my_drive_files() -> list[Path]:
+
+def get_my_drive_files(max_depth: int | None = SCAN_MAX_DEPTH) -> Iterator[Path]:
     """
-    Get all files from My Drive root (not recursive into folders for now).
-    Returns list of Path objects.
+    Yield files from My Drive, down to max_depth folders deep (0 = root only),
+    as each folder is listed.
     """
-    files = []
-    for item in os.listdir(MY_DRIVE):
-        item_path = MY_DRIVE / item
-        if item_path.is_file():
-            files.append(item_path)
-    return files
+    for entry in walk_files(MY_DRIVE, max_depth=max_depth, include=SCAN_INCLUDE,
+                            exclude=SCAN_EXCLUDE, workers=SCAN_WORKERS):
+        yield Path(entry.path)
 
 
 def extract_bracket_prefix(filename: str) -> str | None:
@@ -35,74 +46,222 @@ def extract_bracket_prefix(filename: str) -> str | None:
 
 def is_non_client_prefix(prefix: str) -> bool:
     """Check if bracket prefix is a known non-client prefix."""
-    return prefix.upper() in [p.upper() for p in NON_CLIENT_PREFIXES]
+    return prefix.upper() in _NON_CLIENT_PREFIXES
 
 
-def match_file_to_client(filename: str, client_variations: dict[str, str]) -> str | None:
+def match_file_to_client(filename: str, client_variations: dict[str, str] | ClientMatcher) -> str | None:
     """
     Try to match a filename to a client folder.
 
     Strategy:
     1. Check for bracket prefix first (highest confidence)
-    2. Check if any client name appears in filename
+    2. Check if any client name appears in filename (longest whole-word
+       match preferred, minimum 3 chars)
+
+    Pass a ClientMatcher built once when matching many files; a plain
+    variations dict is compiled on every call.
 
     Returns: client folder name or None
     """
+    matcher = (client_variations if isinstance(client_variations, ClientMatcher)
+               else ClientMatcher(client_variations))
+
     # Strategy 1: Bracket prefix
     prefix = extract_bracket_prefix(filename)
     if prefix:
         if is_non_client_prefix(prefix):
             return None
-        # Try to match prefix to a client
-        prefix_lower = prefix.lower()
-        if prefix_lower in client_variations:
-            return client_variations[prefix_lower]
-        # Try partial match
-        for variation, client in client_variations.items():
-            if variation in prefix_lower or prefix_lower in variation:
-                return client
+        client = matcher.match_prefix(prefix)
+        if client:
+            return client
 
     # Strategy 2: Client name in filename
-    filename_lower = filename.lower()
-
-    # Remove common prefixes/patterns that might cause false matches
-    # Check for longer client names first (more specific)
-    sorted_clients = sorted(client_variations.keys(), key=len, reverse=True)
-
-    for variation in sorted_clients:
-        # Only match if it's a word boundary (not part of another word)
-        # Minimum 3 chars to avoid false matches
-        if len(variation) >= 3 and variation in filename_lower:
-            return client_variations[variation]
-
-    return None
+    return matcher.match_name(filename)
 
 
-def scan_and_match() -> list[dict]:
+def scan_and_match(use_index: bool = USE_INDEX) -> list[dict]:
     """
     Scan all My Drive files and match them to clients.
 
+    With use_index, files come from the Drive index (refreshed
+    incrementally) and the match results are stored back into it.
+
     Returns: list of dicts with file info and match results
     """
-    files = get_my_drive_files()
     clients = get_client_folders()
     variations = build_client_variations(clients)
 
+    if use_index:
+        with DriveIndex() as index:
+            index.refresh()
+            files = [(Path(row["path"]), row["size"]) for row in index.files()]
+            results = _match_files(files, clients, variations)
+            index.set_matches({r["source_path"]: r["matched_client"] for r in results})
+    else:
+        results = _match_files([(path, None) for path in get_my_drive_files()], clients, variations)
+
+    if FIND_DUPLICATES:
+        mark_duplicates(results)
+    return results
+
+
+def mark_duplicates(results: list[dict], canonical_only: bool = DUPLICATES_CANONICAL_ONLY) -> int:
+    """
+    Flag files with identical contents (duplicate_group, duplicate_of).
+
+    One copy per group is canonical: a matched one if any, the most
+    confident, then the shortest name. With canonical_only, the other
+    copies get status DUPLICATE and are not proposed for a move.
+
+    Returns: number of duplicate groups
+    """
+    groups = find_duplicates([(r["source_path"], r.get("size")) for r in results])
+    by_path = {r["source_path"]: r for r in results}
+
+    for n, group in enumerate(groups, 1):
+        rows = [by_path[path] for path in group]
+        canonical = min(rows, key=lambda r: (r["matched_client"] is None, -(r.get("confidence") or 0),
+                                             len(r["filename"]), r["filename"]))
+        for r in rows:
+            r["duplicate_group"] = f"D{n}"
+            r["duplicate_of"] = "" if r is canonical else canonical["filename"]
+            if canonical_only and r is not canonical:
+                r["status"] = "DUPLICATE"
+
+    return len(groups)
+
+
+def score_match(filename: str, matched_client: str | None, scores: dict[str, float]) -> dict:
+    """
+    Confidence for a file's match, from its fuzzy client scores.
+
+    An unmatched file takes its best-scoring client if that scores at least
+    FUZZY_MATCH_SCORE (except under a non-client bracket prefix). The row is
+    ambiguous when another client scores within AMBIGUITY_MARGIN of the
+    chosen one, when the exact match is not the best-scoring client, or
+    when the match itself scores below FUZZY_MATCH_SCORE.
+
+    Returns: matched_client, confidence, ambiguous, candidates ("Client (0.92); ...")
+    """
+    ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+    ranked = [(c, s) for c, s in ranked if s >= MIN_CANDIDATE_SCORE]
+
+    prefix = extract_bracket_prefix(filename)
+    if (matched_client is None and ranked and ranked[0][1] >= FUZZY_MATCH_SCORE
+            and not (prefix and is_non_client_prefix(prefix))):
+        matched_client = ranked[0][0]
+
+    if matched_client:
+        confidence = scores.get(matched_client, 0.0)
+        rivals = [s for c, s in ranked if c != matched_client]
+        ambiguous = ((bool(rivals) and rivals[0] >= confidence - AMBIGUITY_MARGIN)
+                     or confidence < FUZZY_MATCH_SCORE)
+    else:
+        confidence = 0.0
+        ambiguous = len(ranked) > 1 and ranked[1][1] >= ranked[0][1] - AMBIGUITY_MARGIN
+
+    return {
+        "matched_client": matched_client,
+        "confidence": round(confidence, 2),
+        "ambiguous": "Y" if ambiguous else "",
+        "candidates": "; ".join(f"{c} ({s:.2f})" for c, s in ranked[:MAX_CANDIDATES]),
+    }
+
+
+def _match_files(files: list[tuple[Path, int | None]], clients: list[str],
+                 variations: dict[str, str]) -> list[dict]:
+    matcher = ClientMatcher(variations)
+    scorer = ClientScorer(clients)
+    all_scores = scorer.score_batch([file_path.name for file_path, _ in files])
+
     results = []
-    for file_path in files:
+    for (file_path, size), scores in zip(files, all_scores):
         filename = file_path.name
-        matched_client = match_file_to_client(filename, variations)
+        match = score_match(filename, match_file_to_client(filename, matcher), scores)
 
         results.append({
             "filename": filename,
             "source_path": str(file_path),
-            "matched_client": matched_client,
-            "status": "MATCHED" if matched_client else "UNMATCHED"
+            "size": size,
+            **match,
+            "status": "MATCHED" if match["matched_client"] else "UNMATCHED"
         })
 
     return results
 
 
+@dataclass
+class ScanResult:
+    """
+    Match results of one scan, with the time the scan ran.
+
+    The results stay in the scan cache (a header line, then one result per
+    line) and rows() reads them back one at a time, so a preview of a large
+    drive never holds every row in memory.
+    """
+    scanned_at: datetime
+    count: int
+    path: Path = SCAN_CACHE_FILE
+
+    def age(self) -> timedelta:
+        return datetime.now() - self.scanned_at
+
+    def rows(self) -> Iterator[dict]:
+        """The scan's results, read lazily from the cache file."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            next(f)  # Header
+            for line in f:
+                yield json.loads(line)
+
+    @classmethod
+    def save(cls, scanned_at: datetime, results: list[dict],
+             path: Path = SCAN_CACHE_FILE) -> "ScanResult":
+        """Write to disk (temp file + rename, so a crash never leaves half a cache)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"scanned_at": scanned_at.isoformat(), "count": len(results)}) + "\n")
+            for r in results:
+                f.write(json.dumps(r) + "\n")
+        os.replace(tmp_path, path)
+        return cls(scanned_at, len(results), path)
+
+    @classmethod
+    def load(cls, path: Path = SCAN_CACHE_FILE) -> "ScanResult | None":
+        """Read a saved scan's header. Returns None if missing or unreadable."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+            return cls(datetime.fromisoformat(header["scanned_at"]), header["count"], path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def scan(rescan: bool = False, cache_file: Path = SCAN_CACHE_FILE,
+         max_age_minutes: int = SCAN_MAX_AGE_MINUTES) -> ScanResult:
+    """
+    Return a scan of My Drive, reusing the cached one when it is recent.
+
+    Listing the Drive mount is the slowest step, so one scan is shared by
+    the summary, the CSV and later previews. rescan=True always rescans.
+    The results are written to cache_file and read back from there.
+    """
+    if not rescan:
+        cached = ScanResult.load(cache_file)
+        if cached and cached.age() < timedelta(minutes=max_age_minutes):
+            return cached
+
+    results = scan_and_match()
+    # Stamped after the index refresh, so `changes` only reports what a
+    # later refresh finds
+    return ScanResult.save(datetime.now(), results, cache_file)
+
+
+def invalidate_scan(cache_file: Path = SCAN_CACHE_FILE):
+    """Drop the cached scan once files have moved, so the next preview rescans."""
+    cache_file.unlink(missing_ok=True)
+
+
 if __name__ == "__main__":
     results = scan_and_match()
     matched = [r for r in results if r["status"] == "MATCHED"]
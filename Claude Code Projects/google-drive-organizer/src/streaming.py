@@ -0,0 +1,83 @@
+# src/streaming.py
+"""
+Row streams for very large drives: batching, an external merge sort and a
+CSV writer that flushes as it goes, so memory stays bounded by the chunk
+size rather than the number of files.
+"""
+
+import csv
+import heapq
+import tempfile
+from contextlib import ExitStack
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+
+def batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    """Consecutive lists of up to `size` rows."""
+    it = iter(rows)
+    while batch := list(islice(it, max(1, size))):
+        yield batch
+
+
+def external_sort(rows: Iterable[dict], key: Callable[[dict], tuple], fieldnames: list[str],
+                  chunk_rows: int, tmp_dir: Path | None = None) -> Iterator[dict]:
+    """
+    Rows ordered by key, holding at most chunk_rows of them in memory.
+
+    Each full chunk is sorted and spilled to a temp CSV (values come back
+    as strings, so key must work on those), then the sorted runs are merged.
+    Input that fits in one chunk is sorted in memory without touching disk.
+    Equal keys keep their input order, as with sorted().
+    """
+    chunks = batched(rows, chunk_rows)
+    first = next(chunks, [])
+    first.sort(key=key)
+    if len(first) < chunk_rows:
+        yield from first
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix=".sort_") as tmp, ExitStack() as stack:
+        runs = []
+        chunk, first = first, None
+        while chunk:
+            run = Path(tmp) / f"run_{len(runs)}.csv"
+            with open(run, 'w', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore').writerows(chunk)
+            runs.append(run)
+            chunk = next(chunks, [])
+            chunk.sort(key=key)
+
+        readers = [stack.enter_context(_RunReader(run, fieldnames)) for run in runs]
+        yield from heapq.merge(*readers, key=key)
+
+
+class _RunReader:
+    """A spilled run, read back row by row; closed when the merge finishes."""
+
+    def __init__(self, path: Path, fieldnames: list[str]):
+        self._f = open(path, 'r', newline='', encoding='utf-8')
+        self._reader = csv.DictReader(self._f, fieldnames=fieldnames)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+    def __iter__(self):
+        return iter(self._reader)
+
+
+def write_csv(path: Path, rows: Iterable[dict], fieldnames: list[str], chunk_rows: int) -> int:
+    """Write rows as they arrive, flushing every chunk_rows rows. Returns the row count."""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for chunk in batched(rows, chunk_rows):
+            writer.writerows(chunk)
+            f.flush()
+            count += len(chunk)
+    return count
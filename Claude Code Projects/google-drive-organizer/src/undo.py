@@ -2,54 +2,90 @@
 """Undo executed moves using the execution log."""
 
 import csv
-import shutil
 import sys
 from pathlib import Path
-from config import OUTPUT_DIR
+from datetime import datetime
+from config import OUTPUT_DIR, MOVE_WORKERS
+from execute import execute_moves, run_journaled, validate_moves
+from journal import MoveJournal, undo_plan
 
 
-def undo_moves(log_path: Path, dry_run: bool = True) -> tuple[list, list]:
+def validate_undo(plan: list[dict], workers: int = MOVE_WORKERS) -> list[dict]:
     """
-    Undo moves by reading an execution log and reversing them.
+    Phase 1: check every reversal before anything moves (concurrent stats,
+    files missing at their destination, occupied original locations,
+    duplicate targets). If any row fails, every row is marked and returned
+    as failed, so a partly valid undo never runs half-way.
 
-    Only undoes rows where result was SUCCESS.
+    Returns the failed rows ([] if the whole plan is valid).
     """
-    successful = []
-    failed = []
+    problems = validate_moves(plan, workers)
+    if not any(problems):
+        return []
 
-    with open(log_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row["result"] != "SUCCESS":
-                continue
+    for move, problem in zip(plan, problems):
+        if problem:
+            move["result"] = f"FAILED: {problem}"
+        else:
+            move["result"] = "SKIPPED: other rows failed validation, nothing was moved"
+    return plan
 
-            # Reverse: destination -> source
-            current_path = Path(row["destination_path"])
-            original_path = Path(row["source_path"])
 
-            try:
-                if not current_path.exists():
-                    raise FileNotFoundError(f"File not at destination: {current_path}")
+def undo_moves(log_path: Path, dry_run: bool = True, workers: int = MOVE_WORKERS) -> tuple[list, list]:
+    """
+    Undo moves by reading an execution log and reversing them.
 
-                if original_path.exists():
-                    raise FileExistsError(f"Original location occupied: {original_path}")
+    Only undoes rows where result was SUCCESS. Two phases: every row is
+    validated first (see validate_undo), then the reversals run on the
+    parallel move executor. Nothing moves unless the whole plan is valid.
+    """
+    with open(log_path, 'r', encoding='utf-8') as f:
+        rows = [row for row in csv.DictReader(f) if row["result"] == "SUCCESS"]
 
-                if not dry_run:
-                    shutil.move(str(current_path), str(original_path))
+    # Reverse: destination -> source
+    plan = [dict(row, source_path=row["destination_path"], destination_path=row["source_path"])
+            for row in rows]
 
-                row["undo_result"] = "UNDONE" if not dry_run else "DRY_RUN_OK"
-                successful.append(row)
+    if not validate_undo(plan, workers):
+        execute_moves(plan, dry_run=dry_run, workers=workers, validate=False)
 
-            except Exception as e:
-                row["undo_result"] = f"FAILED: {str(e)}"
-                failed.append(row)
+    successful, failed = [], []
+    for row, move in zip(rows, plan):
+        result = move["result"]
+        row["undo_result"] = "UNDONE" if result == "SUCCESS" else result
+        (successful if result in ("SUCCESS", "DRY_RUN_OK") else failed).append(row)
+    return successful, failed
 
+
+def undo_journal(journal_path: Path, dry_run: bool = True) -> tuple[list, list]:
+    """
+    Undo the committed moves of an execute journal, newest first: the
+    whole plan is validated first, then run through the parallel move
+    executor under a journal of its own (so an interrupted undo can be
+    resumed with: execute.py --resume <undo journal>).
+    """
+    plan = undo_plan(journal_path, settle=not dry_run)
+    failed = validate_undo(plan)
+    if failed:
+        successful = []
+    elif dry_run:
+        successful, failed = execute_moves(plan, dry_run=True, validate=False)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        undo_path = OUTPUT_DIR / f"undo_journal_{timestamp}.jsonl"
+        MoveJournal.create(undo_path, "undo", journal=str(journal_path.resolve())).close()
+        print(f"Undo journal: {undo_path}")
+        successful, failed = run_journaled(plan, undo_path, validate=False)
+
+    for row in successful + failed:
+        result = row["result"]
+        row["undo_result"] = "UNDONE" if result == "SUCCESS" else result
     return successful, failed
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 src/undo.py <execution_log.csv> [--execute]")
+        print("Usage: python3 src/undo.py <execution_log.csv | journal.jsonl> [--execute]")
         print("\nBy default, runs in dry-run mode")
         sys.exit(1)
 
@@ -71,16 +107,22 @@ def main():
             print("Aborted.")
             sys.exit(0)
 
-    successful, failed = undo_moves(log_path, dry_run=dry_run)
+    if log_path.suffix == ".jsonl":
+        successful, failed = undo_journal(log_path, dry_run=dry_run)
+    else:
+        successful, failed = undo_moves(log_path, dry_run=dry_run)
 
     print(f"\nResults:")
     print(f"  Undone: {len(successful)}")
     print(f"  Failed: {len(failed)}")
 
     if failed:
+        if not successful and any(row["undo_result"].startswith("SKIPPED") for row in failed):
+            print("\nNothing was moved: fix the failed rows below and run again.")
         print("\nFailed undos:")
         for row in failed:
-            print(f"  {row['filename']}: {row['undo_result']}")
+            if not row["undo_result"].startswith("SKIPPED"):
+                print(f"  {row['filename']}: {row['undo_result']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+# src/walker.py
+"""Walk a Drive folder tree with os.scandir and a bounded pool of listing threads."""
+
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterator
+
+
+def matches_glob(name: str, rel_path: str, patterns: list[str]) -> bool:
+    """Glob match against the entry name or its path relative to the walk root."""
+    return any(fnmatch(name, p) or fnmatch(rel_path, p) for p in patterns)
+
+
+def list_dir(path: str) -> tuple[list[os.DirEntry], list[os.DirEntry]]:
+    """
+    List one directory: (files, subdirectories).
+
+    Uses the entry type returned by scandir, so no stat per entry on
+    filesystems that report it. Symlinked directories are not followed.
+    """
+    files, dirs = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry)
+            elif entry.is_file():
+                files.append(entry)
+    return files, dirs
+
+
+def walk_files(root: Path, max_depth: int | None = 0, include: list[str] | None = None,
+               exclude: list[str] | None = None, workers: int = 8) -> Iterator[os.DirEntry]:
+    """
+    Yield files under root as os.DirEntry objects, as soon as each directory is listed.
+
+    Args:
+        max_depth: 0 = files directly in root only, None = no limit
+        include: Glob patterns a file must match (all files if empty)
+        exclude: Glob patterns for files and folders to skip; an excluded
+            folder is not descended into
+        workers: Directories listed concurrently (each listing is a
+            network round trip on a cloud-backed mount)
+
+    Files come out in completion order, not sorted. entry.stat() is cached
+    on the entry after the first call.
+    """
+    root = str(root)
+    include = include or []
+    exclude = exclude or []
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = {pool.submit(list_dir, root): (root, 0)}
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, depth = pending.pop(future)
+                try:
+                    files, dirs = future.result()
+                except OSError as e:
+                    if path == root:
+                        raise
+                    print(f"  Skipping {path}: {e}", file=sys.stderr)
+                    continue
+
+                for entry in files:
+                    rel_path = os.path.relpath(entry.path, root)
+                    if include and not matches_glob(entry.name, rel_path, include):
+                        continue
+                    if exclude and matches_glob(entry.name, rel_path, exclude):
+                        continue
+                    yield entry
+
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for entry in dirs:
+                    if exclude and matches_glob(entry.name, os.path.relpath(entry.path, root), exclude):
+                        continue
+                    pending[pool.submit(list_dir, entry.path)] = (entry.path, depth + 1)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python3 src/walker.py <folder> [max_depth]")
+        sys.exit(1)
+
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    count = 0
+    for entry in walk_files(Path(sys.argv[1]), max_depth=depth):
+        count += 1
+        if count <= 10:
+            print(f"  {entry.path}")
+    print(f"Total files: {count}")
@@ -0,0 +1,103 @@
+# tests/test_undo.py
+"""Undo runs its reversals on the parallel move executor."""
+
+import csv
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import execute
+import undo
+from journal import MoveJournal
+
+FILES = 12
+WORKERS = 4
+
+
+class UndoConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+        # Files sit at their executed destinations, across a few client folders
+        self.moves = []
+        for i in range(FILES):
+            dest = self.root / "Clients" / f"client{i % 3}" / f"file{i}.txt"
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_text(str(i))
+            self.moves.append({"result": "SUCCESS", "filename": dest.name,
+                               "source_path": str(self.root / "My Drive" / dest.name),
+                               "destination_path": str(dest), "matched_client": dest.parent.name})
+        (self.root / "My Drive").mkdir()
+
+        for target, value in ((undo, self.root), (execute, self.root)):
+            patcher = mock.patch.object(target, "OUTPUT_DIR", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(execute, "invalidate_scan")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Record how many renames are in flight at once
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.threads = set()
+        lock = threading.Lock()
+        rename = execute._rename_move
+
+        def tracking_rename(source: Path, dest: Path):
+            with lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                self.threads.add(threading.get_ident())
+            try:
+                time.sleep(0.05)
+                rename(source, dest)
+            finally:
+                with lock:
+                    self.in_flight -= 1
+
+        patcher = mock.patch.object(execute, "_rename_move", tracking_rename)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_undone_concurrently(self, successful: list[dict], failed: list[dict]):
+        self.assertEqual(failed, [])
+        self.assertEqual(len(successful), FILES)
+        for move in self.moves:
+            self.assertTrue(Path(move["source_path"]).exists())
+            self.assertFalse(Path(move["destination_path"]).exists())
+        self.assertGreater(len(self.threads), 1)
+        self.assertGreater(self.max_in_flight, 1)
+
+    def test_undo_log_uses_several_workers(self):
+        log_path = self.root / "executed.csv"
+        with open(log_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=execute.MoveLog.FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(self.moves)
+
+        successful, failed = undo.undo_moves(log_path, dry_run=False, workers=WORKERS)
+        self.assert_undone_concurrently(successful, failed)
+
+    def test_undo_journal_uses_several_workers(self):
+        journal_path = self.root / "journal.jsonl"
+        journal = MoveJournal.create(journal_path, "execute")
+        for move in self.moves:
+            journal.intent(move)
+            journal.commit(move)
+        journal.close()
+
+        successful, failed = undo.undo_journal(journal_path, dry_run=False)
+        self.assert_undone_concurrently(successful, failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,58 +1,36 @@
 #!/usr/bin/env python3
 """
-Generate PDF versions of playbooks using Chrome headless
+Generate HTML and PDF versions of the Markdown playbooks
+
+Renders in-process (no browser needed), in parallel, and skips playbooks
+whose Markdown has not changed since the last render.
+
+Usage:
+    python3 create_pdfs.py            # all playbooks_generated/*.md
+    python3 create_pdfs.py --force    # re-render everything
 """
-import subprocess
+import sys
 from pathlib import Path
-
-def html_to_pdf(html_path: Path, pdf_path: Path):
-    """Convert HTML to PDF using Chrome headless"""
-    chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
-
-    cmd = [
-        chrome_path,
-        "--headless",
-        "--disable-gpu",
-        "--print-to-pdf=" + str(pdf_path),
-        "--no-margins",
-        "file://" + str(html_path.absolute())
-    ]
-
-    print(f"Converting {html_path.name} to PDF...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode == 0 and pdf_path.exists():
-        size_mb = pdf_path.stat().st_size / (1024 * 1024)
-        print(f"  ✓ Created {pdf_path.name} ({size_mb:.2f} MB)")
-        return True
-    else:
-        print(f"  ✗ Failed to create PDF")
-        if result.stderr:
-            print(f"     Error: {result.stderr}")
-        return False
+from src.pdf_renderer import render_playbooks, print_render_result
 
 def main():
     playbooks_dir = Path(__file__).parent / "playbooks_generated"
+    force = "--force" in sys.argv
 
-    html_files = [
-        "AI_Transformation_Playbook.html",
-        "Taylor_Strategic_Playbook.html"
-    ]
+    markdown_files = sorted(playbooks_dir.glob("*.md"))
 
-    print("🎯 Generating PDFs from HTML playbooks\n")
+    print("🎯 Generating PDFs from Markdown playbooks\n")
 
-    success_count = 0
-    for html_file in html_files:
-        html_path = playbooks_dir / html_file
-        pdf_path = playbooks_dir / html_file.replace(".html", ".pdf")
+    if not markdown_files:
+        print(f"⚠️  No playbooks found in {playbooks_dir}")
+        return
 
-        if html_path.exists():
-            if html_to_pdf(html_path, pdf_path):
-                success_count += 1
-        else:
-            print(f"⚠️  {html_file} not found")
+    results = render_playbooks(markdown_files, force=force)
+    for result in results:
+        print_render_result(result)
 
-    print(f"\n✅ Successfully generated {success_count}/{len(html_files)} PDFs")
+    success_count = sum(1 for r in results if r["status"] != "failed")
+    print(f"\n✅ Successfully generated {success_count}/{len(markdown_files)} PDFs")
     print(f"📁 PDFs saved to: {playbooks_dir}\n")
 
 if __name__ == "__main__":
@@ -6,15 +6,19 @@ Removes duplicate frameworks and organizes by type
 import json
 from pathlib import Path
 from src.playbook_generator import generate_playbook
+from src.artifact_store import ArtifactStore, FINAL, atomic_write_json
 
 def merge_playbooks():
     """Merge Taylor and AI frameworks, removing duplicates"""
 
-    # Load both framework sets
-    with open('frameworks_synthesized/frameworks_taylor_final.json', 'r') as f:
+    # Load both framework sets (latest published runs)
+    taylor_file = ArtifactStore("taylor").latest_path(FINAL, legacy='frameworks_synthesized/frameworks_taylor_final.json')
+    ai_file = ArtifactStore("ai").latest_path(FINAL, legacy='frameworks_synthesized/frameworks_ai_final.json')
+
+    with open(taylor_file, 'r') as f:
         taylor_frameworks = json.load(f)
 
-    with open('frameworks_synthesized/frameworks_ai_final.json', 'r') as f:
+    with open(ai_file, 'r') as f:
         ai_frameworks = json.load(f)
 
     print(f"📊 Input:")
@@ -58,10 +62,12 @@ def merge_playbooks():
     print(f"   Unique frameworks: {len(merged_frameworks)}")
     print(f"   Duplicates removed: {len(taylor_frameworks) + len(ai_frameworks) - len(merged_frameworks)}")
 
-    # Save merged frameworks
-    output_file = 'frameworks_synthesized/frameworks_combined.json'
-    with open(output_file, 'w') as f:
-        json.dump(merged_frameworks, f, indent=2)
+    # Save merged frameworks as a new combined run
+    store = ArtifactStore("combined")
+    run = store.new_run(script="merge_playbooks.py", sources=[str(taylor_file), str(ai_file)])
+    output_file = run.path(FINAL)
+    atomic_write_json(output_file, merged_frameworks)
+    run.publish()
 
     print(f"\n✅ Merged frameworks saved to: {output_file}")
 
@@ -70,7 +76,8 @@ def merge_playbooks():
     generate_playbook(
         output_file,
         'playbooks_generated/Combined_Strategic_Playbook.md',
-        'Section Strategic Playbook - Complete Framework Collection'
+        'Section Strategic Playbook - Complete Framework Collection',
+        export_dir='playbooks_generated/Combined_Strategic_Playbook_export'
     )
 
     # Print framework breakdown by type
@@ -10,7 +10,9 @@ from src.pass2_synthesis import synthesize_frameworks
 from src.pass3_evidence import add_evidence
 from src.pass4_actionability import add_actionability
 from src.playbook_generator import generate_playbook
+from src.pdf_renderer import render_playbook, print_render_result
 from src.cost_tracker import tracker
+from src.artifact_store import ArtifactStore, CANDIDATES, SYNTHESIZED, EVIDENCE, FINAL, MANIFEST
 import json
 
 def run_ai_playbook():
@@ -20,9 +22,14 @@ def run_ai_playbook():
     print("AI TRANSFORMATION PLAYBOOK GENERATION")
     print("="*70)
 
+    # Each run writes to its own directory; `latest` moves once the frameworks are final
+    store = ArtifactStore("ai")
+    run = store.new_run(script="run_ai_synthesis.py")
+    print(f"\n📁 Run directory: {run.dir}")
+
     # Step 1: Get all transcripts (except excluded)
     print("\n📋 Step 1: Collecting all transcripts...")
-    all_files = filter_transcripts('transcripts_normalized', category='all')
+    all_files = filter_transcripts('transcripts_normalized', category='all', method='auto')
     print(f"   Found {len(all_files)} transcripts (excluding personal)")
 
     # Step 2: Discovery
@@ -31,10 +38,9 @@ def run_ai_playbook():
     print("   Model: claude-sonnet-4-5")
     print("   Estimated cost: $2.00-3.00")
 
-    frameworks_discovered = "frameworks_ai_discovered"
     discover_frameworks(
-        'transcripts_normalized',
-        frameworks_discovered,
+        all_files,
+        run.dir,
         model='claude-sonnet-4-5',
         limit=len(all_files)  # Process ALL transcripts
     )
@@ -44,21 +50,19 @@ def run_ai_playbook():
     print("   Model: claude-opus-4-1")
     print("   Estimated cost: $0.50-1.50")
 
-    frameworks_synthesized_dir = "frameworks_ai_synthesized"
     synthesize_frameworks(
-        f"{frameworks_discovered}/framework_candidates.json",
-        frameworks_synthesized_dir,
+        run.path(CANDIDATES),
+        run.dir,
         model='claude-opus-4-1',
         max_frameworks=15  # Generate 15 comprehensive frameworks
     )
 
     # Step 4: Evidence (simplified for budget)
     print("\n📚 Step 4: Adding Evidence (Pass 3 - simplified)...")
-    frameworks_synthesized = f"{frameworks_synthesized_dir}/frameworks_synthesized.json"
-    frameworks_with_evidence = "frameworks_synthesized/frameworks_ai_evidence.json"
+    frameworks_synthesized = run.path(SYNTHESIZED)
+    frameworks_with_evidence = run.path(EVIDENCE)
     add_evidence(
         frameworks_synthesized,
-        'transcripts_normalized',
         frameworks_with_evidence
     )
 
@@ -67,32 +71,30 @@ def run_ai_playbook():
     print("   Model: claude-sonnet-4-5")
     print("   Estimated cost: $0.50-1.00")
 
-    frameworks_final = "frameworks_synthesized/frameworks_ai_final.json"
+    frameworks_final = run.path(FINAL)
     add_actionability(
         frameworks_with_evidence,
         frameworks_final,
-        model='claude-sonnet-4-5'
+        model='claude-sonnet-4-5',
+        batch_size=3,
+        workers=4
     )
+    run.publish()
+    print(f"   Published run {run.run_id} as latest")
 
     # Step 6: Generate playbook
     print("\n📖 Step 6: Generating Playbook...")
     generate_playbook(
         frameworks_final,
         "playbooks_generated/AI_Transformation_Playbook.md",
-        "Section AI Transformation Playbook"
+        "Section AI Transformation Playbook",
+        manifest_file=run.path(MANIFEST),
+        export_dir="playbooks_generated/AI_Transformation_Playbook_export"
     )
 
     # Step 7: Generate PDF
-    print("\n📄 Step 7: Generating PDF...")
-    import subprocess
-    subprocess.run([
-        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-        "--headless",
-        "--disable-gpu",
-        "--print-to-pdf=playbooks_generated/AI_Transformation_Playbook.pdf",
-        "--no-margins",
-        "file://" + str(Path("playbooks_generated/AI_Transformation_Playbook.html").absolute())
-    ])
+    print("\n📄 Step 7: Generating HTML + PDF...")
+    print_render_result(render_playbook("playbooks_generated/AI_Transformation_Playbook.md"))
 
     # Print summary
     print("\n" + "="*70)
@@ -9,9 +9,15 @@ from src.pass2_synthesis import synthesize_frameworks
 from src.pass3_evidence import add_evidence
 from src.pass4_actionability import add_actionability
 from src.playbook_generator import generate_playbook
+from src.pdf_renderer import render_playbook, print_render_result
 from src.cost_tracker import tracker
+from src.artifact_store import ArtifactStore, CANDIDATES, SYNTHESIZED, EVIDENCE, FINAL, MANIFEST
 import json
 
+# Discovery output from before versioned runs
+LEGACY_CANDIDATES = "frameworks_ai_discovered/framework_candidates.jsonl"
+LEGACY_MANIFEST = "frameworks_ai_discovered/transcripts_manifest.json"
+
 def run_ai_playbook_from_synthesis():
     """Run pipeline from synthesis step onwards"""
 
@@ -19,28 +25,42 @@ def run_ai_playbook_from_synthesis():
     print("AI TRANSFORMATION PLAYBOOK GENERATION (FROM SYNTHESIS)")
     print("="*70)
 
-    frameworks_discovered = "frameworks_ai_discovered"
+    # New run that reuses the discovery output of the latest run that has
+    # one (fix runs may only carry frameworks_final.json), or of discovery
+    # from before versioned runs
+    store = ArtifactStore("ai")
+    base = store.latest()
+    run = store.new_run(parent=base, script="run_ai_synthesis_from_step3.py")
+    candidates_file = store.find(CANDIDATES, base, legacy=LEGACY_CANDIDATES)
+    manifest_file = store.find(MANIFEST, base, legacy=LEGACY_MANIFEST)
+    if not candidates_file.exists():
+        print(f"❌ No discovery output found (looked in runs/ai and {LEGACY_CANDIDATES})")
+        run.discard()
+        sys.exit(1)
+    print(f"\n📁 Run directory: {run.dir} (discovery from {candidates_file.parent})")
+    # Link discovery into this run so it is self-contained
+    candidates_file = run.link(candidates_file)
+    if manifest_file.exists():
+        manifest_file = run.link(manifest_file)
 
     # Step 3: Synthesis
     print("\n🧬 Step 3: Running Synthesis (Pass 2)...")
     print("   Model: claude-opus-4-1")
     print("   Estimated cost: $0.50-1.50")
 
-    frameworks_synthesized_dir = "frameworks_ai_synthesized"
     synthesize_frameworks(
-        f"{frameworks_discovered}/framework_candidates.json",
-        frameworks_synthesized_dir,
+        candidates_file,
+        run.dir,
         model='claude-opus-4-1',
         max_frameworks=15  # Generate 15 comprehensive frameworks
     )
 
     # Step 4: Evidence (simplified for budget)
     print("\n📚 Step 4: Adding Evidence (Pass 3 - simplified)...")
-    frameworks_synthesized = f"{frameworks_synthesized_dir}/frameworks_synthesized.json"
-    frameworks_with_evidence = "frameworks_synthesized/frameworks_ai_evidence.json"
+    frameworks_synthesized = run.path(SYNTHESIZED)
+    frameworks_with_evidence = run.path(EVIDENCE)
     add_evidence(
         frameworks_synthesized,
-        'transcripts_normalized',
         frameworks_with_evidence
     )
 
@@ -49,32 +69,30 @@ def run_ai_playbook_from_synthesis():
     print("   Model: claude-sonnet-4-5")
     print("   Estimated cost: $0.50-1.00")
 
-    frameworks_final = "frameworks_synthesized/frameworks_ai_final.json"
+    frameworks_final = run.path(FINAL)
     add_actionability(
         frameworks_with_evidence,
         frameworks_final,
-        model='claude-sonnet-4-5'
+        model='claude-sonnet-4-5',
+        batch_size=3,
+        workers=4
     )
+    run.publish()
+    print(f"   Published run {run.run_id} as latest")
 
     # Step 6: Generate playbook
     print("\n📖 Step 6: Generating Playbook...")
     generate_playbook(
         frameworks_final,
         "playbooks_generated/AI_Transformation_Playbook.md",
-        "Section AI Transformation Playbook"
+        "Section AI Transformation Playbook",
+        manifest_file=manifest_file,
+        export_dir="playbooks_generated/AI_Transformation_Playbook_export"
     )
 
     # Step 7: Generate PDF
-    print("\n📄 Step 7: Generating PDF...")
-    import subprocess
-    subprocess.run([
-        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-        "--headless",
-        "--disable-gpu",
-        "--print-to-pdf=playbooks_generated/AI_Transformation_Playbook.pdf",
-        "--no-margins",
-        "file://" + str(Path("playbooks_generated/AI_Transformation_Playbook.html").absolute())
-    ])
+    print("\n📄 Step 7: Generating HTML + PDF...")
+    print_render_result(render_playbook("playbooks_generated/AI_Transformation_Playbook.md"))
 
     # Print summary
     print("\n" + "="*70)
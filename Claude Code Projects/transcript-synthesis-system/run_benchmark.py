@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Offline pipeline benchmark using the mock LLM provider
+
+Runs normalize -> discover -> synthesize -> evidence -> actionability -> playbook
+on synthetic transcripts and reports per-stage time, peak memory and throughput.
+No API keys or network access needed.
+
+Usage:
+    python3 run_benchmark.py                       # 100, 1k and 10k transcripts
+    python3 run_benchmark.py --sizes 100 --latency lognormal --latency-ms 200
+    python3 run_benchmark.py --report bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import resource
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from src.llm_client import client
+from src.mock_provider import MockProvider, LATENCY_DISTRIBUTIONS
+from src.synthetic_transcripts import generate_transcripts
+from src.normalize import run_normalization
+from src.pass1_discovery import discover_frameworks
+from src.pass2_synthesis import synthesize_frameworks
+from src.pass3_evidence import add_evidence
+from src.pass4_actionability import add_actionability
+from src.playbook_generator import generate_playbook
+
+MOCK_PREFIX = "mock"
+
+
+def run_stage(name: str, func, quiet: bool):
+    """Run one stage, returning (elapsed seconds, peak traced MB)"""
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+
+    if quiet:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+    else:
+        func()
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    return elapsed, peak / (1024 * 1024)
+
+
+def benchmark_size(size: int, work_dir: Path, args) -> dict:
+    """Run the full pipeline once on `size` synthetic transcripts"""
+    raw_dir = work_dir / "transcripts_raw"
+    normalized_dir = work_dir / "transcripts_normalized"
+    discovered_dir = work_dir / "frameworks_discovered"
+    synthesized_dir = work_dir / "frameworks_synthesized"
+    playbook_file = work_dir / "Benchmark_Playbook.md"
+    # Result cache lives with the run so every benchmark starts cold
+    cache_dir = work_dir / ".cache"
+
+    generate_transcripts(str(raw_dir), size, seed=args.seed)
+
+    stages = [
+        ("normalize", lambda: run_normalization(str(raw_dir), str(normalized_dir))),
+        ("discover", lambda: discover_frameworks(
+            str(normalized_dir), str(discovered_dir),
+            model=f"{MOCK_PREFIX}-sonnet", limit=size, cache_dir=cache_dir)),
+        ("synthesize", lambda: synthesize_frameworks(
+            str(discovered_dir / "framework_candidates.jsonl"), str(synthesized_dir),
+            model=f"{MOCK_PREFIX}-opus", max_frameworks=args.max_frameworks,
+            cache_dir=cache_dir)),
+        ("evidence", lambda: add_evidence(
+            str(synthesized_dir / "frameworks_synthesized.jsonl"),
+            str(synthesized_dir / "frameworks_evidence.jsonl"))),
+        ("actionability", lambda: add_actionability(
+            str(synthesized_dir / "frameworks_evidence.jsonl"),
+            str(synthesized_dir / "frameworks_final.json"),
+            model=f"{MOCK_PREFIX}-sonnet",
+            batch_size=args.batch_size, workers=args.workers)),
+        ("playbook", lambda: generate_playbook(
+            str(synthesized_dir / "frameworks_final.json"), str(playbook_file),
+            "Benchmark Playbook",
+            manifest_file=str(discovered_dir / "transcripts_manifest.json"))),
+    ]
+
+    results = {"size": size, "stages": {}}
+    total = 0.0
+    for name, func in stages:
+        elapsed, peak_mb = run_stage(name, func, args.quiet)
+        total += elapsed
+        results["stages"][name] = {
+            "seconds": round(elapsed, 4),
+            "peak_mb": round(peak_mb, 2),
+            "transcripts_per_sec": round(size / elapsed, 2) if elapsed else None
+        }
+        print(f"   {name:<14} {elapsed:>9.2f}s {peak_mb:>9.1f} MB")
+
+    results["total_seconds"] = round(total, 4)
+    results["transcripts_per_sec"] = round(size / total, 2) if total else None
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="none")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--max-frameworks", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=1, help="Pass 4 frameworks per request")
+    parser.add_argument("--workers", type=int, default=1, help="Pass 4 concurrent requests")
+    parser.add_argument("--work-dir", help="Keep artifacts here instead of a temp dir")
+    parser.add_argument("--report", help="Write results as JSON to this file")
+    parser.add_argument("--verbose", dest="quiet", action="store_false",
+                        help="Show pipeline output for each stage")
+    args = parser.parse_args()
+
+    client.register_provider(MOCK_PREFIX, MockProvider(
+        seed=args.seed,
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate
+    ))
+
+    print("\n" + "="*70)
+    print("OFFLINE PIPELINE BENCHMARK")
+    print("="*70)
+    print(f"   Latency: {args.latency} ({args.latency_ms}ms), error rate: {args.error_rate}")
+
+    tracemalloc.start()
+    report = []
+    for size in args.sizes:
+        print(f"\n📏 {size} transcripts")
+        print(f"   {'stage':<14} {'time':>10} {'peak mem':>12}")
+
+        if args.work_dir:
+            work_dir = Path(args.work_dir) / f"size_{size}"
+            shutil.rmtree(work_dir, ignore_errors=True)
+            work_dir.mkdir(parents=True)
+            result = benchmark_size(size, work_dir, args)
+        else:
+            with tempfile.TemporaryDirectory(prefix=f"bench_{size}_") as tmp:
+                result = benchmark_size(size, Path(tmp), args)
+
+        print(f"   {'total':<14} {result['total_seconds']:>9.2f}s "
+              f"({result['transcripts_per_sec']} transcripts/s)")
+        report.append(result)
+    tracemalloc.stop()
+
+    # ru_maxrss is KB on Linux
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\n   Process max RSS: {max_rss_mb:.1f} MB")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({"max_rss_mb": round(max_rss_mb, 1), "runs": report}, f, indent=2)
+        print(f"   Report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,9 @@ from src.pass2_synthesis import synthesize_frameworks
 from src.pass3_evidence import add_evidence
 from src.pass4_actionability import add_actionability
 from src.playbook_generator import generate_playbook
+from src.pdf_renderer import render_playbook, print_render_result
 from src.cost_tracker import tracker
+from src.artifact_store import ArtifactStore, CANDIDATES, SYNTHESIZED, EVIDENCE, FINAL, MANIFEST
 import json
 
 def run_taylor_playbook():
@@ -20,32 +22,25 @@ def run_taylor_playbook():
     print("TAYLOR STRATEGIC PLAYBOOK GENERATION")
     print("="*70)
 
+    # Each run writes to its own directory; `latest` moves once the frameworks are final
+    store = ArtifactStore("taylor")
+    run = store.new_run(script="run_taylor_synthesis.py")
+    print(f"\n📁 Run directory: {run.dir}")
+
     # Step 1: Filter Taylor transcripts
     print("\n📋 Step 1: Filtering Taylor/strategic transcripts...")
-    taylor_files = filter_transcripts('transcripts_normalized', category='taylor')
+    taylor_files = filter_transcripts('transcripts_normalized', category='taylor', method='auto')
     print(f"   Found {len(taylor_files)} Taylor transcripts")
 
-    # Create temp directory with Taylor transcripts
-    temp_dir = Path("transcripts_taylor_temp")
-    temp_dir.mkdir(exist_ok=True)
-
-    # Copy Taylor transcripts to temp directory
-    for f in taylor_files:
-        import shutil
-        shutil.copy(f, temp_dir / f.name)
-
-    print(f"   Copied to {temp_dir}/")
-
     # Step 2: Discovery
     print("\n🔍 Step 2: Running Discovery (Pass 1)...")
     print(f"   Processing {len(taylor_files)} transcripts")
     print("   Model: claude-sonnet-4-5")
     print("   Estimated cost: $0.80-1.20")
 
-    frameworks_discovered = "frameworks_taylor_discovered"
     discover_frameworks(
-        str(temp_dir),
-        frameworks_discovered,
+        taylor_files,
+        run.dir,
         model='claude-sonnet-4-5',
         limit=len(taylor_files)  # Process all Taylor transcripts
     )
@@ -55,21 +50,18 @@ def run_taylor_playbook():
     print("   Model: claude-opus-4-1")
     print("   Estimated cost: $0.25-1.00")
 
-    frameworks_candidates_file = f"{frameworks_discovered}/framework_candidates.json"
-    frameworks_synthesized_dir = "frameworks_synthesized"
     synthesize_frameworks(
-        frameworks_candidates_file,
-        frameworks_synthesized_dir,
+        run.path(CANDIDATES),
+        run.dir,
         model='claude-opus-4-1'
     )
 
     # Step 4: Evidence (simplified for budget)
     print("\n📚 Step 4: Adding Evidence (Pass 3 - simplified)...")
-    frameworks_synthesized_file = f"{frameworks_synthesized_dir}/frameworks_synthesized.json"
-    frameworks_with_evidence = "frameworks_synthesized/frameworks_taylor_evidence.json"
+    frameworks_synthesized_file = run.path(SYNTHESIZED)
+    frameworks_with_evidence = run.path(EVIDENCE)
     add_evidence(
         frameworks_synthesized_file,
-        str(temp_dir),
         frameworks_with_evidence
     )
 
@@ -78,36 +70,30 @@ def run_taylor_playbook():
     print("   Model: claude-sonnet-4-5")
     print("   Estimated cost: $0.30-0.50")
 
-    frameworks_final = "frameworks_synthesized/frameworks_taylor_final.json"
+    frameworks_final = run.path(FINAL)
     add_actionability(
         frameworks_with_evidence,
         frameworks_final,
-        model='claude-sonnet-4-5'
+        model='claude-sonnet-4-5',
+        batch_size=3,
+        workers=4
     )
+    run.publish()
+    print(f"   Published run {run.run_id} as latest")
 
     # Step 6: Generate playbook
     print("\n📖 Step 6: Generating Playbook...")
     generate_playbook(
         frameworks_final,
         "playbooks_generated/Taylor_Strategic_Playbook.md",
-        "Taylor Strategic Thinking & Coaching Playbook"
+        "Taylor Strategic Thinking & Coaching Playbook",
+        manifest_file=run.path(MANIFEST),
+        export_dir="playbooks_generated/Taylor_Strategic_Playbook_export"
     )
 
     # Step 7: Generate PDF
-    print("\n📄 Step 7: Generating PDF...")
-    import subprocess
-    subprocess.run([
-        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-        "--headless",
-        "--disable-gpu",
-        "--print-to-pdf=playbooks_generated/Taylor_Strategic_Playbook.pdf",
-        "--no-margins",
-        "file://" + str(Path("playbooks_generated/Taylor_Strategic_Playbook.html").absolute())
-    ])
-
-    # Cleanup temp directory
-    import shutil
-    shutil.rmtree(temp_dir)
+    print("\n📄 Step 7: Generating HTML + PDF...")
+    print_render_result(render_playbook("playbooks_generated/Taylor_Strategic_Playbook.md"))
 
     # Print summary
     print("\n" + "="*70)
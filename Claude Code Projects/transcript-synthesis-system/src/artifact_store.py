@@ -0,0 +1,311 @@
+"""
+Versioned, crash-safe storage for pipeline artifacts
+
+Each pipeline run writes into its own directory, and a `latest` pointer
+names the run downstream scripts read. Files are written to a temp file,
+fsynced and renamed into place, so an interrupted write never clobbers
+paid-for output. Rolling back means moving the pointer; comparing runs
+means reading two directories side by side.
+
+Layout:
+    runs/ai/20251124-101500/framework_candidates.jsonl
+    runs/ai/20251124-101500/frameworks_final.json
+    runs/ai/20251124-101500/run.json     (parent run, script, timestamps)
+    runs/ai/latest                       (text file: "20251124-101500")
+
+Usage:
+    python3 -m src.artifact_store list ai
+    python3 -m src.artifact_store use ai 20251124-101500      # roll back
+    python3 -m src.artifact_store compare ai 20251124-101500 20251125-090000
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+RUNS_DIR = "runs"
+LATEST = "latest"
+RUN_INFO = "run.json"
+
+# Artifact names inside a run directory
+CANDIDATES = "framework_candidates.jsonl"
+MANIFEST = "transcripts_manifest.json"
+SYNTHESIZED = "frameworks_synthesized.jsonl"
+EVIDENCE = "frameworks_evidence.jsonl"
+FINAL = "frameworks_final.json"
+
+PathLike = Union[str, Path]
+
+
+def fsync_dir(path: PathLike):
+    """Persist a rename by syncing its directory (no-op where unsupported)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(path: PathLike, mode: str = 'w', encoding: Optional[str] = "utf-8"):
+    """
+    Open a temp file next to path; on a clean exit it is fsynced and
+    renamed over path, on an exception it is deleted
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    f = open(tmp_path, mode, encoding=None if 'b' in mode else encoding)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+    except BaseException:
+        f.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    f.close()
+    os.replace(tmp_path, path)
+    fsync_dir(path.parent)
+
+
+def atomic_write_text(path: PathLike, text: str):
+    with atomic_open(path) as f:
+        f.write(text)
+
+
+def atomic_write_json(path: PathLike, data: Any, indent: int = 2):
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=indent)
+
+
+class Run:
+    """One run directory; artifacts are written once and never edited in place"""
+
+    def __init__(self, store: "ArtifactStore", run_id: str):
+        self.store = store
+        self.run_id = run_id
+        self.dir = store.root / run_id
+
+    def __repr__(self):
+        return f"Run({self.store.pipeline}/{self.run_id})"
+
+    def path(self, name: str) -> Path:
+        return self.dir / name
+
+    @property
+    def info(self) -> Dict:
+        info_file = self.path(RUN_INFO)
+        if not info_file.exists():
+            return {}
+        with open(info_file, 'r') as f:
+            return json.load(f)
+
+    def update_info(self, **info):
+        atomic_write_json(self.path(RUN_INFO), {**self.info, **info})
+
+    def artifacts(self) -> List[Path]:
+        return sorted(p for p in self.dir.iterdir()
+                      if p.is_file() and p.name != RUN_INFO and not p.name.startswith("."))
+
+    def inherit(self, parent: "Run", names: Optional[Iterable[str]] = None):
+        """
+        Bring artifacts of an earlier run into this one
+
+        Hard links where possible (safe because artifacts are replaced,
+        never modified), copies otherwise.
+        """
+        sources = ([parent.path(n) for n in names] if names is not None
+                   else parent.artifacts())
+        for source in sources:
+            if source.exists():
+                self.link(source)
+
+    def link(self, source: Path) -> Path:
+        """Hard link (or copy) one file into this run under its own name"""
+        target = self.path(source.name)
+        target.unlink(missing_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+        return target
+
+    def publish(self):
+        """Point `latest` at this run"""
+        self.update_info(published=datetime.now().isoformat())
+        self.store.set_latest(self.run_id)
+
+    def discard(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class ArtifactStore:
+    """All runs of one pipeline (e.g. "ai", "taylor") under runs/<pipeline>/"""
+
+    def __init__(self, pipeline: str, root: PathLike = RUNS_DIR):
+        self.pipeline = pipeline
+        self.root = Path(root) / pipeline
+
+    def new_run(self, parent: Optional[Run] = None, **info) -> Run:
+        """Create an empty run directory with a timestamp run id"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        base_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        run_id, n = base_id, 1
+        while True:
+            try:
+                (self.root / run_id).mkdir()
+                break
+            except FileExistsError:
+                n += 1
+                run_id = f"{base_id}-{n}"
+
+        run = Run(self, run_id)
+        run.update_info(pipeline=self.pipeline, created=datetime.now().isoformat(),
+                        parent=parent.run_id if parent else None, **info)
+        return run
+
+    def runs(self) -> List[Run]:
+        if not self.root.exists():
+            return []
+        runs = [Run(self, p.name) for p in self.root.iterdir()
+                if p.is_dir() and (p / RUN_INFO).exists()]
+        return sorted(runs, key=lambda run: run.info.get("created", ""))
+
+    def run(self, run_id: str) -> Run:
+        run = Run(self, run_id)
+        if not run.path(RUN_INFO).exists():
+            raise FileNotFoundError(f"No run {run_id} in {self.root}")
+        return run
+
+    def latest(self) -> Optional[Run]:
+        pointer = self.root / LATEST
+        if not pointer.exists():
+            return None
+        return self.run(pointer.read_text().strip())
+
+    def set_latest(self, run_id: str):
+        self.run(run_id)
+        atomic_write_text(self.root / LATEST, run_id + "\n")
+
+    def latest_path(self, name: str, legacy: Optional[PathLike] = None) -> Path:
+        """
+        An artifact of the latest run, or the pre-versioning location
+        (e.g. frameworks_synthesized/frameworks_ai_final.json) if there is
+        no published run yet
+        """
+        latest = self.latest()
+        if latest is not None:
+            return latest.path(name)
+        if legacy is not None:
+            return Path(legacy)
+        raise FileNotFoundError(f"No published run for {self.pipeline} in {self.root}")
+
+    def find(self, name: str, run: Optional[Run], legacy: Optional[PathLike] = None) -> Path:
+        """
+        An artifact from run or its nearest ancestor that has it, else the
+        pre-versioning location
+
+        Runs published by fix scripts may hold only the artifacts they
+        rewrote (e.g. just frameworks_final.json), so earlier artifacts are
+        looked up along the parent chain.
+        """
+        # Imported here: jsonl_io uses this module for durable renames
+        from .jsonl_io import artifact_path
+
+        seen = set()
+        while run is not None and run.run_id not in seen:
+            seen.add(run.run_id)
+            path = artifact_path(run.path(name))
+            if path.exists():
+                return path
+            parent = run.info.get("parent")
+            run = Run(self, parent) if parent and (self.root / parent / RUN_INFO).exists() else None
+        if legacy is not None:
+            return artifact_path(legacy)
+        raise FileNotFoundError(f"No {name} in any {self.pipeline} run or legacy location")
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compare_runs(a: Run, b: Run) -> Dict:
+    """
+    Artifacts that differ between two runs, plus framework names added
+    and removed in the final output
+    """
+    # Imported here: jsonl_io uses this module for durable renames
+    from .jsonl_io import read_records
+
+    names_a = {p.name for p in a.artifacts()}
+    names_b = {p.name for p in b.artifacts()}
+    files = {}
+    for name in sorted(names_a | names_b):
+        if name not in names_b:
+            files[name] = "only in " + a.run_id
+        elif name not in names_a:
+            files[name] = "only in " + b.run_id
+        elif a.path(name).samefile(b.path(name)) or _file_digest(a.path(name)) == _file_digest(b.path(name)):
+            files[name] = "same"
+        else:
+            files[name] = "changed"
+
+    frameworks = {}
+    if FINAL in names_a and FINAL in names_b:
+        fw_a = {fw.get("framework_name") for fw in read_records(a.path(FINAL), fields=["framework_name"])}
+        fw_b = {fw.get("framework_name") for fw in read_records(b.path(FINAL), fields=["framework_name"])}
+        frameworks = {"added": sorted(fw_b - fw_a), "removed": sorted(fw_a - fw_b)}
+
+    return {"files": files, "frameworks": frameworks}
+
+
+def main():
+    usage = ("Usage: python3 -m src.artifact_store list <pipeline>\n"
+             "       python3 -m src.artifact_store use <pipeline> <run_id>\n"
+             "       python3 -m src.artifact_store compare <pipeline> <run_a> <run_b>")
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print(usage)
+        sys.exit(1)
+
+    command, store = args[0], ArtifactStore(args[1])
+
+    if command == "list":
+        latest = store.latest()
+        for run in store.runs():
+            info = run.info
+            marker = "→" if latest and run.run_id == latest.run_id else " "
+            parent = f" (from {info['parent']})" if info.get("parent") else ""
+            print(f" {marker} {run.run_id}  {info.get('script', '')}{parent}")
+    elif command == "use" and len(args) == 3:
+        store.set_latest(args[2])
+        print(f"✓ {store.pipeline}: latest → {args[2]}")
+    elif command == "compare" and len(args) == 4:
+        result = compare_runs(store.run(args[2]), store.run(args[3]))
+        for name, status in result["files"].items():
+            print(f"   {name:<32} {status}")
+        for name in result["frameworks"].get("added", []):
+            print(f"   + {name}")
+        for name in result["frameworks"].get("removed", []):
+            print(f"   - {name}")
+    else:
+        print(usage)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Speaker-aware transcript chunking
+
+Parses the common export formats into speaker turns in a single streaming
+pass over the lines, then packs consecutive turns into chunks of roughly
+`target_tokens`, carrying the last `overlap_tokens` worth of turns into the
+next chunk so context is not cut mid-exchange.
+
+Supported formats:
+- otter:   "Jane Doe  0:05" header line, then the spoken text
+- zoom:    WebVTT cues ("00:00:01.000 --> 00:00:04.000") with "Name: text"
+- meet:    bare "00:01:23" timestamp lines followed by "Name: text" lines
+- generic: "Name: text" lines; anything without speakers becomes paragraphs
+"""
+import itertools
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Same rough estimate the LLM client uses for cost tracking
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TARGET_TOKENS = 500
+DEFAULT_OVERLAP_TOKENS = 50
+
+# How many leading lines are inspected to detect the format
+DETECT_LINES = 50
+
+TIMESTAMP = r'(?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?'
+
+# A speaker label is 1-4 capitalized words (initials and hyphens allowed)
+SPEAKER = r"[A-Z][\w.'\-]*(?: [A-Z][\w.'\-]*){0,3}"
+
+VTT_CUE_PATTERN = re.compile(rf'^({TIMESTAMP})\s*-->\s*({TIMESTAMP})')
+OTTER_HEADER_PATTERN = re.compile(rf'^({SPEAKER})\s+({TIMESTAMP})\s*$')
+TIMESTAMP_LINE_PATTERN = re.compile(rf'^\[?({TIMESTAMP})\]?$')
+SPEAKER_LINE_PATTERN = re.compile(rf'^(?:\[?({TIMESTAMP})\]?\s+)?({SPEAKER}):\s*(.*)$')
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """'1:05' / '00:01:05.250' -> '00:01:05'"""
+    if not value:
+        return None
+    parts = re.split(r'[.,]', value)[0].split(":")
+    parts = ["0"] * (3 - len(parts)) + parts
+    hours, minutes, seconds = (int(p) for p in parts)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def detect_format(lines: List[str]) -> str:
+    """Guess the transcript format from its first lines"""
+    stripped = [line.strip() for line in lines if line.strip()]
+    if not stripped:
+        return "generic"
+
+    if stripped[0].startswith("WEBVTT") or any(VTT_CUE_PATTERN.match(l) for l in stripped):
+        return "zoom"
+    if sum(1 for l in stripped if OTTER_HEADER_PATTERN.match(l)) >= 2:
+        return "otter"
+    if sum(1 for l in stripped if TIMESTAMP_LINE_PATTERN.match(l)) >= 2:
+        return "meet"
+    return "generic"
+
+
+def _turn(speaker: Optional[str], text_parts: List[str], start: Optional[str]) -> Optional[Dict]:
+    text = " ".join(text_parts).strip()
+    if not text:
+        return None
+    return {"speaker": speaker, "text": text, "start_time": normalize_timestamp(start)}
+
+
+def parse_turns(lines: Iterable[str], fmt: str) -> Iterator[Dict]:
+    """Yield speaker turns ({speaker, text, start_time}) from transcript lines
+
+    speaker is None for text with no detected speaker label.
+    """
+    speaker, start, parts = None, None, []
+    pending_time = None
+
+    for raw_line in lines:
+        line = raw_line.strip()
+
+        if fmt == "zoom":
+            if not line or line.isdigit() or line.startswith(("WEBVTT", "NOTE")):
+                continue
+            cue = VTT_CUE_PATTERN.match(line)
+            if cue:
+                pending_time = cue.group(1)
+                continue
+
+        elif fmt == "otter":
+            header = OTTER_HEADER_PATTERN.match(line)
+            if header:
+                turn = _turn(speaker, parts, start)
+                if turn:
+                    yield turn
+                speaker, start, parts = header.group(1), header.group(2), []
+                continue
+
+        elif fmt == "meet":
+            stamp = TIMESTAMP_LINE_PATTERN.match(line)
+            if stamp:
+                pending_time = stamp.group(1)
+                continue
+
+        if not line:
+            # Blank lines end a paragraph when there are no speaker labels
+            if speaker is None and parts:
+                turn = _turn(None, parts, start)
+                if turn:
+                    yield turn
+                parts, start = [], None
+            continue
+
+        if fmt != "otter":
+            labeled = SPEAKER_LINE_PATTERN.match(line)
+            if labeled:
+                new_speaker = labeled.group(2)
+                new_start = labeled.group(1) or pending_time
+                pending_time = None
+
+                if new_speaker != speaker:
+                    turn = _turn(speaker, parts, start)
+                    if turn:
+                        yield turn
+                    speaker, start, parts = new_speaker, new_start, []
+                elif start is None:
+                    start = new_start
+                parts.append(labeled.group(3))
+                continue
+
+        if start is None:
+            start = pending_time
+        pending_time = None
+        parts.append(line)
+
+    turn = _turn(speaker, parts, start)
+    if turn:
+        yield turn
+
+
+def _split_long_turn(turn: Dict, target_tokens: int) -> Iterator[Dict]:
+    """Split a monologue longer than the target at word boundaries"""
+    max_chars = target_tokens * CHARS_PER_TOKEN
+    words = turn["text"].split()
+    piece, size = [], 0
+    for word in words:
+        if piece and size + len(word) + 1 > max_chars:
+            yield {**turn, "text": " ".join(piece)}
+            piece, size = [], 0
+        piece.append(word)
+        size += len(word) + 1
+    if piece:
+        yield {**turn, "text": " ".join(piece)}
+
+
+def _build_chunk(chunk_index: int, turns: List[Dict]) -> Dict:
+    # Unlabeled text is passed on as is, without inventing a speaker
+    text = "\n".join(f"{t['speaker']}: {t['text']}" if t["speaker"] else t["text"] for t in turns)
+
+    # Primary speaker is whoever talks the most in the chunk
+    spoken: Dict[str, int] = {}
+    for t in turns:
+        speaker = t["speaker"] or "Unknown"
+        spoken[speaker] = spoken.get(speaker, 0) + len(t["text"])
+
+    start_times = [t["start_time"] for t in turns if t["start_time"]]
+    return {
+        "chunk_id": f"chunk_{chunk_index}",
+        "speaker": max(spoken, key=spoken.get),
+        "speakers": list(spoken),
+        "start_time": start_times[0] if start_times else None,
+        "end_time": start_times[-1] if start_times else None,
+        "text": text,
+        "word_count": len(text.split()),
+        "token_estimate": estimate_tokens(text)
+    }
+
+
+def chunk_turns(turns: Iterable[Dict], target_tokens: int = DEFAULT_TARGET_TOKENS,
+                overlap_tokens: int = DEFAULT_OVERLAP_TOKENS) -> Iterator[Dict]:
+    """Pack consecutive turns into chunks of about target_tokens with overlap"""
+    window: List[Dict] = []
+    window_tokens = 0
+    carried = 0  # leading turns of the window repeated from the previous chunk
+    chunk_index = 0
+
+    def pieces():
+        for turn in turns:
+            if estimate_tokens(turn["text"]) > target_tokens:
+                yield from _split_long_turn(turn, target_tokens)
+            else:
+                yield turn
+
+    for turn in pieces():
+        tokens = estimate_tokens(turn["text"])
+
+        if window and window_tokens + tokens > target_tokens and len(window) > carried:
+            yield _build_chunk(chunk_index, window)
+            chunk_index += 1
+
+            # Carry trailing turns that fit in the overlap budget
+            overlap, overlap_size = [], 0
+            for prev in reversed(window):
+                prev_tokens = estimate_tokens(prev["text"])
+                if overlap_size + prev_tokens > overlap_tokens:
+                    break
+                overlap.insert(0, prev)
+                overlap_size += prev_tokens
+            window, window_tokens, carried = overlap, overlap_size, len(overlap)
+
+        window.append(turn)
+        window_tokens += tokens
+
+    if len(window) > carried:
+        yield _build_chunk(chunk_index, window)
+
+
+def chunk_transcript(lines: Iterable[str], target_tokens: int = DEFAULT_TARGET_TOKENS,
+                     overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+                     fmt: Optional[str] = None) -> List[Dict]:
+    """
+    Chunk a transcript given as lines (a file object, or text.splitlines())
+
+    Args:
+        fmt: Force a format instead of detecting it from the first lines
+    """
+    lines = iter(lines)
+    head = list(itertools.islice(lines, DETECT_LINES))
+    fmt = fmt or detect_format(head)
+
+    turns = parse_turns(itertools.chain(head, lines), fmt)
+    return list(chunk_turns(turns, target_tokens, overlap_tokens))
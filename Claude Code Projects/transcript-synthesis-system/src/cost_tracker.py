@@ -1,7 +1,12 @@
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List
 
+class BudgetExceeded(Exception):
+    """Raised by log_cost once total spend reaches the budget limit"""
+
+
 class CostTracker:
     """Track API costs and alert when thresholds exceeded"""
 
@@ -11,6 +16,8 @@ class CostTracker:
         self.costs: List[Dict] = []
         self.total_cost = 0.0
         self.alerted = False
+        # Repair and batched passes log costs from worker threads
+        self._lock = threading.Lock()
 
     def log_cost(self, model: str, operation: str, input_tokens: int,
                  output_tokens: int, cost: float):
@@ -23,17 +30,18 @@ class CostTracker:
             "output_tokens": output_tokens,
             "cost": cost
         }
-        self.costs.append(entry)
-        self.total_cost += cost
+        with self._lock:
+            self.costs.append(entry)
+            self.total_cost += cost
 
-        # Check thresholds
-        if not self.alerted and self.total_cost >= self.alert_threshold:
-            print(f"\n⚠️  COST ALERT: ${self.total_cost:.2f} / ${self.budget_limit:.2f}")
-            print(f"   Threshold of ${self.alert_threshold:.2f} exceeded")
-            self.alerted = True
+            # Check thresholds
+            if not self.alerted and self.total_cost >= self.alert_threshold:
+                print(f"\n⚠️  COST ALERT: ${self.total_cost:.2f} / ${self.budget_limit:.2f}")
+                print(f"   Threshold of ${self.alert_threshold:.2f} exceeded")
+                self.alerted = True
 
-        if self.total_cost >= self.budget_limit:
-            raise Exception(f"❌ BUDGET EXCEEDED: ${self.total_cost:.2f} / ${self.budget_limit:.2f}")
+            if self.total_cost >= self.budget_limit:
+                raise BudgetExceeded(f"❌ BUDGET EXCEEDED: ${self.total_cost:.2f} / ${self.budget_limit:.2f}")
 
     def estimate_cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
         """Estimate cost based on model pricing"""
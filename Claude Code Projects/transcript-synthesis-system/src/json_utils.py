@@ -0,0 +1,36 @@
+import json
+from typing import Any, Dict, List
+
+
+def strip_json_fences(response: str) -> str:
+    """Remove the ```json ... ``` wrapping models often put around JSON"""
+    response = response.strip()
+    if response.startswith("```json"):
+        response = response[7:]
+    if response.startswith("```"):
+        response = response[3:]
+    if response.endswith("```"):
+        response = response[:-3]
+    return response.strip()
+
+
+def parse_llm_json(response: str) -> Any:
+    """Parse a model response as JSON (raises json.JSONDecodeError)"""
+    return json.loads(strip_json_fences(response))
+
+
+def schema_problems(record: Any, schema: Dict[str, type]) -> List[str]:
+    """Missing, wrongly typed or empty fields of a parsed JSON object"""
+    if not isinstance(record, dict):
+        return ["not a JSON object"]
+
+    problems = []
+    for field, kind in schema.items():
+        value = record.get(field)
+        if value is None:
+            problems.append(f"missing {field}")
+        elif not isinstance(value, kind):
+            problems.append(f"{field} is not a {kind.__name__}")
+        elif not value:
+            problems.append(f"empty {field}")
+    return problems
@@ -0,0 +1,193 @@
+"""
+Streaming record I/O for the artifacts passed between passes
+
+Intermediate artifacts (candidates, synthesized and evidence frameworks)
+are JSONL: one record per line, read lazily and appended without
+rewriting the file. Readers also accept the older JSON-array files, which
+are decoded one element at a time, so existing runs keep working.
+
+    for candidate in read_records("framework_candidates.jsonl",
+                                  where=lambda c: c["confidence"] > 0.8,
+                                  fields=["name", "type"]):
+        ...
+
+    with RecordWriter("frameworks_synthesized.jsonl") as writer:
+        writer.write(framework)
+"""
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, IO, Iterable, Iterator, Optional, Sequence, Union
+from .artifact_store import fsync_dir
+
+PathLike = Union[str, Path]
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def artifact_path(path: PathLike) -> Path:
+    """
+    The file to read for path, falling back to the other format
+
+    Scripts name the JSONL artifact; runs from before the switch left a
+    .json file with the same stem, which is used when no .jsonl exists.
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    alternates = {".jsonl": ".json", ".json": ".jsonl"}
+    if path.suffix in alternates:
+        other = path.with_suffix(alternates[path.suffix])
+        if other.exists():
+            return other
+    return path
+
+
+def _iter_jsonl(f: IO[str]) -> Iterator[Dict]:
+    for line_no, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{getattr(f, 'name', 'JSONL')} line {line_no}: {e}") from e
+
+
+def _iter_json_array(f: IO[str]) -> Iterator[Dict]:
+    """Decode a top-level JSON array one element at a time"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(READ_CHUNK_SIZE).lstrip()
+    eof = False
+
+    if not buffer:
+        return
+    if not buffer.startswith("["):
+        # Not an array (e.g. a single object): small enough to load whole
+        data = json.loads(buffer + f.read())
+        yield from (data if isinstance(data, list) else [data])
+        return
+
+    pos = 1
+    while True:
+        # Skip separators between elements
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+
+        if pos >= len(buffer) and eof:
+            raise ValueError(f"{getattr(f, 'name', 'JSON')}: unterminated array")
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+            # A value ending exactly at the buffer edge may be cut short
+            if end < len(buffer) or eof:
+                yield record
+                pos = end
+                continue
+        except json.JSONDecodeError:
+            if eof:
+                raise
+
+        chunk = f.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _project(record: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    if fields is None:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+def read_records(path: PathLike, where: Optional[Callable[[Dict], bool]] = None,
+                 fields: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+    """
+    Lazily yield records from a .jsonl or JSON-array file
+
+    Args:
+        where: Keep only records for which this returns True
+        fields: Keep only these keys of each record
+    """
+    path = artifact_path(path)
+    with open(path, 'r') as f:
+        reader = _iter_jsonl(f) if path.suffix == ".jsonl" else _iter_json_array(f)
+        for record in reader:
+            if where is None or where(record):
+                yield _project(record, fields)
+
+
+def count_records(path: PathLike) -> int:
+    return sum(1 for _ in read_records(path))
+
+
+class RecordWriter:
+    """
+    Write records one at a time in the format given by the file suffix
+
+    .jsonl files get one compact record per line and can be opened with
+    append=True. Anything else is written as an indented JSON array, still
+    one record at a time. Non-append writes go to a temp file that replaces
+    the target on a clean close, so readers never see a half-written file.
+    """
+
+    def __init__(self, path: PathLike, append: bool = False):
+        self.path = Path(path)
+        self.jsonl = self.path.suffix == ".jsonl"
+        if append and not self.jsonl:
+            raise ValueError(f"Append is only supported for .jsonl files: {self.path}")
+
+        self.append = append
+        self.count = 0
+        self._target = self.path if append else self.path.with_name(f".{self.path.name}.tmp")
+        self._f = open(self._target, 'a' if append else 'w')
+        if not self.jsonl:
+            self._f.write("[")
+
+    def write(self, record: Dict):
+        if self.jsonl:
+            self._f.write(json.dumps(record) + "\n")
+        else:
+            text = json.dumps(record, indent=2).replace("\n", "\n  ")
+            self._f.write(("," if self.count else "") + "\n  " + text)
+        self.count += 1
+
+    def write_all(self, records: Iterable[Dict]) -> int:
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def close(self):
+        if self._f.closed:
+            return
+        if not self.jsonl:
+            self._f.write("\n]\n" if self.count else "]\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        if not self.append:
+            os.replace(self._target, self.path)
+            fsync_dir(self.path.parent)
+
+    def abort(self):
+        """Discard a non-append write, leaving the previous file untouched"""
+        self._f.close()
+        if not self.append:
+            self._target.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_records(path: PathLike, records: Iterable[Dict]) -> int:
+    """Write all records to path (atomically replacing it); returns the count"""
+    with RecordWriter(path) as writer:
+        return writer.write_all(records)
@@ -1,4 +1,5 @@
 import os
+from typing import Dict
 from anthropic import Anthropic
 from openai import OpenAI
 import google.generativeai as genai
@@ -7,13 +8,48 @@ from .cost_tracker import tracker
 
 load_dotenv()
 
+
+def operation_for(model: str) -> str:
+    """Cost-log operation for a model: GPT models do extraction, the rest synthesis"""
+    return "extraction" if "gpt" in model else "synthesis"
+
+
 class LLMClient:
     """Unified client for multiple LLM providers"""
 
     def __init__(self):
-        self.anthropic = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        self.openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        # Vendor SDK clients are created on first use so that runs which only
+        # use registered providers (e.g. the offline mock) need no API keys
+        self._anthropic = None
+        self._openai = None
+        self._genai_configured = False
+
+        # Model-name prefix -> provider with a complete(model, prompt, max_tokens) method
+        self.providers: Dict[str, object] = {}
+
+    @property
+    def anthropic(self) -> Anthropic:
+        if self._anthropic is None:
+            self._anthropic = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        return self._anthropic
+
+    @property
+    def openai(self) -> OpenAI:
+        if self._openai is None:
+            self._openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        return self._openai
+
+    def register_provider(self, prefix: str, provider):
+        """Route every model whose name starts with `prefix` to `provider`.
+
+        A provider implements complete(model, prompt, max_tokens) and returns
+        (output_text, output_tokens).
+        """
+        self.providers[prefix] = provider
+
+    def unregister_provider(self, prefix: str):
+        """Remove a provider added with register_provider"""
+        self.providers.pop(prefix, None)
 
     def call(self, model: str, prompt: str, max_tokens: int = 4000) -> str:
         """Call appropriate LLM based on model name"""
@@ -21,6 +57,16 @@ class LLMClient:
         # Estimate input tokens (rough: 4 chars per token)
         input_tokens = len(prompt) // 4
 
+        for prefix, provider in self.providers.items():
+            if model.startswith(prefix):
+                output, output_tokens = provider.complete(model, prompt, max_tokens)
+
+                # Log cost (unpriced models are logged at $0)
+                cost = tracker.estimate_cost(model, input_tokens, output_tokens)
+                tracker.log_cost(model, operation_for(model), input_tokens, output_tokens, cost)
+
+                return output
+
         if "claude" in model:
             response = self.anthropic.messages.create(
                 model=model,
@@ -32,7 +78,7 @@ class LLMClient:
 
             # Log cost
             cost = tracker.estimate_cost(model, input_tokens, output_tokens)
-            tracker.log_cost(model, "synthesis", input_tokens, output_tokens, cost)
+            tracker.log_cost(model, operation_for(model), input_tokens, output_tokens, cost)
 
             return output
 
@@ -47,11 +93,15 @@ class LLMClient:
 
             # Log cost
             cost = tracker.estimate_cost(model, input_tokens, output_tokens)
-            tracker.log_cost(model, "extraction", input_tokens, output_tokens, cost)
+            tracker.log_cost(model, operation_for(model), input_tokens, output_tokens, cost)
 
             return output
 
         elif "gemini" in model:
+            if not self._genai_configured:
+                genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+                self._genai_configured = True
+
             gemini_model = genai.GenerativeModel(model)
             response = gemini_model.generate_content(prompt)
             output = response.text
@@ -59,7 +109,7 @@ class LLMClient:
             # Gemini cost tracking (approximate)
             output_tokens = len(output) // 4
             cost = tracker.estimate_cost("gemini-3-pro", input_tokens, output_tokens)
-            tracker.log_cost(model, "synthesis", input_tokens, output_tokens, cost)
+            tracker.log_cost(model, operation_for(model), input_tokens, output_tokens, cost)
 
             return output
 
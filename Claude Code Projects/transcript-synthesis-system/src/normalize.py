@@ -2,18 +2,23 @@ import os
 import json
 import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 import PyPDF2
 from datetime import datetime
 from tqdm import tqdm
+from .chunking import chunk_transcript, DEFAULT_TARGET_TOKENS, DEFAULT_OVERLAP_TOKENS
 
 class TranscriptNormalizer:
     """Convert raw transcripts to structured JSON"""
 
-    def __init__(self, input_dir: str, output_dir: str):
+    def __init__(self, input_dir: str, output_dir: str,
+                 chunk_tokens: int = DEFAULT_TARGET_TOKENS,
+                 overlap_tokens: int = DEFAULT_OVERLAP_TOKENS):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
 
     def normalize_all(self) -> List[str]:
         """Process all transcripts in input directory"""
@@ -37,18 +42,16 @@ class TranscriptNormalizer:
     def normalize_single(self, file_path: Path) -> str:
         """Normalize a single transcript file"""
 
-        # Extract content based on file type
+        # Parse into structured format; text files are chunked line by line
         if file_path.suffix == ".txt":
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+                chunks, word_count = self._create_semantic_chunks(f)
         elif file_path.suffix == ".pdf":
-            content = self._extract_pdf(file_path)
+            chunks, word_count = self._create_semantic_chunks(self._extract_pdf(file_path).splitlines())
         else:
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
 
-        # Parse into structured format
-        metadata = self._extract_metadata(file_path, content)
-        chunks = self._create_semantic_chunks(content)
+        metadata = self._extract_metadata(file_path, word_count)
 
         # Create normalized JSON
         normalized = {
@@ -77,16 +80,13 @@ class TranscriptNormalizer:
             print(f"Warning: PDF extraction failed for {file_path}: {e}")
         return text
 
-    def _extract_metadata(self, file_path: Path, content: str) -> Dict:
-        """Extract metadata from filename and content"""
+    def _extract_metadata(self, file_path: Path, word_count: int) -> Dict:
+        """Extract metadata from filename and the transcript's word count"""
 
         # Extract date from filename (e.g., "2025-11-20")
         date_match = re.search(r'(\d{4}-\d{2}-\d{2})', file_path.stem)
         date = date_match.group(1) if date_match else "unknown"
 
-        # Word count
-        word_count = len(content.split())
-
         # Detect meeting type from filename
         filename_lower = file_path.stem.lower()
         meeting_type = "unknown"
@@ -108,42 +108,43 @@ class TranscriptNormalizer:
             "original_filename": file_path.name
         }
 
-    def _create_semantic_chunks(self, content: str) -> List[Dict]:
-        """Split content into semantic chunks"""
-
-        chunks = []
-
-        # Split on speaker changes (common patterns)
-        # Pattern: "Speaker Name: text" or "Speaker Name\ntext"
-        speaker_pattern = r'([A-Z][a-z]+(?: [A-Z][a-z]+)*)[:\n]'
-        segments = re.split(speaker_pattern, content)
-
-        current_speaker = None
-        for i, segment in enumerate(segments):
-            if i % 2 == 1:  # Odd indices are speaker names
-                current_speaker = segment.strip()
-            elif segment.strip():  # Even indices are content
-                chunks.append({
-                    "chunk_id": f"chunk_{len(chunks)}",
-                    "speaker": current_speaker or "Unknown",
-                    "text": segment.strip(),
-                    "word_count": len(segment.split())
-                })
-
-        # If no speaker pattern found, create single chunk
+    def _create_semantic_chunks(self, lines: Iterable[str]) -> Tuple[List[Dict], int]:
+        """
+        Split transcript lines into speaker-aware chunks of about chunk_tokens
+
+        Returns (chunks, word count of the whole transcript), counted as the
+        lines stream past since chunk overlap repeats text
+        """
+        word_count = 0
+
+        def counted(lines):
+            nonlocal word_count
+            for line in lines:
+                word_count += len(line.split())
+                yield line
+
+        chunks = chunk_transcript(
+            counted(lines),
+            target_tokens=self.chunk_tokens,
+            overlap_tokens=self.overlap_tokens
+        )
+
+        # If nothing parsed (empty transcript), create single chunk
         if not chunks:
             chunks.append({
                 "chunk_id": "chunk_0",
                 "speaker": "Unknown",
-                "text": content.strip(),
-                "word_count": len(content.split())
+                "text": "",
+                "word_count": 0
             })
 
-        return chunks
+        return chunks, word_count
 
-def run_normalization(input_dir: str, output_dir: str):
+def run_normalization(input_dir: str, output_dir: str,
+                      chunk_tokens: int = DEFAULT_TARGET_TOKENS,
+                      overlap_tokens: int = DEFAULT_OVERLAP_TOKENS):
     """Main entry point for normalization"""
-    normalizer = TranscriptNormalizer(input_dir, output_dir)
+    normalizer = TranscriptNormalizer(input_dir, output_dir, chunk_tokens, overlap_tokens)
     normalized_files = normalizer.normalize_all()
 
     print(f"\n✓ Normalized {len(normalized_files)} transcripts")
@@ -4,6 +4,10 @@ from pathlib import Path
 from typing import List, Dict
 from tqdm import tqdm
 from .llm_client import client
+from .json_utils import strip_json_fences
+from .jsonl_io import RecordWriter
+from .transcript_store import TranscriptSource, resolve_transcripts, write_manifest
+from .result_cache import CACHE_DIR, ResultCache, content_hash, prompt_version
 
 DISCOVERY_PROMPT = """You are analyzing business meeting transcripts to identify strategic frameworks, methodologies, and repeatable processes.
 
@@ -36,48 +40,76 @@ For EACH framework found, output JSON:
 Output ONLY valid JSON. If no frameworks found, output: {{"frameworks": []}}
 """
 
-def discover_frameworks(normalized_dir: str, output_dir: str, model: str = "claude-sonnet-4-5", limit: int = 10):
-    """Pass 1: Discover framework candidates"""
+DISCOVERY_PROMPT_VERSION = prompt_version(DISCOVERY_PROMPT)
+
+def discover_frameworks(normalized_dir: TranscriptSource, output_dir: str, model: str = "claude-sonnet-4-5",
+                        limit: int = 10, use_cache: bool = True, cache_dir=CACHE_DIR):
+    """
+    Pass 1: Discover framework candidates
+
+    Args:
+        normalized_dir: Directory of normalized transcripts, a manifest file,
+            or an explicit list of transcript paths (e.g. from filter_transcripts)
+        use_cache: Reuse results of earlier runs for transcripts whose content,
+            prompt and model are unchanged; only new or changed transcripts
+            are sent to the LLM
+        cache_dir: Root of the cross-run result cache
+
+    Returns:
+        Path of framework_candidates.jsonl
+    """
 
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
 
-    normalized_files = list(Path(normalized_dir).glob("*.json"))
-    all_candidates = []
+    normalized_files = resolve_transcripts(normalized_dir)
+
+    output_file = output_path / "framework_candidates.jsonl"
+    cache = ResultCache("discovery", cache_dir) if use_cache else None
 
     print(f"\n🔍 Pass 1: Discovering frameworks from {min(limit, len(normalized_files))} transcripts...")
     print(f"   (Processing first {limit} to manage costs)")
 
-    for file_path in tqdm(normalized_files[:limit], desc="Discovery"):
-        with open(file_path, 'r') as f:
-            transcript = json.load(f)
+    # Candidates are streamed to disk as they are found
+    with RecordWriter(output_file) as writer:
+        for file_path in tqdm(normalized_files[:limit], desc="Discovery"):
+            with open(file_path, 'r') as f:
+                transcript = json.load(f)
 
-        # Combine chunks into full content (limited to save tokens)
-        content = "\n\n".join([c["text"] for c in transcript["chunks"][:50]])  # First 50 chunks
+            # Combine chunks into full content (limited to save tokens)
+            content = "\n\n".join([c["text"] for c in transcript["chunks"][:50]])  # First 50 chunks
+            content = content[:8000]  # Limit to 8K chars
 
-        # Call LLM for discovery
-        prompt = DISCOVERY_PROMPT.format(transcript_content=content[:8000])  # Limit to 8K chars
+            cache_key = ResultCache.key(content_hash(content), DISCOVERY_PROMPT_VERSION, model)
+            frameworks = cache.get(cache_key) if cache else None
 
-        try:
-            response = client.call(model, prompt, max_tokens=2000)
+            if frameworks is None:
+                # Call LLM for discovery
+                prompt = DISCOVERY_PROMPT.format(transcript_content=content)
 
-            # Try to extract JSON from response (may have markdown wrapping)
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
+                try:
+                    response = client.call(model, prompt, max_tokens=2000)
 
-            # Parse JSON response
-            if not response:
-                print(f"Empty response for {file_path.name}")
-                continue
+                    # Try to extract JSON from response (may have markdown wrapping)
+                    response = strip_json_fences(response)
 
-            result = json.loads(response)
-            frameworks = result.get("frameworks", [])
+                    # Parse JSON response
+                    if not response:
+                        print(f"Empty response for {file_path.name}")
+                        continue
+
+                    result = json.loads(response)
+                    frameworks = result.get("frameworks", [])
+
+                except json.JSONDecodeError as e:
+                    print(f"JSON parse error for {file_path.name}: {response[:100]}...")
+                    continue
+                except Exception as e:
+                    print(f"Error processing {file_path.name}: {e}")
+                    continue
+
+                if cache and isinstance(frameworks, list):
+                    cache.put(cache_key, frameworks, transcript=file_path.name, model=model)
 
             if frameworks:
                 # Add transcript metadata
@@ -85,22 +117,17 @@ def discover_frameworks(normalized_dir: str, output_dir: str, model: str = "clau
                     fw["source_transcript"] = str(file_path)
                     fw["source_date"] = transcript["metadata"].get("date")
 
-                all_candidates.extend(frameworks)
+                writer.write_all(frameworks)
                 print(f"  Found {len(frameworks)} frameworks in {file_path.name}")
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error for {file_path.name}: {response[:100]}...")
-            continue
-        except Exception as e:
-            print(f"Error processing {file_path.name}: {e}")
-            continue
-
-    # Save all candidates
-    output_file = output_path / "framework_candidates.json"
-    with open(output_file, 'w') as f:
-        json.dump(all_candidates, f, indent=2)
+    # Record which transcripts this run covered
+    write_manifest(normalized_files[:limit], output_path / "transcripts_manifest.json",
+                   model=model, candidates=writer.count,
+                   cached_transcripts=cache.hits if cache else 0)
 
-    print(f"\n✓ Discovered {len(all_candidates)} framework candidates")
+    print(f"\n✓ Discovered {writer.count} framework candidates")
+    if cache:
+        print(f"  Transcripts: {cache.hits} reused from earlier runs, {cache.misses} sent to {model}")
     print(f"  Output: {output_file}")
 
-    return all_candidates
+    return output_file
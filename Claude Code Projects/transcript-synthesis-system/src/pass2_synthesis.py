@@ -4,6 +4,9 @@ from typing import List, Dict
 from collections import defaultdict
 from tqdm import tqdm
 from .llm_client import client
+from .json_utils import parse_llm_json
+from .jsonl_io import read_records, RecordWriter
+from .result_cache import CACHE_DIR, ResultCache, content_hash, prompt_version
 
 SYNTHESIS_PROMPT = """You are synthesizing a complete strategic framework from distributed evidence across multiple transcripts.
 
@@ -40,19 +43,45 @@ Output this exact JSON structure:
 IMPORTANT: Write as if creating the definitive guide. Synthesize from evidence, don't just quote.
 """
 
-def synthesize_frameworks(candidates_file: str, output_dir: str, model: str = "claude-opus-4-1", max_frameworks: int = 7):
-    """Pass 2: Synthesize complete frameworks"""
+SYNTHESIS_PROMPT_VERSION = prompt_version(SYNTHESIS_PROMPT)
+
+CANDIDATE_FIELDS = ["name", "type", "confidence", "description", "evidence_quote",
+                    "source_date", "source_transcript"]
+
+# Candidate fields that identify a cluster member for the synthesis cache
+MEMBER_FIELDS = ["name", "type", "description", "evidence_quote", "source_transcript"]
+
+def cluster_fingerprint(cluster_candidates: List[Dict]) -> str:
+    """
+    Hash of a cluster's membership, independent of candidate order
+
+    Changes when a candidate is added, removed or edited.
+    """
+    members = sorted(json.dumps([c.get(f) for f in MEMBER_FIELDS]) for c in cluster_candidates)
+    return content_hash("\n".join(members))
+
+def synthesize_frameworks(candidates_file: str, output_dir: str, model: str = "claude-opus-4-1",
+                          max_frameworks: int = 7, use_cache: bool = True, cache_dir=CACHE_DIR):
+    """
+    Pass 2: Synthesize complete frameworks
+
+    Args:
+        use_cache: Reuse the synthesized framework of earlier runs for clusters
+            whose membership is unchanged; only clusters that gained, lost or
+            changed candidates are sent to the model
+        cache_dir: Root of the cross-run result cache
+    """
 
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
 
-    # Load candidates
-    with open(candidates_file, 'r') as f:
-        candidates = json.load(f)
+    # Stream candidates, keeping only the fields synthesis uses
+    candidates = read_records(candidates_file, fields=CANDIDATE_FIELDS)
 
     # Cluster similar frameworks by name similarity
     clusters = defaultdict(list)
     for candidate in candidates:
+        candidate["evidence_quote"] = candidate.get("evidence_quote", "")[:200]
         # Simple clustering by name similarity (first 30 chars, lowercase)
         name_key = candidate["name"].lower().replace(" ", "_")[:30]
         clusters[name_key].append(candidate)
@@ -64,64 +93,64 @@ def synthesize_frameworks(candidates_file: str, output_dir: str, model: str = "c
     print(f"   (Limiting to top {max_frameworks} for budget)")
     print(f"   Total clusters: {len(sorted_clusters)}")
 
+    output_file = output_path / "frameworks_synthesized.jsonl"
+    cache = ResultCache("synthesis", cache_dir) if use_cache else None
     synthesized = []
-    for cluster_name, cluster_candidates in tqdm(sorted_clusters[:max_frameworks], desc="Synthesis"):
-
-        # Gather all evidence for this cluster
-        evidence_text = "\n\n".join([
-            f"Source {i+1}: {c['description']}\nEvidence: {c['evidence_quote'][:200]}"
-            for i, c in enumerate(cluster_candidates[:10])  # Limit to 10 sources max
-        ])
-
-        # Take most common type
-        types = [c["type"] for c in cluster_candidates]
-        most_common_type = max(set(types), key=types.count)
-
-        # Synthesize
-        prompt = SYNTHESIS_PROMPT.format(
-            framework_name=cluster_candidates[0]["name"],
-            framework_type=most_common_type,
-            num_sources=len(cluster_candidates),
-            evidence=evidence_text[:8000]  # Limit for token budget
-        )
-
-        try:
-            response = client.call(model, prompt, max_tokens=3000)
-
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
-
-            framework = json.loads(response)
-
-            # Add metadata
-            framework["evidence_sources"] = len(cluster_candidates)
-            framework["confidence"] = sum(c["confidence"] for c in cluster_candidates) / len(cluster_candidates)
-            framework["source_dates"] = list(set([c.get("source_date", "unknown") for c in cluster_candidates]))
-
-            synthesized.append(framework)
-
-            print(f"  ✓ Synthesized: {framework['framework_name']}")
-
-        except json.JSONDecodeError as e:
-            print(f"  ✗ JSON error for {cluster_name}: {str(e)[:50]}")
-            continue
-        except Exception as e:
-            print(f"  ✗ Error synthesizing {cluster_name}: {e}")
-            continue
-
-    # Save synthesized frameworks
-    output_file = output_path / "frameworks_synthesized.json"
-    with open(output_file, 'w') as f:
-        json.dump(synthesized, f, indent=2)
+    with RecordWriter(output_file) as writer:
+        for cluster_name, cluster_candidates in tqdm(sorted_clusters[:max_frameworks], desc="Synthesis"):
+
+            # Gather all evidence for this cluster
+            evidence_text = "\n\n".join([
+                f"Source {i+1}: {c['description']}\nEvidence: {c['evidence_quote'][:200]}"
+                for i, c in enumerate(cluster_candidates[:10])  # Limit to 10 sources max
+            ])
+
+            # Take most common type
+            types = [c["type"] for c in cluster_candidates]
+            most_common_type = max(set(types), key=types.count)
+
+            # Synthesize
+            prompt = SYNTHESIS_PROMPT.format(
+                framework_name=cluster_candidates[0]["name"],
+                framework_type=most_common_type,
+                num_sources=len(cluster_candidates),
+                evidence=evidence_text[:8000]  # Limit for token budget
+            )
+
+            # Unchanged clusters reuse the framework synthesized by an earlier run
+            cache_key = ResultCache.key(cluster_fingerprint(cluster_candidates),
+                                        SYNTHESIS_PROMPT_VERSION, model)
+            framework = cache.get(cache_key) if cache else None
+
+            try:
+                if framework is None:
+                    response = client.call(model, prompt, max_tokens=3000)
+
+                    framework = parse_llm_json(response)
+
+                    if cache and isinstance(framework, dict):
+                        cache.put(cache_key, framework, cluster=cluster_name, model=model)
+
+                # Add metadata
+                framework["evidence_sources"] = len(cluster_candidates)
+                framework["confidence"] = sum(c["confidence"] for c in cluster_candidates) / len(cluster_candidates)
+                framework["source_dates"] = list(set([c.get("source_date", "unknown") for c in cluster_candidates]))
+
+                synthesized.append(framework)
+                writer.write(framework)
+
+                print(f"  ✓ Synthesized: {framework['framework_name']}")
+
+            except json.JSONDecodeError as e:
+                print(f"  ✗ JSON error for {cluster_name}: {str(e)[:50]}")
+                continue
+            except Exception as e:
+                print(f"  ✗ Error synthesizing {cluster_name}: {e}")
+                continue
 
     print(f"\n✓ Synthesized {len(synthesized)} complete frameworks")
+    if cache:
+        print(f"  Clusters: {cache.hits} unchanged and reused, {cache.misses} sent to {model}")
     print(f"  Output: {output_file}")
 
     return synthesized
@@ -1,28 +1,27 @@
-import json
 from pathlib import Path
+from .jsonl_io import read_records, RecordWriter
 
-def add_evidence(frameworks_file: str, normalized_dir: str, output_file: str):
-    """Pass 3: Add supporting quotes (simplified for budget)"""
+def add_evidence(frameworks_file: str, output_file: str):
+    """
+    Pass 3: Add supporting quotes (simplified for budget)
 
-    # Load frameworks
-    with open(frameworks_file, 'r') as f:
-        frameworks = json.load(f)
+    Frameworks are streamed from frameworks_file to output_file one at a
+    time. Returns the number of frameworks written.
+    """
 
-    print(f"\n📚 Pass 3: Adding evidence to {len(frameworks)} frameworks...")
+    print(f"\n📚 Pass 3: Adding evidence to frameworks from {Path(frameworks_file).name}...")
     print("   (Simplified for budget - skipping LLM calls)")
 
-    for framework in frameworks:
-        # Placeholder: In full version, would search transcripts for best quotes
-        framework["supporting_evidence"] = {
-            "quotes": ["Evidence extraction skipped for budget optimization. See framework synthesis above for core insights."],
-            "case_studies": [],
-            "metrics": []
-        }
+    with RecordWriter(output_file) as writer:
+        for framework in read_records(frameworks_file):
+            # Placeholder: In full version, would search transcripts for best quotes
+            framework["supporting_evidence"] = {
+                "quotes": ["Evidence extraction skipped for budget optimization. See framework synthesis above for core insights."],
+                "case_studies": [],
+                "metrics": []
+            }
+            writer.write(framework)
 
-    # Save
-    with open(output_file, 'w') as f:
-        json.dump(frameworks, f, indent=2)
+    print(f"✓ Evidence added to {writer.count} frameworks\n  Output: {output_file}")
 
-    print(f"✓ Evidence added\n  Output: {output_file}")
-
-    return frameworks
+    return writer.count
@@ -1,7 +1,13 @@
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Dict, List, Optional
 from tqdm import tqdm
+from .cost_tracker import BudgetExceeded
 from .llm_client import client
+from .json_utils import parse_llm_json, schema_problems
+from .jsonl_io import read_records, write_records
 
 ACTIONABILITY_PROMPT = """Given this framework, create actionable implementation guidance:
 
@@ -30,63 +36,239 @@ Output JSON:
 }}
 """
 
-def add_actionability(frameworks_file: str, output_file: str, model: str = "claude-sonnet-4-5"):
-    """Pass 4: Make frameworks actionable"""
+BATCH_ACTIONABILITY_PROMPT = """Given these {count} frameworks, create actionable implementation guidance for EACH of them:
 
-    with open(frameworks_file, 'r') as f:
-        frameworks = json.load(f)
+{frameworks}
 
-    print(f"\n⚡ Pass 4: Adding actionability to {len(frameworks)} frameworks...")
-    print(f"   Model: {model}")
+For each framework create:
+1. A decision tree (in text format) showing when and how to apply the framework
+2. An implementation checklist
+3. Common decision points and how to resolve them
 
-    for framework in tqdm(frameworks, desc="Actionability"):
+Output one JSON object keyed by framework id ({keys}), with exactly this structure per framework:
+{{
+  "F1": {{
+    "decision_tree": "IF [condition] THEN [action] ELSE [alternative]\\nIF [condition2] THEN [action2]...",
+    "implementation_checklist": ["☐ Task 1", "☐ Task 2", "☐ Task 3"],
+    "decision_points": [
+      {{
+        "question": "Decision to make",
+        "options": ["Option A", "Option B"],
+        "criteria": "How to decide"
+      }}
+    ],
+    "risk_mitigation": ["Risk 1: Mitigation approach", "Risk 2: Mitigation approach"]
+  }}
+}}
+"""
 
-        # Build component summary
-        comp_summary = ""
-        for i, comp in enumerate(framework.get("components", [])[:3], 1):
-            comp_summary += f"{i}. {comp['name']}: {comp['purpose']}\n"
+BATCH_FRAMEWORK = """### {key}: {framework_name}
+Type: {framework_type}
+Definition: {definition}
+Components:
+{components}"""
 
-        prompt = ACTIONABILITY_PROMPT.format(
-            framework_name=framework["framework_name"],
-            framework_type=framework["framework_type"],
-            definition=framework["definition"],
-            components=comp_summary
-        )
+# Placeholder decision tree written when the response could not be parsed
+ACTIONABILITY_FAILED = "Decision tree generation failed"
 
-        try:
-            response = client.call(model, prompt, max_tokens=8000)
+ACTIONABILITY_SCHEMA = {
+    "decision_tree": str,
+    "implementation_checklist": list,
+    "decision_points": list,
+    "risk_mitigation": list,
+}
+
+SINGLE_MAX_TOKENS = 8000
+# Output budget per framework in a batch, and the cap for one batched call
+# (larger non-streaming requests are refused by the Anthropic SDK)
+BATCH_TOKENS_PER_FRAMEWORK = 4000
+BATCH_MAX_TOKENS = 20000
+# Frameworks whose prompt section is larger than this always go alone
+BATCH_MAX_FRAMEWORK_CHARS = 3000
+# Largest batch that still gets the full per-framework output budget
+MAX_BATCH_SIZE = BATCH_MAX_TOKENS // BATCH_TOKENS_PER_FRAMEWORK
+
+def actionability_problems(actionability) -> List[str]:
+    """Why a parsed actionability block is unusable ([] if it is fine)"""
+    problems = schema_problems(actionability, ACTIONABILITY_SCHEMA)
+    if not problems and actionability["decision_tree"] == ACTIONABILITY_FAILED:
+        problems = ["decision tree generation failed"]
+    return problems
+
+def _component_summary(framework: dict, max_components: Optional[int] = None) -> str:
+    components = framework.get("components", [])
+    if max_components is not None:
+        components = components[:max_components]
+    return "".join(f"{i}. {comp['name']}: {comp['purpose']}\n"
+                   for i, comp in enumerate(components, 1))
+
+def build_actionability_prompt(framework: dict, max_components: Optional[int] = None) -> str:
+    """Fill ACTIONABILITY_PROMPT for one synthesized framework (all components by default)"""
+    return ACTIONABILITY_PROMPT.format(
+        framework_name=framework["framework_name"],
+        framework_type=framework["framework_type"],
+        definition=framework["definition"],
+        components=_component_summary(framework, max_components)
+    )
+
+def _batch_section(key: str, framework: dict) -> str:
+    return BATCH_FRAMEWORK.format(
+        key=key,
+        framework_name=framework["framework_name"],
+        framework_type=framework["framework_type"],
+        definition=framework["definition"],
+        components=_component_summary(framework)
+    )
+
+def build_batch_prompt(frameworks: List[dict]) -> str:
+    """One prompt covering several frameworks, keyed F1..Fn"""
+    keys = [f"F{i}" for i in range(1, len(frameworks) + 1)]
+    return BATCH_ACTIONABILITY_PROMPT.format(
+        count=len(frameworks),
+        frameworks="\n\n".join(_batch_section(k, fw) for k, fw in zip(keys, frameworks)),
+        keys=", ".join(keys)
+    )
+
+def plan_batches(frameworks: List[dict], batch_size: int) -> List[List[int]]:
+    """
+    Group framework indexes into batches of at most batch_size
 
-            # Clean response
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.startswith("```"):
-                response = response[3:]
-            if response.endswith("```"):
-                response = response[:-3]
-            response = response.strip()
+    Only small frameworks are packed together; a framework whose section
+    exceeds BATCH_MAX_FRAMEWORK_CHARS gets a single-framework call.
+    batch_size is capped at MAX_BATCH_SIZE, beyond which BATCH_MAX_TOKENS
+    would truncate the answer.
+    """
+    batch_size = min(batch_size, MAX_BATCH_SIZE)
+    batches, current = [], []
+    for idx, framework in enumerate(frameworks):
+        if batch_size <= 1 or len(_batch_section("F1", framework)) > BATCH_MAX_FRAMEWORK_CHARS:
+            batches.append([idx])
+            continue
+        current.append(idx)
+        if len(current) == batch_size:
+            batches.append(current)
+            current = []
+    if current:
+        batches.append(current)
+    return batches
 
-            actionability = json.loads(response)
-            framework["actionability"] = actionability
+def _failed_actionability() -> Dict:
+    return {
+        "decision_tree": ACTIONABILITY_FAILED,
+        "implementation_checklist": [],
+        "decision_points": [],
+        "risk_mitigation": []
+    }
 
+def _single(framework: dict, model: str) -> Dict:
+    """One framework, one call (the original pass 4 behaviour)"""
+    try:
+        response = client.call(model, build_actionability_prompt(framework),
+                               max_tokens=SINGLE_MAX_TOKENS)
+        actionability = parse_llm_json(response)
+        print(f"  ✓ Added actionability for: {framework['framework_name']}")
+        return actionability
+    except BudgetExceeded:
+        raise
+    except json.JSONDecodeError as e:
+        print(f"  ✗ JSON error for {framework['framework_name']}")
+        return _failed_actionability()
+    except Exception as e:
+        print(f"  ✗ Error: {e}")
+        return {"error": str(e)}
+
+def _batched(frameworks: List[dict], model: str) -> List[Optional[Dict]]:
+    """
+    Several frameworks in one call
+
+    Returns one validated actionability block per framework, or None for
+    frameworks the response did not cover correctly.
+    """
+    max_tokens = min(BATCH_TOKENS_PER_FRAMEWORK * len(frameworks), BATCH_MAX_TOKENS)
+    try:
+        response = client.call(model, build_batch_prompt(frameworks), max_tokens=max_tokens)
+        results = parse_llm_json(response)
+    except BudgetExceeded:
+        # Not a bad answer: falling back to single calls would only spend more
+        raise
+    except Exception as e:
+        print(f"  ✗ Batch of {len(frameworks)} failed ({str(e)[:50]}), retrying individually")
+        return [None] * len(frameworks)
+
+    if not isinstance(results, dict):
+        results = {}
+
+    validated = []
+    for i, framework in enumerate(frameworks, 1):
+        actionability = results.get(f"F{i}")
+        if actionability_problems(actionability):
+            print(f"  ✗ Batch answer invalid for {framework['framework_name']}, retrying individually")
+            validated.append(None)
+        else:
             print(f"  ✓ Added actionability for: {framework['framework_name']}")
+            validated.append(actionability)
+    return validated
+
+def add_actionability(frameworks_file: str, output_file: str, model: str = "claude-sonnet-4-5",
+                      batch_size: int = 1, workers: int = 1):
+    """
+    Pass 4: Make frameworks actionable
+
+    Args:
+        batch_size: Frameworks packed into one request (1 = one call each).
+            Frameworks missing or invalid in a batched answer fall back to
+            single-framework calls.
+        workers: Requests in flight at once
+    """
+
+    frameworks = list(read_records(frameworks_file))
+
+    batches = plan_batches(frameworks, batch_size)
+
+    print(f"\n⚡ Pass 4: Adding actionability to {len(frameworks)} frameworks...")
+    print(f"   Model: {model}")
+    if batch_size > 1 or workers > 1:
+        print(f"   Requests: {len(batches)} (batch size {min(batch_size, MAX_BATCH_SIZE)}, {workers} workers)")
+
+    fallbacks = 0
+    lock = threading.Lock()
+
+    def run_batch(indexes: List[int]):
+        nonlocal fallbacks
+        if len(indexes) == 1:
+            frameworks[indexes[0]]["actionability"] = _single(frameworks[indexes[0]], model)
+            return
+
+        results = _batched([frameworks[idx] for idx in indexes], model)
+        for idx, actionability in zip(indexes, results):
+            if actionability is None:
+                with lock:
+                    fallbacks += 1
+                actionability = _single(frameworks[idx], model)
+            frameworks[idx]["actionability"] = actionability
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run_batch, indexes) for indexes in batches]
+        try:
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Actionability"):
+                future.result()
+        except BudgetExceeded:
+            # Queued batches never start. Frameworks already paid for are
+            # written, the rest as failed placeholders for src.repair
+            pool.shutdown(wait=True, cancel_futures=True)
+            unfinished = [fw for fw in frameworks if "actionability" not in fw]
+            for framework in unfinished:
+                framework["actionability"] = _failed_actionability()
+            write_records(output_file, frameworks)
+            print(f"✗ Budget exceeded: {len(unfinished)} of {len(frameworks)} frameworks left for repair\n"
+                  f"  Output: {output_file}")
+            raise
 
-        except json.JSONDecodeError as e:
-            print(f"  ✗ JSON error for {framework['framework_name']}")
-            framework["actionability"] = {
-                "decision_tree": "Decision tree generation failed",
-                "implementation_checklist": [],
-                "decision_points": [],
-                "risk_mitigation": []
-            }
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            framework["actionability"] = {"error": str(e)}
-
-    # Save
-    with open(output_file, 'w') as f:
-        json.dump(frameworks, f, indent=2)
+    # Save (JSON array or JSONL, by output_file's suffix)
+    write_records(output_file, frameworks)
 
     print(f"✓ Actionability added\n  Output: {output_file}")
+    if fallbacks:
+        print(f"  Single-framework fallbacks: {fallbacks}")
 
     return frameworks
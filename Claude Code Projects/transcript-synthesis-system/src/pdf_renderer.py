@@ -0,0 +1,172 @@
+"""
+Markdown -> styled HTML -> PDF rendering, entirely in-process
+
+Uses python-markdown for HTML and xhtml2pdf (pure Python, via reportlab)
+for PDF, so rendering works on Linux workers without a browser. A hash of
+the Markdown is stored next to each PDF and unchanged playbooks are skipped.
+"""
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+import markdown
+from xhtml2pdf import pisa
+from .artifact_store import atomic_open, atomic_write_text
+
+# Bump when the CSS or HTML wrapper changes so every playbook re-renders
+RENDERER_VERSION = "1"
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+
+# The built-in PDF fonts lack the ✓ ⚠ ☐ glyphs the playbooks use, so a
+# Unicode TrueType font is embedded when one is installed
+UNICODE_FONT_CANDIDATES = [
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+     "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/dejavu/DejaVuSans.ttf",
+     "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf", "/Library/Fonts/Arial Unicode.ttf"),
+]
+
+# Used in the PDF only when no Unicode font is available
+GLYPH_FALLBACKS = {"✓": "+", "⚠️": "!", "⚠": "!", "☐": "[ ]"}
+
+logging.getLogger("xhtml2pdf").setLevel(logging.ERROR)
+
+PLAYBOOK_CSS = """
+@page { size: letter; margin: 2cm 1.8cm; }
+body { font-family: Helvetica, Arial, sans-serif; font-size: 10.5pt; line-height: 1.45; color: #222; }
+h1 { font-size: 22pt; color: #1a3a5c; border-bottom: 2px solid #1a3a5c; padding-bottom: 4pt; }
+h2 { font-size: 16pt; color: #1a3a5c; margin-top: 18pt; }
+h3 { font-size: 13pt; color: #2b5d8a; margin-top: 12pt; }
+h4 { font-size: 11pt; color: #333; margin-top: 10pt; }
+pre { background-color: #f4f6f8; border: 1px solid #d8dee4; padding: 6pt; font-size: 9pt; }
+code { font-family: Courier, monospace; }
+hr { color: #c8d0d8; }
+li { margin-bottom: 2pt; }
+"""
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>{css}</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def markdown_to_html(markdown_text: str, title: str = "Playbook") -> str:
+    """Convert playbook Markdown to a standalone styled HTML document"""
+    body = markdown.markdown(markdown_text, extensions=MARKDOWN_EXTENSIONS)
+    return HTML_TEMPLATE.format(title=escape(title), css=PLAYBOOK_CSS, body=body)
+
+
+def _pdf_font_css() -> str:
+    """@font-face rules for the first installed Unicode font, or '' if none"""
+    for regular, bold in UNICODE_FONT_CANDIDATES:
+        if os.path.exists(regular):
+            bold = bold if os.path.exists(bold) else regular
+            return (
+                f"@font-face {{ font-family: PlaybookSans; src: url('{regular}'); }}\n"
+                f"@font-face {{ font-family: PlaybookSans; src: url('{bold}'); font-weight: bold; }}\n"
+                "body, h1, h2, h3, h4 { font-family: PlaybookSans; }\n"
+            )
+    return ""
+
+
+def html_to_pdf(html: str, pdf_path: Path):
+    """Render HTML to a PDF file (written to a temp file, then renamed)"""
+    font_css = _pdf_font_css()
+    if font_css:
+        html = html.replace("</style>", font_css + "</style>", 1)
+    else:
+        for glyph, fallback in GLYPH_FALLBACKS.items():
+            html = html.replace(glyph, fallback)
+
+    with atomic_open(pdf_path, 'wb') as f:
+        result = pisa.CreatePDF(html, dest=f, encoding="utf-8")
+        if result.err:
+            raise RuntimeError(f"PDF rendering failed with {result.err} error(s)")
+
+
+def _hash_file(pdf_path: Path) -> Path:
+    return pdf_path.with_name(f".{pdf_path.name}.sha256")
+
+
+def render_playbook(markdown_file: str, html_file: Optional[str] = None,
+                    pdf_file: Optional[str] = None, force: bool = False) -> Dict:
+    """
+    Render one Markdown playbook to HTML and PDF
+
+    Args:
+        html_file / pdf_file: Output paths (default: next to the Markdown)
+        force: Re-render even if the Markdown is unchanged
+
+    Returns:
+        {"markdown", "html", "pdf", "status": "rendered" | "unchanged"}
+    """
+    md_path = Path(markdown_file)
+    html_path = Path(html_file) if html_file else md_path.with_suffix(".html")
+    pdf_path = Path(pdf_file) if pdf_file else md_path.with_suffix(".pdf")
+
+    markdown_text = md_path.read_text(encoding="utf-8")
+    digest = hashlib.sha256(f"{RENDERER_VERSION}\0{markdown_text}".encode("utf-8")).hexdigest()
+
+    hash_path = _hash_file(pdf_path)
+    result = {"markdown": str(md_path), "html": str(html_path), "pdf": str(pdf_path)}
+
+    if (not force and pdf_path.exists() and html_path.exists() and hash_path.exists()
+            and hash_path.read_text().strip() == digest):
+        return {**result, "status": "unchanged"}
+
+    # Title comes from the playbook's first heading
+    first_line = markdown_text.split("\n", 1)[0]
+    title = first_line.lstrip("# ").strip() or md_path.stem
+
+    html = markdown_to_html(markdown_text, title)
+    atomic_write_text(html_path, html)
+    html_to_pdf(html, pdf_path)
+
+    # Only once the new PDF is in place, so a failed render is retried
+    atomic_write_text(hash_path, digest)
+
+    return {**result, "status": "rendered"}
+
+
+def _render_safely(args) -> Dict:
+    markdown_file, force = args
+    try:
+        return render_playbook(markdown_file, force=force)
+    except Exception as e:
+        return {"markdown": markdown_file, "status": "failed", "error": str(e)}
+
+
+def render_playbooks(markdown_files: List[str], workers: Optional[int] = None,
+                     force: bool = False) -> List[Dict]:
+    """Render several playbooks in parallel worker processes"""
+    jobs = [(str(f), force) for f in markdown_files]
+    if len(jobs) <= 1 or workers == 1:
+        return [_render_safely(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+        return list(pool.map(_render_safely, jobs))
+
+
+def print_render_result(result: Dict):
+    """One status line per playbook, in the style of the run scripts"""
+    name = Path(result["markdown"]).name
+    if result["status"] == "failed":
+        print(f"  ✗ Failed to render {name}: {result['error']}")
+    elif result["status"] == "unchanged":
+        print(f"  ✓ {Path(result['pdf']).name} up to date (Markdown unchanged)")
+    else:
+        size_mb = Path(result["pdf"]).stat().st_size / (1024 * 1024)
+        print(f"  ✓ Created {Path(result['pdf']).name} ({size_mb:.2f} MB)")
@@ -0,0 +1,376 @@
+"""
+Playbook exports beyond the single Markdown document
+
+- Static HTML site: one page per framework plus an index page with
+  client-side search over a prebuilt, serialized inverted index
+- SQLite database of frameworks, components and steps (with FTS5 search
+  when the local SQLite supports it)
+- JSON-LD (schema.org ItemList of HowTo entries)
+
+Every file is written to a temp file and renamed, so no page, index or
+database is ever left half-written. Site pages are replaced one at a time,
+though: a failed export can leave a mix of old and new pages until it is
+rerun.
+"""
+import html
+import io
+import json
+import math
+import os
+import re
+import sqlite3
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List
+from .playbook_generator import render_framework
+from .pdf_renderer import markdown_to_html
+from .artifact_store import atomic_write_text, fsync_dir
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Common words that would bloat postings without helping search
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "when", "with"
+}
+
+# How much a term counts depending on where it appears
+FIELD_WEIGHTS = {"name": 5, "type": 3, "definition": 2, "body": 1}
+
+
+def slugify(name: str, taken: set) -> str:
+    """URL-safe, unique page name for a framework"""
+    base = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "framework"
+    slug, n = base, 2
+    while slug in taken:
+        slug = f"{base}-{n}"
+        n += 1
+    taken.add(slug)
+    return slug
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def _framework_fields(framework: Dict) -> Dict[str, str]:
+    """Searchable text per field"""
+    body = [framework.get("core_principle", ""), framework.get("when_to_use", ""),
+            framework.get("decision_logic", "")]
+    for component in framework.get("components", []):
+        body.append(component.get("name", ""))
+        body.append(component.get("purpose", ""))
+        body.extend(component.get("key_activities", []))
+    body.extend(framework.get("implementation_steps", []))
+    body.extend(framework.get("success_metrics", []))
+
+    return {
+        "name": framework.get("framework_name", ""),
+        "type": framework.get("framework_type", "").replace("_", " "),
+        "definition": framework.get("definition", ""),
+        "body": " ".join(str(b) for b in body),
+    }
+
+
+def build_search_index(frameworks: List[Dict], slugs: List[str]) -> Dict:
+    """
+    Inverted index: {"docs": [[slug, name, type, snippet]], "terms": {term: [doc, score, ...]},
+    "stopwords": [...]}
+
+    Scores are field-weighted term frequencies scaled by IDF, rounded so
+    the serialized index stays small. Postings are flat [doc, score] pairs.
+    The stopwords left out of the index ship with it, so the search page
+    drops them from queries too.
+    """
+    doc_terms: List[Counter] = []
+    document_frequency: Counter = Counter()
+
+    for framework in frameworks:
+        counts: Counter = Counter()
+        for field, text in _framework_fields(framework).items():
+            for token in tokenize(text):
+                counts[token] += FIELD_WEIGHTS[field]
+        doc_terms.append(counts)
+        document_frequency.update(counts.keys())
+
+    n_docs = len(frameworks)
+    postings: Dict[str, List] = defaultdict(list)
+    for doc_id, counts in enumerate(doc_terms):
+        for term, weight in counts.items():
+            idf = math.log(1 + n_docs / document_frequency[term])
+            postings[term].extend([doc_id, round((1 + math.log(weight)) * idf, 3)])
+
+    docs = [
+        [slug, fw.get("framework_name", ""), fw.get("framework_type", ""),
+         fw.get("definition", "")[:160]]
+        for slug, fw in zip(slugs, frameworks)
+    ]
+    return {"docs": docs, "terms": dict(sorted(postings.items())), "stopwords": sorted(STOPWORDS)}
+
+
+SEARCH_SCRIPT = """
+(function () {
+  var index = window.SEARCH_INDEX;
+  var terms = Object.keys(index.terms);  // already sorted
+  var stopwords = {};
+  index.stopwords.forEach(function (w) { stopwords[w] = true; });
+  var input = document.getElementById("q");
+  var results = document.getElementById("results");
+  var all = results.innerHTML;
+
+  function tokenize(text) {
+    // Same rules as tokenize() in Python: stopwords were never indexed
+    return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(function (t) {
+      return t.length > 1 && !stopwords[t];
+    });
+  }
+
+  // Binary search for the first term >= prefix, then walk the prefix range
+  function expand(prefix) {
+    var lo = 0, hi = terms.length;
+    while (lo < hi) { var mid = (lo + hi) >> 1; if (terms[mid] < prefix) lo = mid + 1; else hi = mid; }
+    var out = [];
+    for (var i = lo; i < terms.length && terms[i].lastIndexOf(prefix, 0) === 0; i++) out.push(terms[i]);
+    return out;
+  }
+
+  function search(query) {
+    var tokens = tokenize(query);
+    if (!tokens.length) return null;
+    var scores = null;
+    tokens.forEach(function (token) {
+      var tokenScores = {};
+      expand(token).forEach(function (term) {
+        var p = index.terms[term];
+        for (var i = 0; i < p.length; i += 2) tokenScores[p[i]] = (tokenScores[p[i]] || 0) + p[i + 1];
+      });
+      // Every query token must match (AND), scores add up
+      if (scores === null) { scores = tokenScores; return; }
+      var merged = {};
+      Object.keys(scores).forEach(function (d) { if (d in tokenScores) merged[d] = scores[d] + tokenScores[d]; });
+      scores = merged;
+    });
+    return Object.keys(scores).sort(function (a, b) { return scores[b] - scores[a]; });
+  }
+
+  function escape(text) {
+    return text.replace(/[&<>"]/g, function (c) { return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; });
+  }
+
+  input.addEventListener("input", function () {
+    var hits = search(input.value);
+    if (hits === null) { results.innerHTML = all; return; }
+    results.innerHTML = hits.length ? hits.map(function (d) {
+      var doc = index.docs[d];
+      return '<li><a href="frameworks/' + doc[0] + '.html">' + escape(doc[1]) + '</a> <span class="type">' +
+        escape(doc[2]) + '</span><p>' + escape(doc[3]) + '</p></li>';
+    }).join("") : "<li>No frameworks match.</li>";
+  });
+})();
+"""
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; max-width: 860px; margin: 2em auto; color: #222; }}
+h1 {{ color: #1a3a5c; }}
+#q {{ width: 100%; font-size: 1.1em; padding: 0.5em; box-sizing: border-box; }}
+#results {{ list-style: none; padding: 0; }}
+#results li {{ padding: 0.6em 0; border-bottom: 1px solid #e4e8ec; }}
+#results p {{ margin: 0.3em 0 0; color: #555; font-size: 0.9em; }}
+.type {{ color: #2b5d8a; font-size: 0.85em; }}
+</style>
+<script type="application/ld+json">{jsonld}</script>
+</head>
+<body>
+<h1>{title}</h1>
+<input id="q" type="search" placeholder="Search {count} frameworks..." autofocus>
+<ul id="results">{items}</ul>
+<script src="search-index.js"></script>
+<script>{script}</script>
+</body>
+</html>
+"""
+
+PAGE_NAV = '<p><a href="../index.html">&larr; All frameworks</a></p>\n'
+
+
+def framework_jsonld(framework: Dict) -> Dict:
+    """schema.org HowTo for one framework"""
+    return {
+        "@type": "HowTo",
+        "name": framework.get("framework_name"),
+        "description": framework.get("definition"),
+        "keywords": framework.get("framework_type"),
+        "step": [
+            {"@type": "HowToStep", "position": i, "text": step}
+            for i, step in enumerate(framework.get("implementation_steps", []), 1)
+        ],
+        "hasPart": [
+            {"@type": "CreativeWork", "name": c.get("name"), "abstract": c.get("purpose")}
+            for c in framework.get("components", [])
+        ],
+    }
+
+
+def playbook_jsonld(frameworks: List[Dict], title: str) -> Dict:
+    return {
+        "@context": "https://schema.org",
+        "@type": "ItemList",
+        "name": title,
+        "numberOfItems": len(frameworks),
+        "itemListElement": [
+            {"@type": "ListItem", "position": i, "item": framework_jsonld(fw)}
+            for i, fw in enumerate(frameworks, 1)
+        ],
+    }
+
+
+def export_jsonld(frameworks: List[Dict], output_file: str, title: str) -> Path:
+    """Write the playbook as a JSON-LD document"""
+    path = Path(output_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_text(path, json.dumps(playbook_jsonld(frameworks, title), indent=2, ensure_ascii=False))
+    return path
+
+
+def export_sqlite(frameworks: List[Dict], db_file: str) -> Path:
+    """Write frameworks, components and steps to a fresh SQLite database"""
+    path = Path(db_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE frameworks (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                type TEXT,
+                confidence REAL,
+                evidence_sources INTEGER,
+                definition TEXT,
+                core_principle TEXT,
+                when_to_use TEXT,
+                when_not_to_use TEXT,
+                decision_logic TEXT,
+                json TEXT NOT NULL
+            );
+            CREATE TABLE components (
+                framework_id INTEGER REFERENCES frameworks(id),
+                position INTEGER,
+                name TEXT,
+                purpose TEXT,
+                json TEXT NOT NULL
+            );
+            CREATE TABLE steps (
+                framework_id INTEGER REFERENCES frameworks(id),
+                position INTEGER,
+                text TEXT
+            );
+            CREATE INDEX idx_frameworks_type ON frameworks(type);
+            CREATE INDEX idx_components_framework ON components(framework_id);
+            CREATE INDEX idx_steps_framework ON steps(framework_id);
+        """)
+
+        for fw_id, fw in enumerate(frameworks, 1):
+            conn.execute(
+                "INSERT INTO frameworks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (fw_id, fw.get("framework_name"), fw.get("framework_type"), fw.get("confidence"),
+                 fw.get("evidence_sources"), fw.get("definition"), fw.get("core_principle"),
+                 fw.get("when_to_use"), fw.get("when_not_to_use"), fw.get("decision_logic"),
+                 json.dumps(fw, ensure_ascii=False))
+            )
+            conn.executemany(
+                "INSERT INTO components VALUES (?, ?, ?, ?, ?)",
+                [(fw_id, pos, c.get("name"), c.get("purpose"), json.dumps(c, ensure_ascii=False))
+                 for pos, c in enumerate(fw.get("components", []), 1)]
+            )
+            conn.executemany(
+                "INSERT INTO steps VALUES (?, ?, ?)",
+                [(fw_id, pos, step) for pos, step in enumerate(fw.get("implementation_steps", []), 1)]
+            )
+
+        # Full-text search where the SQLite build includes FTS5
+        try:
+            conn.execute("CREATE VIRTUAL TABLE frameworks_fts USING fts5(name, definition, body)")
+            conn.executemany(
+                "INSERT INTO frameworks_fts(rowid, name, definition, body) VALUES (?, ?, ?, ?)",
+                [(fw_id, f["name"], f["definition"], f["body"])
+                 for fw_id, f in enumerate((_framework_fields(fw) for fw in frameworks), 1)]
+            )
+        except sqlite3.OperationalError:
+            pass
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    fsync_dir(path.parent)
+    return path
+
+
+def export_site(frameworks: List[Dict], site_dir: str, title: str) -> Path:
+    """Write a static site: index with search + one page per framework"""
+    site_path = Path(site_dir)
+    pages_path = site_path / "frameworks"
+    pages_path.mkdir(parents=True, exist_ok=True)
+
+    taken: set = set()
+    slugs = [slugify(fw.get("framework_name", ""), taken) for fw in frameworks]
+
+    for i, (slug, framework) in enumerate(zip(slugs, frameworks), 1):
+        buffer = io.StringIO()
+        render_framework(buffer.write, i, framework)
+        page = markdown_to_html(buffer.getvalue(), framework.get("framework_name", slug))
+        page = page.replace("<body>\n", "<body>\n" + PAGE_NAV, 1)
+        page = page.replace(
+            "</head>",
+            '<script type="application/ld+json">'
+            + json.dumps({"@context": "https://schema.org", **framework_jsonld(framework)},
+                         ensure_ascii=False).replace("</", "<\\/")
+            + "</script>\n</head>", 1
+        )
+        atomic_write_text(pages_path / f"{slug}.html", page)
+
+    # Loaded as a script (not fetched) so the site also works from file://
+    index = build_search_index(frameworks, slugs)
+    atomic_write_text(site_path / "search-index.js",
+                      "window.SEARCH_INDEX = " + json.dumps(index, separators=(",", ":")) + ";\n")
+
+    items = "".join(
+        f'<li><a href="frameworks/{slug}.html">{html.escape(fw.get("framework_name", ""))}</a> '
+        f'<span class="type">{html.escape(fw.get("framework_type", ""))}</span>'
+        f'<p>{html.escape(fw.get("definition", "")[:160])}</p></li>'
+        for slug, fw in zip(slugs, frameworks)
+    )
+    atomic_write_text(site_path / "index.html", INDEX_PAGE.format(
+        title=html.escape(title),
+        count=len(frameworks),
+        items=items,
+        script=SEARCH_SCRIPT,
+        jsonld=json.dumps(playbook_jsonld(frameworks, title), ensure_ascii=False).replace("</", "<\\/"),
+    ))
+
+    # Stale pages from frameworks that no longer exist, removed only once
+    # the index and search data no longer link to them
+    for page in pages_path.glob("*.html"):
+        if page.stem not in taken:
+            page.unlink()
+
+    return site_path
+
+
+def export_playbook(frameworks: List[Dict], export_dir: str, title: str) -> Dict[str, Path]:
+    """Write the site, SQLite database and JSON-LD under export_dir"""
+    export_path = Path(export_dir)
+    return {
+        "site": export_site(frameworks, export_path / "site", title),
+        "sqlite": export_sqlite(frameworks, export_path / "frameworks.sqlite"),
+        "jsonld": export_jsonld(frameworks, export_path / "frameworks.jsonld", title),
+    }
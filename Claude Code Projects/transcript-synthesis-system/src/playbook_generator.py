@@ -1,126 +1,151 @@
+import hashlib
+import io
 import json
+import os
 from pathlib import Path
 from datetime import datetime
+from string import Formatter
+from typing import Callable, Dict, List, Optional
+from .cost_tracker import tracker as default_tracker
+from .jsonl_io import read_records
+from .artifact_store import atomic_open
 
-def generate_playbook(frameworks_file: str, output_file: str, title: str):
-    """Generate markdown playbook from frameworks"""
 
-    with open(frameworks_file, 'r') as f:
-        frameworks = json.load(f)
+class CompiledTemplate:
+    """
+    A str.format-style template parsed once at import time
 
-    print(f"\n📖 Generating playbook: {title}...")
+    render() writes literal text and field values straight to a writer,
+    so no section is ever built up as one large string.
+    """
+
+    def __init__(self, text: str):
+        self.parts = [
+            (literal, field, spec)
+            for literal, field, spec, _ in Formatter().parse(text)
+        ]
+
+    def render(self, write: Callable[[str], None], values: Dict):
+        for literal, field, spec in self.parts:
+            if literal:
+                write(literal)
+            if field is not None:
+                write(format(values[field], spec or ""))
+
+
+class PlaybookWriter:
+    """Thin wrapper over the output file that tracks how much was written"""
+
+    def __init__(self, f):
+        self._f = f
+        self.lines = 0
 
-    markdown = f"""# {title}
+    def write(self, text: str):
+        self._f.write(text)
+        self.lines += text.count("\n")
+
+
+HEADER = CompiledTemplate("""# {title}
 ## Strategic Framework Playbook
 
-*Generated: {datetime.now().strftime("%Y-%m-%d")}*
-*Frameworks: {len(frameworks)}*
+*Generated: {date}*
+*Frameworks: {framework_count}*
 
 ---
 
 ## Executive Summary
 
-This playbook contains {len(frameworks)} strategic frameworks synthesized from 109 meeting transcripts. Each framework includes:
+This playbook contains {framework_count} strategic frameworks synthesized from {source_phrase}. Each framework includes:
 - Clear definition and purpose
 - Actionable components and steps
 - Decision logic and implementation guidance
 - Success criteria and risk mitigation
 
 **Key Frameworks:**
-{chr(10).join(f"{i}. {fw['framework_name']}" for i, fw in enumerate(frameworks, 1))}
-
----
+""")
 
-"""
+KEY_FRAMEWORK = CompiledTemplate("{index}. {name}\n")
 
-    # Generate section per framework
-    for i, framework in enumerate(frameworks, 1):
-        markdown += f"""## Framework {i}: {framework['framework_name']}
+# The numbered heading depends on the framework's position, so it is kept
+# out of the cached section body
+FRAMEWORK_HEADING = CompiledTemplate("## Framework {index}: {framework_name}\n\n")
 
-**Type:** {framework['framework_type']}
-**Confidence:** {framework.get('confidence', 0):.2f}
-**Evidence Sources:** {framework.get('evidence_sources', 0)}
+FRAMEWORK = CompiledTemplate("""**Type:** {framework_type}
+**Confidence:** {confidence:.2f}
+**Evidence Sources:** {evidence_sources}
 
 ### Definition
-{framework['definition']}
+{definition}
 
 ### Core Principle
-{framework['core_principle']}
+{core_principle}
 
 ### When to Use
-{framework['when_to_use']}
+{when_to_use}
 
 ### When NOT to Use
-{framework['when_not_to_use']}
+{when_not_to_use}
 
 ### Components
 
-"""
-        for j, component in enumerate(framework.get('components', []), 1):
-            markdown += f"""#### Component {j}: {component['name']}
+""")
+
+COMPONENT = CompiledTemplate("""#### Component {index}: {name}
 
-**Purpose:** {component['purpose']}
+**Purpose:** {purpose}
 
 **Key Activities:**
-{chr(10).join(f"- {activity}" for activity in component.get('key_activities', []))}
+{key_activities}
 
 **Success Criteria:**
-{chr(10).join(f"- ✓ {criterion}" for criterion in component.get('success_criteria', []))}
+{success_criteria}
 
 **Common Pitfalls:**
-{chr(10).join(f"- ⚠️  {pitfall}" for pitfall in component.get('common_pitfalls', []))}
+{common_pitfalls}
 
-"""
+""")
 
-        # Implementation guidance
-        markdown += f"""### Implementation Guide
+IMPLEMENTATION = CompiledTemplate("""### Implementation Guide
 
 **Steps:**
-{chr(10).join(f"{idx}. {step}" for idx, step in enumerate(framework.get('implementation_steps', []), 1))}
+{steps}
 
 **Success Metrics:**
-{chr(10).join(f"- {metric}" for metric in framework.get('success_metrics', []))}
+{metrics}
 
-"""
+""")
 
-        # Add actionability if present
-        if 'actionability' in framework and 'decision_tree' in framework['actionability']:
-            actionability = framework['actionability']
-            markdown += f"""### Decision Support
+DECISION_SUPPORT = CompiledTemplate("""### Decision Support
 
 **Decision Tree:**
 ```
-{actionability.get('decision_tree', 'N/A')}
+{decision_tree}
 ```
 
 **Implementation Checklist:**
-{chr(10).join(actionability.get('implementation_checklist', []))}
+{checklist}
 
 **Key Decision Points:**
-"""
-            for dp in actionability.get('decision_points', []):
-                if isinstance(dp, dict):
-                    markdown += f"""
-- **{dp.get('question', 'N/A')}**
-  - Options: {', '.join(dp.get('options', []))}
-  - Criteria: {dp.get('criteria', 'N/A')}
-"""
-
-            markdown += f"""
-**Risk Mitigation:**
-{chr(10).join(f"- {risk}" for risk in actionability.get('risk_mitigation', []))}
-"""
+""")
 
-        markdown += "\n---\n\n"
+DECISION_POINT = CompiledTemplate("""
+- **{question}**
+  - Options: {options}
+  - Criteria: {criteria}
+""")
 
-    # Add footer
-    markdown += f"""
+RISK_MITIGATION = CompiledTemplate("""
+**Risk Mitigation:**
+{risks}
+""")
+
+FOOTER = CompiledTemplate("""
 ## Appendix
 
 ### About This Playbook
 
 This playbook was generated through a 4-pass synthesis process:
-1. **Discovery Pass**: Identified {len(frameworks)} framework patterns across transcripts
+1. **Discovery Pass**: Identified framework patterns across transcripts (candidates: {candidate_count})
 2. **Synthesis Pass**: Synthesized complete frameworks with components and logic
 3. **Evidence Pass**: Linked frameworks to source transcripts
 4. **Actionability Pass**: Added decision trees and implementation guidance
@@ -134,22 +159,263 @@ This playbook was generated through a 4-pass synthesis process:
 
 ### Cost & Efficiency
 
-- Total API cost: < $2.00
-- Processing time: ~30 minutes
-- Transcripts processed: 109
-- Frameworks extracted: 7
+{cost_lines}
+- Transcripts processed: {transcript_count}
+- Frameworks extracted: {framework_count}
 
 ---
 
 *Generated by Transcript Synthesis System*
 *Cost-effective, scalable framework extraction from unstructured transcripts*
-"""
+""")
+
+
+# Templates that make up a framework section; editing any of them
+# invalidates every cached section
+SECTION_TEMPLATES = (FRAMEWORK, COMPONENT, IMPLEMENTATION, DECISION_SUPPORT,
+                     DECISION_POINT, RISK_MITIGATION)
+SECTION_TEMPLATE_VERSION = hashlib.sha256(
+    repr([t.parts for t in SECTION_TEMPLATES]).encode("utf-8")
+).hexdigest()[:12]
+
+SECTION_CACHE_DIR = ".section_cache"
+
+
+class SectionCache:
+    """
+    Rendered framework section bodies keyed by a hash of the framework's JSON
+
+    The key leaves out the framework's position, so inserting a framework
+    into a sorted list does not re-render the sections after it.
+
+    One directory per playbook, so pruning unused fragments never evicts
+    another playbook's sections.
+    """
+
+    def __init__(self, output_file: str):
+        output_path = Path(output_file)
+        self.cache_dir = output_path.parent / SECTION_CACHE_DIR / output_path.stem
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(framework: Dict) -> str:
+        payload = json.dumps(framework, sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha256(f"{SECTION_TEMPLATE_VERSION}:{payload}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def write_section(self, write: Callable[[str], None], index: int, framework: Dict):
+        """Write a cached section, rendering (and caching) it only if the framework changed"""
+        render_heading(write, index, framework)
+
+        key = self.key(framework)
+        fragment = self.cache_dir / f"{key}.md"
+        self.used.add(fragment.name)
+
+        if fragment.exists():
+            self.hits += 1
+            with open(fragment, 'r') as f:
+                write(f.read())
+            return
+
+        self.misses += 1
+        buffer = io.StringIO()
+        render_framework_body(buffer.write, framework)
+        section = buffer.getvalue()
+
+        tmp_fragment = fragment.with_suffix(".tmp")
+        with open(tmp_fragment, 'w') as f:
+            f.write(section)
+        os.replace(tmp_fragment, fragment)
+
+        write(section)
+
+    def prune(self):
+        """Delete fragments not used by the latest render"""
+        for fragment in self.cache_dir.glob("*.md"):
+            if fragment.name not in self.used:
+                fragment.unlink()
+
+
+def _lines(items: List, prefix: str = "") -> str:
+    return "\n".join(f"{prefix}{item}" for item in items)
+
+
+def _numbered(items: List) -> str:
+    return "\n".join(f"{idx}. {item}" for idx, item in enumerate(items, 1))
+
+
+def collect_stats(framework_count: int, manifest_file: Optional[str] = None,
+                  cost_tracker=None) -> Dict:
+    """
+    Run statistics for the playbook, taken from the discovery manifest and
+    the cost tracker instead of fixed numbers
+
+    Args:
+        manifest_file: transcripts_manifest.json written by discovery
+        cost_tracker: CostTracker holding this run's API calls
+    """
+    cost_tracker = cost_tracker or default_tracker
+
+    manifest = {}
+    if manifest_file and Path(manifest_file).exists():
+        with open(manifest_file, 'r') as f:
+            manifest = json.load(f)
+
+    transcripts = manifest.get("transcripts")
+    transcript_count = len(transcripts) if transcripts is not None else "not recorded"
+    source_phrase = (f"{len(transcripts)} meeting transcripts" if transcripts is not None
+                     else "meeting transcripts")
+
+    if cost_tracker.costs:
+        started = datetime.fromisoformat(cost_tracker.costs[0]["timestamp"])
+        minutes = (datetime.now() - started).total_seconds() / 60
+        cost_lines = _lines([
+            f"Total API cost: ${cost_tracker.total_cost:.2f}",
+            f"API calls: {len(cost_tracker.costs)}",
+            f"Processing time: ~{minutes:.0f} minutes",
+        ], "- ")
+    else:
+        cost_lines = "- API cost: not recorded (playbook rendered from saved frameworks)"
+
+    return {
+        "framework_count": framework_count,
+        "candidate_count": manifest.get("candidates", "not recorded"),
+        "transcript_count": transcript_count,
+        "source_phrase": source_phrase,
+        "cost_lines": cost_lines,
+    }
+
+
+def render_heading(write: Callable[[str], None], index: int, framework: Dict):
+    FRAMEWORK_HEADING.render(write, {"index": index, "framework_name": framework['framework_name']})
+
+
+def render_framework(write: Callable[[str], None], index: int, framework: Dict):
+    """Stream one framework section"""
+    render_heading(write, index, framework)
+    render_framework_body(write, framework)
+
+
+def render_framework_body(write: Callable[[str], None], framework: Dict):
+    """Stream a framework section without its numbered heading"""
+    FRAMEWORK.render(write, {
+        "framework_type": framework['framework_type'],
+        "confidence": framework.get('confidence', 0),
+        "evidence_sources": framework.get('evidence_sources', 0),
+        "definition": framework['definition'],
+        "core_principle": framework['core_principle'],
+        "when_to_use": framework['when_to_use'],
+        "when_not_to_use": framework['when_not_to_use'],
+    })
+
+    for j, component in enumerate(framework.get('components', []), 1):
+        COMPONENT.render(write, {
+            "index": j,
+            "name": component['name'],
+            "purpose": component['purpose'],
+            "key_activities": _lines(component.get('key_activities', []), "- "),
+            "success_criteria": _lines(component.get('success_criteria', []), "- ✓ "),
+            "common_pitfalls": _lines(component.get('common_pitfalls', []), "- ⚠️  "),
+        })
+
+    # Implementation guidance
+    IMPLEMENTATION.render(write, {
+        "steps": _numbered(framework.get('implementation_steps', [])),
+        "metrics": _lines(framework.get('success_metrics', []), "- "),
+    })
+
+    # Add actionability if present
+    if 'actionability' in framework and 'decision_tree' in framework['actionability']:
+        actionability = framework['actionability']
+        DECISION_SUPPORT.render(write, {
+            "decision_tree": actionability.get('decision_tree', 'N/A'),
+            "checklist": _lines(actionability.get('implementation_checklist', [])),
+        })
+
+        for dp in actionability.get('decision_points', []):
+            if isinstance(dp, dict):
+                DECISION_POINT.render(write, {
+                    "question": dp.get('question', 'N/A'),
+                    "options": ', '.join(dp.get('options', [])),
+                    "criteria": dp.get('criteria', 'N/A'),
+                })
+
+        RISK_MITIGATION.render(write, {
+            "risks": _lines(actionability.get('risk_mitigation', []), "- "),
+        })
+
+    write("\n---\n\n")
+
+
+def generate_playbook(frameworks_file: str, output_file: str, title: str,
+                      manifest_file: Optional[str] = None, cost_tracker=None,
+                      use_cache: bool = True, export_dir: Optional[str] = None):
+    """
+    Generate markdown playbook from frameworks
+
+    Sections are rendered from precompiled templates and streamed to
+    output_file as they are produced. With use_cache, each framework
+    section is cached by a hash of its JSON and only changed frameworks
+    are re-rendered.
+
+    Args:
+        manifest_file: Discovery manifest, used for transcript/candidate counts
+        cost_tracker: Tracker for the run's API cost (defaults to the global one)
+        use_cache: Reuse rendered sections from previous runs
+        export_dir: Also write a searchable static site, a SQLite database
+            and JSON-LD here (see playbook_export)
+    """
+
+    # Frameworks are streamed twice: names for the header and key list, then
+    # one section at a time, so only one framework is held in memory
+    names = [fw['framework_name'] for fw in read_records(frameworks_file, fields=['framework_name'])]
+
+    print(f"\n📖 Generating playbook: {title}...")
+
+    stats = collect_stats(len(names), manifest_file, cost_tracker)
+
+    with atomic_open(output_file) as f:
+        writer = PlaybookWriter(f)
+        write = writer.write
+
+        HEADER.render(write, {
+            "title": title,
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            **stats,
+        })
+        for i, name in enumerate(names, 1):
+            KEY_FRAMEWORK.render(write, {"index": i, "name": name})
+        write("\n---\n\n")
+
+        # Generate section per framework
+        cache = SectionCache(output_file) if use_cache else None
+        for i, framework in enumerate(read_records(frameworks_file), 1):
+            if cache:
+                cache.write_section(write, i, framework)
+            else:
+                render_framework(write, i, framework)
+
+        # Add footer
+        FOOTER.render(write, stats)
 
-    # Write to file
-    with open(output_file, 'w') as f:
-        f.write(markdown)
+    if cache:
+        cache.prune()
 
     print(f"✓ Playbook generated: {output_file}")
-    print(f"  Length: ~{len(markdown.split(chr(10)))} lines")
+    if cache:
+        print(f"  Sections: {cache.hits} reused, {cache.misses} rendered")
+    print(f"  Length: ~{writer.lines + 1} lines")
+
+    if export_dir:
+        # Imported here: playbook_export renders pages with this module
+        from .playbook_export import export_playbook
+        # The exports index every framework at once, so they load the full list
+        exports = export_playbook(list(read_records(frameworks_file)), export_dir, title)
+        print(f"✓ Exports written: {export_dir}")
+        for kind, path in exports.items():
+            print(f"  {kind}: {path}")
 
     return output_file
@@ -0,0 +1,329 @@
+"""
+Targeted repair of failed pass output
+
+Scans a pass output file for entries that failed, came back empty or do not
+match the pass's schema, and re-runs only those entries. Each entry climbs an
+escalation ladder of (model, max_tokens) attempts, entries are repaired
+concurrently, and the fixed file is written back atomically, so recovering
+from a partial failure costs only the failed calls.
+
+Usage:
+    python3 -m src.repair frameworks_synthesized/frameworks_ai_final.json
+    python3 -m src.repair frameworks_synthesized/frameworks_synthesized.jsonl --pass synthesis
+"""
+import argparse
+import copy
+import json
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from tqdm import tqdm
+from .cost_tracker import BudgetExceeded
+from .llm_client import client
+from .json_utils import parse_llm_json, schema_problems
+from .jsonl_io import read_records, write_records
+from .pass4_actionability import actionability_problems, build_actionability_prompt
+
+# (model, max_tokens) attempts, cheapest first. Truncated JSON is the usual
+# failure, so the token limit grows before the model does.
+ACTIONABILITY_LADDER = [
+    ("claude-sonnet-4-5", 8000),
+    ("claude-sonnet-4-5", 16000),
+    ("claude-opus-4-1", 16000),
+]
+
+SYNTHESIS_LADDER = [
+    ("claude-opus-4-1", 3000),
+    ("claude-opus-4-1", 6000),
+    ("claude-opus-4-1", 12000),
+]
+
+SYNTHESIS_SCHEMA = {
+    "framework_name": str,
+    "framework_type": str,
+    "definition": str,
+    "core_principle": str,
+    "components": list,
+    "when_to_use": str,
+    "when_not_to_use": str,
+    "implementation_steps": list,
+    "success_metrics": list,
+}
+
+# Fields added by the pipeline rather than the model; kept across a repair
+SYNTHESIS_METADATA = ("evidence_sources", "confidence", "source_dates",
+                      "supporting_evidence", "actionability")
+
+SYNTHESIS_REPAIR_PROMPT = """This strategic framework was synthesized from meeting transcripts, but the result is incomplete or malformed.
+
+Problems found:
+{problems}
+
+Current framework JSON:
+{framework}
+
+Return the complete, corrected framework. Keep every field that is already good and fill in the rest.
+
+Output this exact JSON structure:
+{{
+  "framework_name": "The definitive name",
+  "framework_type": "Framework type",
+  "definition": "Clear 2-3 sentence definition of what this framework is",
+  "core_principle": "Why this framework works (underlying logic)",
+  "components": [
+    {{
+      "name": "Component 1 Name",
+      "purpose": "What this component accomplishes",
+      "key_activities": ["Activity 1", "Activity 2", "Activity 3"],
+      "success_criteria": ["Criterion 1", "Criterion 2"],
+      "common_pitfalls": ["Pitfall 1", "Pitfall 2"]
+    }}
+  ],
+  "when_to_use": "Situations where this framework applies",
+  "when_not_to_use": "When this framework is inappropriate",
+  "implementation_steps": ["Step 1", "Step 2", "Step 3", "Step 4"],
+  "decision_logic": "How to make decisions within this framework",
+  "success_metrics": ["Metric 1", "Metric 2", "Metric 3"]
+}}
+"""
+
+
+class RepairSpec(ABC):
+    """How to detect and re-run failed entries of one pass"""
+
+    name = ""
+    ladder: List[Tuple[str, int]] = []
+
+    @abstractmethod
+    def problems(self, entry: Dict) -> List[str]:
+        """Why this entry needs repair ([] if it is fine)"""
+
+    @abstractmethod
+    def build_prompt(self, entry: Dict, problems: List[str]) -> str:
+        """Prompt that re-runs the entry's LLM call"""
+
+    @abstractmethod
+    def apply(self, entry: Dict, result) -> Dict:
+        """Merge a parsed response into a copy of entry (ValueError if invalid)"""
+
+    @staticmethod
+    def label(entry: Dict) -> str:
+        return entry.get("framework_name") or "(unnamed framework)"
+
+
+class ActionabilityRepair(RepairSpec):
+    """Pass 4: frameworks whose decision support failed or is incomplete"""
+
+    name = "actionability"
+    ladder = ACTIONABILITY_LADDER
+
+    def problems(self, entry):
+        actionability = entry.get("actionability")
+        if not isinstance(actionability, dict):
+            return ["missing actionability"]
+        if "error" in actionability:
+            return [f"error: {actionability['error']}"]
+        return actionability_problems(actionability)
+
+    def build_prompt(self, entry, problems):
+        return build_actionability_prompt(entry)
+
+    def apply(self, entry, result):
+        problems = actionability_problems(result)
+        if problems:
+            raise ValueError(", ".join(problems))
+
+        repaired = copy.deepcopy(entry)
+        repaired["actionability"] = result
+        return repaired
+
+
+class SynthesisRepair(RepairSpec):
+    """Pass 2: synthesized frameworks with missing or malformed fields"""
+
+    name = "synthesis"
+    ladder = SYNTHESIS_LADDER
+
+    def problems(self, entry):
+        problems = schema_problems(entry, SYNTHESIS_SCHEMA)
+        for i, component in enumerate(entry.get("components") or [], 1):
+            if not isinstance(component, dict) or not component.get("name") or not component.get("purpose"):
+                problems.append(f"component {i} lacks a name or purpose")
+        return problems
+
+    def build_prompt(self, entry, problems):
+        framework = {k: v for k, v in entry.items() if k not in SYNTHESIS_METADATA}
+        return SYNTHESIS_REPAIR_PROMPT.format(
+            problems="\n".join(f"- {p}" for p in problems),
+            framework=json.dumps(framework, indent=2)[:8000]
+        )
+
+    def apply(self, entry, result):
+        if not isinstance(result, dict):
+            raise ValueError("not a JSON object")
+
+        repaired = copy.deepcopy(entry)
+        repaired.update({k: v for k, v in result.items() if k not in SYNTHESIS_METADATA})
+        problems = self.problems(repaired)
+        if problems:
+            raise ValueError(", ".join(problems))
+        return repaired
+
+
+REPAIR_SPECS: Dict[str, RepairSpec] = {
+    spec.name: spec for spec in (ActionabilityRepair(), SynthesisRepair())
+}
+
+
+def detect_pass(entries: List[Dict]) -> str:
+    """Final/actionability files carry an actionability block, synthesis output does not"""
+    if any(isinstance(e, dict) and "actionability" in e for e in entries):
+        return "actionability"
+    return "synthesis"
+
+
+def find_failures(entries: List[Dict], spec: RepairSpec) -> List[Tuple[int, List[str]]]:
+    """(index, problems) for every entry that needs repair"""
+    failures = []
+    for idx, entry in enumerate(entries):
+        problems = spec.problems(entry) if isinstance(entry, dict) else ["not a JSON object"]
+        if problems:
+            failures.append((idx, problems))
+    return failures
+
+
+def repair_entry(entry: Dict, problems: List[str], spec: RepairSpec,
+                 ladder: List[Tuple[str, int]]) -> Tuple[Optional[Dict], List[str]]:
+    """
+    Climb the ladder until one attempt yields a valid entry
+
+    Returns:
+        (repaired entry or None, one line per failed attempt)
+
+    BudgetExceeded is not a failed attempt: it is raised, never escalated.
+    """
+    try:
+        prompt = spec.build_prompt(entry, problems)
+    except (KeyError, TypeError) as e:
+        return None, [f"cannot build prompt, entry lacks {e}"]
+    attempts = []
+
+    for model, max_tokens in ladder:
+        try:
+            result = parse_llm_json(client.call(model, prompt, max_tokens=max_tokens))
+            return spec.apply(entry, result), attempts
+        except BudgetExceeded:
+            raise
+        except json.JSONDecodeError as e:
+            attempts.append(f"{model}/{max_tokens}: JSON error: {str(e)[:50]}")
+        except ValueError as e:
+            attempts.append(f"{model}/{max_tokens}: invalid: {e}")
+        except Exception as e:
+            attempts.append(f"{model}/{max_tokens}: {e}")
+
+    return None, attempts
+
+
+def repair_file(path: str, pass_name: Optional[str] = None,
+                ladder: Optional[List[Tuple[str, int]]] = None,
+                workers: int = 4, output_file: Optional[str] = None,
+                dry_run: bool = False) -> Dict:
+    """
+    Re-run only the failed entries of a pass output file
+
+    Args:
+        pass_name: Key of REPAIR_SPECS (default: detected from the file)
+        ladder: (model, max_tokens) attempts (default: the pass's ladder)
+        workers: Entries repaired concurrently
+        output_file: Where to write the result (default: in place)
+        dry_run: Only report what would be repaired
+
+    Returns:
+        {"pass", "checked", "failed", "repaired", "still_failed": [names]}
+    """
+    entries = list(read_records(path))
+
+    spec = REPAIR_SPECS[pass_name or detect_pass(entries)]
+    ladder = ladder or spec.ladder
+    failures = find_failures(entries, spec)
+
+    print(f"\n🔧 Repair ({spec.name}): {len(failures)}/{len(entries)} entries need repair")
+    for idx, problems in failures:
+        print(f"   - {spec.label(entries[idx])}: {'; '.join(problems[:3])}")
+
+    report = {"pass": spec.name, "checked": len(entries), "failed": len(failures),
+              "repaired": 0, "still_failed": []}
+    if not failures or dry_run:
+        return report
+
+    print(f"   Ladder: {', '.join(f'{m}/{t}' for m, t in ladder)}")
+    print(f"   Workers: {workers}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(repair_entry, entries[idx], problems, spec, ladder): idx
+            for idx, problems in failures
+        }
+        try:
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Repair"):
+                idx = futures[future]
+                name = spec.label(entries[idx])
+                repaired, attempts = future.result()
+                if repaired is not None:
+                    entries[idx] = repaired
+                    report["repaired"] += 1
+                    print(f"  ✓ Repaired: {name} (attempt {len(attempts) + 1})")
+                else:
+                    report["still_failed"].append(name)
+                    print(f"  ✗ Still failed: {name}")
+                    for line in attempts:
+                        print(f"      {line}")
+        except BudgetExceeded:
+            # Stop spending: queued entries never start, and repairs
+            # already paid for are still written below
+            pool.shutdown(wait=True, cancel_futures=True)
+            _write_repaired(report, entries, output_file or path)
+            raise
+
+    _write_repaired(report, entries, output_file or path)
+    return report
+
+
+def _write_repaired(report: Dict, entries: List[Dict], path: str):
+    if report["repaired"]:
+        write_records(path, entries)
+        print(f"✓ Wrote {report['repaired']} repaired entries to {path}")
+
+
+def _parse_ladder(values: List[str]) -> List[Tuple[str, int]]:
+    ladder = []
+    for value in values:
+        model, _, max_tokens = value.rpartition(":")
+        ladder.append((model, int(max_tokens)))
+    return ladder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run failed entries of a pass output file")
+    parser.add_argument("file", help="Pass output, .json or .jsonl (e.g. frameworks_*_final.json)")
+    parser.add_argument("--pass", dest="pass_name", choices=sorted(REPAIR_SPECS),
+                        help="Which pass produced the file (default: detect)")
+    parser.add_argument("--ladder", nargs="+", metavar="MODEL:MAX_TOKENS",
+                        help="Escalation attempts, e.g. claude-sonnet-4-5:8000 claude-opus-4-1:16000")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--output", help="Write here instead of in place")
+    parser.add_argument("--dry-run", action="store_true", help="Only list entries that need repair")
+    args = parser.parse_args()
+
+    report = repair_file(args.file, args.pass_name,
+                         ladder=_parse_ladder(args.ladder) if args.ladder else None,
+                         workers=args.workers, output_file=args.output,
+                         dry_run=args.dry_run)
+
+    if report["still_failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
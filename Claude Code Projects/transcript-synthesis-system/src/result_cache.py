@@ -0,0 +1,68 @@
+"""
+Cross-run cache of LLM results
+
+Results are stored one file per key under runs/.cache/<name>/, where the key
+hashes everything that determines the answer (input content, prompt
+version, model). A later run with the same inputs reuses the stored result
+instead of paying for the call again; anything that changes gets a new key.
+Only successful results are cached, so failures are always retried.
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+from .artifact_store import RUNS_DIR, atomic_write_json
+
+CACHE_DIR = Path(RUNS_DIR) / ".cache"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def prompt_version(template: str) -> str:
+    """Short hash of a prompt template; editing the prompt invalidates its cache"""
+    return content_hash(template)[:12]
+
+
+class ResultCache:
+    """One cache namespace (e.g. "discovery") with hit/miss counters"""
+
+    def __init__(self, name: str, root=CACHE_DIR):
+        self.dir = Path(root) / name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        return content_hash("\0".join(parts))
+
+    def _path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Stored value, or None on a miss (a damaged entry counts as a miss)"""
+        path = self._path(key)
+        value = None
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    value = json.load(f)["value"]
+            except (json.JSONDecodeError, KeyError, OSError):
+                value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any, **info):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(path, {"created": datetime.now().isoformat(), **info, "value": value},
+                          indent=None)
@@ -0,0 +1,84 @@
+"""
+Synthetic meeting transcripts for offline benchmarks.
+
+Filenames follow the real archive's "<Title> YYYY-MM-DD HH_MM transcript.txt"
+convention and reuse the transcript_filter keywords, so categorization and
+date extraction behave as they do on real data.
+"""
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+SPEAKERS = [
+    "Kyra Taylor", "Tom Reed", "Alli Chen", "Bobby Stone", "Lauren Park",
+    "Scott Miller", "Priya Nair", "Marcus Bell", "Dana Lopez", "Sam Okafor"
+]
+
+TITLES = [
+    "Coaching 1-on-1 with {person}",
+    "Consulting Weekly",
+    "Strategic Planning Workshop Lead Prep",
+    "Lunch & Learn AI Bootcamp",
+    "Proposal Review",
+    "Refining AI Workflows",
+    "Asurion Discovery Session",
+    "Adobe Prioritization Workshop",
+    "DoorDash Martech Review",
+    "Havas Client Deck Review",
+    "Pernod Ricard Marketing Offsite",
+    "Product Teardown PRD Review",
+    "Quarterly All Hands",
+    "ROI Conference Debrief",
+]
+
+SENTENCES = [
+    "The first thing we do is map every workflow the team touches in a week.",
+    "Then we score each use case on impact and feasibility before we build anything.",
+    "If the pilot does not move the metric in four weeks, we stop and reassess.",
+    "There are really three layers here: tools, workflows, and operating model.",
+    "We track adoption, time saved, and quality so leadership sees the ROI.",
+    "Scaling means moving from one champion to a repeatable team process.",
+    "Executive sponsorship is what keeps the pilot alive past the first month.",
+    "The prompt library becomes the shared asset everyone builds on.",
+    "Data readiness is usually the hidden blocker, so we check it up front.",
+    "Change management has to start on day one, not at rollout.",
+    "So what would success look like for your team by the end of the quarter?",
+    "I think the bigger question is who owns this once the consultants leave.",
+]
+
+
+def generate_transcripts(output_dir: str, count: int, seed: int = 0,
+                         min_turns: int = 20, max_turns: int = 80) -> List[str]:
+    """
+    Write `count` synthetic .txt transcripts to output_dir
+
+    Returns:
+        List of written file paths
+    """
+    rng = random.Random(seed)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    start = date(2025, 1, 6)
+    written = []
+
+    for i in range(count):
+        title = rng.choice(TITLES).format(person=rng.choice(SPEAKERS).split()[0])
+        meeting_date = start + timedelta(days=rng.randint(0, 320))
+        stamp = f"{meeting_date.isoformat()} {rng.randint(8, 17):02d}_{rng.randint(0, 59):02d}"
+
+        # Index suffix keeps filenames unique at any count
+        file_path = output_path / f"{title} {stamp} transcript {i:05d}.txt"
+
+        participants = rng.sample(SPEAKERS, rng.randint(2, 5))
+        lines = []
+        for _ in range(rng.randint(min_turns, max_turns)):
+            speaker = rng.choice(participants)
+            turn = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 4)))
+            lines.append(f"{speaker}: {turn}")
+
+        file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        written.append(str(file_path))
+
+    return written
@@ -0,0 +1,227 @@
+"""
+Content-based transcript classifier (CPU only, no API calls)
+
+Multinomial naive Bayes over hashed word and speaker features. Training uses
+a labeled subset of the normalized store: an explicit labels file, or by
+default the transcripts whose filenames carry keyword evidence. Scoring runs
+as one vectorized batch over the whole corpus.
+
+Usage:
+    python3 -m src.transcript_classifier train [normalized_dir] [--labels labels.json]
+    python3 -m src.transcript_classifier report [normalized_dir]
+"""
+import argparse
+import hashlib
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from .artifact_store import atomic_open
+from .transcript_store import TranscriptStore
+
+N_FEATURES = 2 ** 18
+CLASSES = ("taylor", "client")
+MODEL_FILE = "classifier.npz"
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9']+")
+
+# Speaker identity is a strong signal, so speaker features count extra
+SPEAKER_WEIGHT = 5.0
+
+
+def _hash(token: str) -> int:
+    # crc32 is stable across processes, unlike the builtin hash()
+    return zlib.crc32(token.encode("utf-8")) % N_FEATURES
+
+
+def featurize(transcript: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashed (feature index, count) pairs for one normalized transcript"""
+    counts: Dict[int, float] = {}
+
+    for chunk in transcript.get("chunks", []):
+        for token in TOKEN_PATTERN.findall(chunk.get("text", "").lower()):
+            idx = _hash(token)
+            counts[idx] = counts.get(idx, 0.0) + 1.0
+
+        speaker = (chunk.get("speaker") or "").lower()
+        if speaker and speaker != "unknown":
+            idx = _hash(f"spk:{speaker}")
+            counts[idx] = counts.get(idx, 0.0) + SPEAKER_WEIGHT
+
+    # Bias feature keeps every document non-empty for the batched reduction
+    idx = _hash("__bias__")
+    counts[idx] = counts.get(idx, 0.0) + 1.0
+
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+    return indices, values
+
+
+def featurize_files(files: Iterable[Path]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Featurize many transcripts into flat (indices, counts, offsets) arrays
+
+    Document i owns indices[offsets[i]:offsets[i + 1]].
+    """
+    all_indices, all_counts, offsets = [], [], [0]
+    for file_path in files:
+        with open(file_path, 'r') as f:
+            indices, counts = featurize(json.load(f))
+        all_indices.append(indices)
+        all_counts.append(counts)
+        offsets.append(offsets[-1] + len(indices))
+
+    if not all_indices:
+        return np.empty(0, np.int64), np.empty(0, np.float32), np.zeros(1, np.int64)
+
+    return np.concatenate(all_indices), np.concatenate(all_counts), np.asarray(offsets, np.int64)
+
+
+class TranscriptClassifier:
+    """Multinomial naive Bayes over hashed features"""
+
+    def __init__(self, log_prior: np.ndarray, log_prob: np.ndarray, classes=CLASSES):
+        self.classes = tuple(classes)
+        self.log_prior = log_prior
+        self.log_prob = log_prob
+        self.version = hashlib.sha256(log_prob.tobytes()).hexdigest()[:16]
+
+    @classmethod
+    def train(cls, files: List[Path], labels: List[str], alpha: float = 1.0) -> "TranscriptClassifier":
+        """Fit on labeled transcripts"""
+        indices, counts, offsets = featurize_files(files)
+        doc_class = np.asarray([CLASSES.index(label) for label in labels], dtype=np.int64)
+
+        # Expand the per-document class to every feature entry of that document
+        entry_class = np.repeat(doc_class, np.diff(offsets))
+
+        feature_counts = np.zeros((len(CLASSES), N_FEATURES), dtype=np.float64)
+        np.add.at(feature_counts, (entry_class, indices), counts)
+
+        smoothed = feature_counts + alpha
+        log_prob = np.log(smoothed / smoothed.sum(axis=1, keepdims=True)).astype(np.float32)
+
+        class_docs = np.bincount(doc_class, minlength=len(CLASSES)) + 1
+        log_prior = np.log(class_docs / class_docs.sum()).astype(np.float32)
+
+        return cls(log_prior, log_prob)
+
+    def predict_proba(self, files: List[Path]) -> np.ndarray:
+        """Class probabilities, shape (len(files), len(classes))"""
+        if not files:
+            return np.zeros((0, len(self.classes)), dtype=np.float32)
+
+        indices, counts, offsets = featurize_files(files)
+
+        # (classes, entries) weighted log-likelihoods, summed per document
+        weighted = self.log_prob[:, indices] * counts
+        log_likelihood = np.add.reduceat(weighted, offsets[:-1], axis=1).T
+        scores = log_likelihood + self.log_prior
+
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+    def predict(self, files: List[Path]) -> List[Tuple[str, float]]:
+        """(category, confidence) per file"""
+        probs = self.predict_proba(files)
+        best = probs.argmax(axis=1)
+        return [(self.classes[b], float(probs[i, b])) for i, b in enumerate(best)]
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(path, 'wb') as f:
+            np.savez_compressed(f, log_prior=self.log_prior, log_prob=self.log_prob,
+                                classes=np.asarray(self.classes))
+
+    @classmethod
+    def load(cls, path: Path) -> "TranscriptClassifier":
+        data = np.load(path)
+        return cls(data["log_prior"], data["log_prob"], [str(c) for c in data["classes"]])
+
+
+def model_path(normalized_dir: str) -> Path:
+    """Where the classifier for a normalized store is kept"""
+    return TranscriptStore(normalized_dir).index_dir / MODEL_FILE
+
+
+def load_classifier(normalized_dir: str) -> Optional[TranscriptClassifier]:
+    """Trained classifier for a normalized store, or None if not trained yet"""
+    path = model_path(normalized_dir)
+    return TranscriptClassifier.load(path) if path.exists() else None
+
+
+def bootstrap_labels(normalized_dir: str) -> Dict[str, str]:
+    """
+    Labels taken from filenames that carry keyword evidence
+
+    Files whose category would only come from the 'client' default, and
+    excluded files, are left unlabeled.
+    """
+    # Imported here to avoid a circular import with transcript_filter
+    from .transcript_filter import get_categorizer
+
+    categorizer = get_categorizer()
+    labels = {}
+    for file_path in TranscriptStore(normalized_dir).files():
+        scores = categorizer.scores(file_path.stem)
+        if scores["exclude"] or scores["taylor"] == scores["client"]:
+            continue
+        labels[file_path.name] = "taylor" if scores["taylor"] > scores["client"] else "client"
+    return labels
+
+
+def train_classifier(normalized_dir: str, labels_file: Optional[str] = None) -> TranscriptClassifier:
+    """Train on the labeled subset of a normalized store and save the model"""
+    if labels_file:
+        with open(labels_file, 'r') as f:
+            labels = json.load(f)
+    else:
+        labels = bootstrap_labels(normalized_dir)
+
+    root = Path(normalized_dir)
+    labeled = [(root / name, label) for name, label in sorted(labels.items())
+               if label in CLASSES and (root / name).exists()]
+    if not labeled:
+        raise ValueError(f"No labeled transcripts found in {normalized_dir}")
+
+    print(f"\n🧠 Training transcript classifier on {len(labeled)} labeled transcripts...")
+    classifier = TranscriptClassifier.train([f for f, _ in labeled], [label for _, label in labeled])
+    classifier.save(model_path(normalized_dir))
+
+    print(f"✓ Classifier saved\n  Output: {model_path(normalized_dir)}")
+    return classifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-based transcript classifier")
+    parser.add_argument("command", choices=["train", "report"])
+    parser.add_argument("normalized_dir", nargs="?", default="transcripts_normalized")
+    parser.add_argument("--labels", help="JSON file mapping transcript filename -> taylor/client")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        train_classifier(args.normalized_dir, args.labels)
+        return
+
+    classifier = load_classifier(args.normalized_dir)
+    if classifier is None:
+        print("No classifier trained yet. Run: python3 -m src.transcript_classifier train")
+        return
+
+    files = TranscriptStore(args.normalized_dir).files()
+    predictions = classifier.predict(files)
+    print(f"\n📊 Content classification of {len(files)} transcripts")
+    for label in classifier.classes:
+        print(f"   {label}: {sum(1 for p, _ in predictions if p == label)}")
+
+    uncertain = sorted(zip(files, predictions), key=lambda x: x[1][1])[:10]
+    print("\nLeast confident:")
+    for file_path, (label, confidence) in uncertain:
+        print(f"  {confidence:.2f} {label:<7} {file_path.stem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,213 @@
 #!/usr/bin/env python3
 """
 Transcript filtering utility for separating Taylor/strategic vs AI/client transcripts
+
+Keyword rules and weights live in transcript_rules.json.
+
+Usage:
+    python3 -m src.transcript_filter [normalized_dir] [rules|content|auto]
 """
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional, Set, Tuple
+import hashlib
 import json
+from .keyword_automaton import KeywordAutomaton
+from .transcript_store import TranscriptStore, transcript_date
+
+RULES_FILE = Path(__file__).parent / "transcript_rules.json"
+
+
+class TranscriptCategorizer:
+    """
+    Weighted keyword rules compiled into a single Aho-Corasick automaton
+
+    Each filename is scanned once regardless of how many keywords exist.
+    """
+
+    def __init__(self, rules: Dict):
+        self.rules = rules
+        self.version = hashlib.sha256(
+            json.dumps(rules, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:16]
+
+        # Every keyword maps to (category, weight); any exclusion hit excludes
+        keywords = []
+        self._labels: List[Tuple[str, float]] = []
+        for pattern in rules.get("exclude", []):
+            keywords.append(pattern.lower())
+            self._labels.append(("exclude", 1.0))
+        for category in ("taylor", "client"):
+            for pattern, weight in rules.get(category, {}).items():
+                keywords.append(pattern.lower())
+                self._labels.append((category, float(weight)))
+
+        self._automaton = KeywordAutomaton(keywords)
+
+    @classmethod
+    def from_file(cls, rules_file: str = RULES_FILE) -> "TranscriptCategorizer":
+        """Load rules from a JSON rules file"""
+        with open(rules_file, 'r') as f:
+            return cls(json.load(f))
+
+    def patterns(self, category: str) -> Set[str]:
+        """Keywords configured for a category"""
+        return {
+            keyword for keyword, (label, _) in zip(self._automaton.keywords, self._labels)
+            if label == category
+        }
+
+    def scores(self, filename: str) -> Dict[str, float]:
+        """Summed weights of the distinct keywords found per category"""
+        scores = {"exclude": 0.0, "taylor": 0.0, "client": 0.0}
+        for idx in self._automaton.find_all(filename.lower()):
+            label, weight = self._labels[idx]
+            scores[label] += weight
+        return scores
+
+    def categorize(self, filename: str) -> str:
+        """
+        Categorize transcript based on filename
+        Returns: 'taylor', 'client', or 'exclude'
+        """
+        scores = self.scores(filename)
+
+        # Check exclusions first
+        if scores["exclude"]:
+            return 'exclude'
+
+        # Categorize based on scores
+        if scores["taylor"] > scores["client"]:
+            return 'taylor'
+        elif scores["client"] > 0:
+            return 'client'
+        else:
+            # Default to client for ambiguous cases
+            return 'client'
+
+
+_default_categorizer = None
+
+
+def get_categorizer() -> TranscriptCategorizer:
+    """Shared categorizer compiled from RULES_FILE on first use"""
+    global _default_categorizer
+    if _default_categorizer is None:
+        _default_categorizer = TranscriptCategorizer.from_file(RULES_FILE)
+    return _default_categorizer
+
+
+# Keyword sets kept for callers that inspect them directly
+TAYLOR_PATTERNS = get_categorizer().patterns('taylor')
+EXCLUDE_PATTERNS = get_categorizer().patterns('exclude')
+CLIENT_PATTERNS = get_categorizer().patterns('client')
 
-# Keywords for Taylor/Strategic transcripts
-TAYLOR_PATTERNS = {
-    'kyra', 'taylor', 'coaching', '1-on-1', 'interview',
-    'tom', 'alli', 'bobby', 'scott', 'lauren', 'louise',
-    'strategic', 'workshop lead', 'lunch & learn', 'bootcamp',
-    'consulting weekly', 'proposal review', 'amanda lennon',
-    'ana portugal', 'alyson', 'hannah tsumoto', 'lisa read',
-    'patrick johnson', 'stephanie ford', 'valentina',
-    'sandra noonan', 'refining ai workflows'
-}
-
-# Keywords to EXCLUDE (personal, not work)
-EXCLUDE_PATTERNS = {
-    'funeral', 'maryland', 'pa nkwate'
-}
-
-# Keywords for AI/Client transcripts
-CLIENT_PATTERNS = {
-    'discovery session', 'prioritization', 'asurion', 'adobe',
-    'doordash', 'havas', 'pernod ricard', 'martech',
-    'marketing offsite', 'berkeley', 'client', 'deck',
-    'product teardown', 'prd'
-}
 
 def categorize_transcript(filename: str) -> str:
     """
     Categorize transcript based on filename
     Returns: 'taylor', 'client', or 'exclude'
     """
-    lower_name = filename.lower()
+    return get_categorizer().categorize(filename)
 
-    # Check exclusions first
-    if any(pattern in lower_name for pattern in EXCLUDE_PATTERNS):
-        return 'exclude'
 
-    # Check Taylor patterns
-    taylor_score = sum(1 for pattern in TAYLOR_PATTERNS if pattern in lower_name)
+def categorize_directory(input_dir: str, method: str = 'rules') -> Dict[Path, str]:
+    """
+    Category for every normalized transcript in input_dir
 
-    # Check client patterns
-    client_score = sum(1 for pattern in CLIENT_PATTERNS if pattern in lower_name)
+    Args:
+        input_dir: Directory containing normalized transcripts
+        method: 'rules' (filename keywords), 'content' (trained classifier,
+            see transcript_classifier) or 'auto' (content when a classifier
+            has been trained for this store, otherwise rules)
 
-    # Categorize based on scores
-    if taylor_score > client_score:
-        return 'taylor'
-    elif client_score > 0:
-        return 'client'
+    Results are cached in the normalized store, so repeated calls only
+    categorize new or changed files.
+    """
+    categorizer = get_categorizer()
+    store = TranscriptStore(input_dir)
+
+    classifier = None
+    if method in ('content', 'auto'):
+        from .transcript_classifier import load_classifier
+        classifier = load_classifier(input_dir)
+        if classifier is None and method == 'content':
+            raise FileNotFoundError(
+                f"No classifier trained for {input_dir}. "
+                "Run: python3 -m src.transcript_classifier train"
+            )
+
+    if classifier is None:
+        categories = store.categories(
+            lambda files: [categorizer.categorize(f.stem) for f in files],
+            categorizer.version
+        )
     else:
-        # Default to client for ambiguous cases
-        return 'client'
+        def classify(files: List[Path]) -> List[str]:
+            # Exclusion stays rule-based: personal transcripts never reach a pass
+            predictions = classifier.predict(files)
+            return [
+                'exclude' if categorizer.categorize(f.stem) == 'exclude' else label
+                for f, (label, _) in zip(files, predictions)
+            ]
+
+        categories = store.categories(
+            classify, f"{categorizer.version}:{classifier.version}", index="content_categories"
+        )
+
+    return {store.root / name: category for name, category in categories.items()}
+
 
 def filter_transcripts(
     input_dir: str,
-    category: str = 'taylor'
+    category: str = 'taylor',
+    method: str = 'rules',
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
 ) -> List[Path]:
     """
-    Filter transcripts by category
+    Filter transcripts by category and (optionally) meeting date
 
     Args:
         input_dir: Directory containing normalized transcripts
         category: 'taylor' or 'client' or 'all'
+        method: 'rules', 'content' or 'auto' (see categorize_directory)
+        date_from: Earliest meeting date to include (YYYY-MM-DD, inclusive)
+        date_to: Latest meeting date to include (YYYY-MM-DD, inclusive)
 
     Returns:
-        List of Path objects for matching transcripts
+        List of Path objects for matching transcripts. The list can be
+        passed straight to the passes; nothing is copied.
     """
-    input_path = Path(input_dir)
-    all_files = sorted(input_path.glob("*.json"))
+    categories = categorize_directory(input_dir, method)
 
     if category == 'all':
         # Return all except excluded
-        return [
-            f for f in all_files
-            if categorize_transcript(f.stem) != 'exclude'
+        selected = [f for f, cat in categories.items() if cat != 'exclude']
+    else:
+        # Filter by category
+        selected = [f for f, cat in categories.items() if cat == category]
+
+    if date_from or date_to:
+        # Transcripts without a date in the filename cannot satisfy a range
+        selected = [
+            f for f in selected
+            if (date := transcript_date(f))
+            and (not date_from or date >= date_from)
+            and (not date_to or date <= date_to)
         ]
 
-    # Filter by category
-    filtered = [
-        f for f in all_files
-        if categorize_transcript(f.stem) == category
-    ]
-
-    return filtered
+    return selected
 
-def print_categorization_report(input_dir: str):
+def print_categorization_report(input_dir: str, method: str = 'rules'):
     """Print categorization statistics"""
-    input_path = Path(input_dir)
-    all_files = list(input_path.glob("*.json"))
+    categories = categorize_directory(input_dir, method)
+    all_files = list(categories)
 
     taylor_files = []
     client_files = []
     excluded_files = []
 
-    for f in all_files:
-        cat = categorize_transcript(f.stem)
+    for f, cat in categories.items():
         if cat == 'taylor':
             taylor_files.append(f)
         elif cat == 'client':
@@ -138,4 +247,6 @@ if __name__ == "__main__":
     else:
         input_dir = "transcripts_normalized"
 
-    print_categorization_report(input_dir)
+    method = sys.argv[2] if len(sys.argv) > 2 else 'rules'
+
+    print_categorization_report(input_dir, method)
@@ -0,0 +1,137 @@
+"""
+Index over a normalized transcript directory
+
+The index lives in `<normalized_dir>/.index/` (outside the *.json glob the
+passes use) and caches per-file facts such as the category, keyed by file
+size and mtime so only new or changed transcripts are re-examined.
+
+Passes select transcripts through resolve_transcripts, which accepts a
+directory, a manifest file or an explicit list of paths, so subsets never
+need to be copied into a temporary directory.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+from .artifact_store import atomic_write_json
+
+INDEX_DIR = ".index"
+
+DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+TranscriptSource = Union[str, Path, Sequence[Union[str, Path]]]
+
+
+def transcript_date(file_path: Path) -> Optional[str]:
+    """Meeting date (YYYY-MM-DD) from the filename, as normalize records it"""
+    match = DATE_PATTERN.search(file_path.stem)
+    return match.group(1) if match else None
+
+
+def read_manifest(manifest_file: Union[str, Path]) -> List[Path]:
+    """
+    Transcript paths listed in a manifest
+
+    Supports JSON ({"transcripts": [...]} or a plain list) and text files
+    with one path per line. Relative paths resolve against the manifest's
+    directory.
+    """
+    manifest_path = Path(manifest_file)
+    with open(manifest_path, 'r') as f:
+        if manifest_path.suffix == ".json":
+            data = json.load(f)
+            entries = data["transcripts"] if isinstance(data, dict) else data
+        else:
+            entries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    paths = []
+    for entry in entries:
+        path = Path(entry)
+        if not path.is_absolute() and not path.exists():
+            path = manifest_path.parent / path
+        paths.append(path)
+    return paths
+
+
+def write_manifest(files: Sequence[Union[str, Path]], manifest_file: Union[str, Path], **info) -> Path:
+    """Record a transcript selection (plus optional run info) as a JSON manifest"""
+    manifest_path = Path(manifest_file)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_json(manifest_path, {**info, "transcripts": [str(p) for p in files]})
+    return manifest_path
+
+
+def resolve_transcripts(source: TranscriptSource) -> List[Path]:
+    """
+    Normalized transcript paths for a directory, manifest file or path list
+    """
+    if isinstance(source, (str, Path)):
+        source_path = Path(source)
+        if source_path.is_dir():
+            return TranscriptStore(source_path).files()
+        return read_manifest(source_path)
+
+    return [Path(p) for p in source]
+
+
+class TranscriptStore:
+    """Normalized transcripts plus a small on-disk index of derived facts"""
+
+    def __init__(self, normalized_dir: str):
+        self.root = Path(normalized_dir)
+        self.index_dir = self.root / INDEX_DIR
+
+    def files(self) -> List[Path]:
+        """All normalized transcript files, sorted by name"""
+        return sorted(self.root.glob("*.json"))
+
+    def _load_index(self, name: str) -> Dict:
+        index_file = self.index_dir / f"{name}.json"
+        if not index_file.exists():
+            return {}
+        try:
+            with open(index_file, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            # A damaged cache is just a cold cache
+            return {}
+
+    def _save_index(self, name: str, data: Dict):
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.index_dir / f"{name}.json", data, indent=None)
+
+    def categories(self, categorize: Callable[[List[Path]], List[str]], version: str,
+                   index: str = "categories") -> Dict[str, str]:
+        """
+        Category for every transcript, computed once per file and cached
+
+        Args:
+            categorize: Called once with every uncached path, returns their categories
+            version: Identifies the rules/model; a change invalidates the cache
+            index: Index name, so different categorizers keep separate caches
+
+        Returns:
+            Dict mapping file name -> category
+        """
+        cached_index = self._load_index(index)
+        cached = cached_index.get("files", {}) if cached_index.get("version") == version else {}
+
+        entries = {}
+        stale = []
+        for file_path in self.files():
+            stat = file_path.stat()
+            entry = cached.get(file_path.name)
+            if not entry or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+                entry = {"size": stat.st_size, "mtime": stat.st_mtime, "category": None}
+                stale.append(file_path)
+            entries[file_path.name] = entry
+
+        # Uncached files are categorized together so batch scorers stay vectorized
+        if stale:
+            for file_path, category in zip(stale, categorize(stale)):
+                entries[file_path.name]["category"] = category
+
+        if stale or len(entries) != len(cached):
+            self._save_index(index, {"version": version, "files": entries})
+
+        return {name: entry["category"] for name, entry in entries.items()}